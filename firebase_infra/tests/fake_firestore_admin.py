@@ -0,0 +1,256 @@
+"""In-process stand-in for the Firestore Admin index REST API.
+
+Serves list/create/delete of composite indexes and polling of their
+long-running operations over HTTP/1.1 keep-alive so the sync tool can be
+exercised without network access. A created index stays ``CREATING`` until it
+has been polled ``build_polls`` times. Faults (an error status, a
+connection dropped after the request was handled, or one reset halfway
+through a successful response body) can be queued per HTTP method, and the
+server counts connections, requests and peak in-flight requests for
+assertions.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib import parse
+
+API_PREFIX = "/v1/"
+DROP = 0
+RESET = -1
+
+
+class FakeFirestoreAdmin:
+    def __init__(
+        self,
+        project_id: str = "demo",
+        *,
+        page_size: int = 2,
+        latency_s: float = 0.0,
+        build_polls: int = 0,
+        failing_groups: frozenset[str] = frozenset(),
+    ) -> None:
+        self.project_id = project_id
+        self.page_size = page_size
+        self.latency_s = latency_s
+        self.build_polls = build_polls
+        self.failing_groups = failing_groups
+        self.indexes: dict[str, dict[str, Any]] = {}
+        self.operations: dict[str, str] = {}
+        self._polls: dict[str, int] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._next_id = 0
+        self._faults: dict[str, deque[tuple[int, str | None]]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def database(self) -> str:
+        return f"projects/{self.project_id}/databases/(default)"
+
+    def __enter__(self) -> "FakeFirestoreAdmin":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_index(self, collection_group: str, raw: dict[str, Any], *, state: str = "READY") -> str:
+        with self._lock:
+            self._next_id += 1
+            name = f"{self.database}/collectionGroups/{collection_group}/indexes/idx{self._next_id}"
+            self.indexes[name] = {"name": name, "state": state, **raw}
+            return name
+
+    def fail_next(self, method: str, status: int, *, retry_after: str | None = None, times: int = 1) -> None:
+        with self._lock:
+            self._faults.setdefault(method, deque()).extend([(status, retry_after)] * times)
+
+    def drop_next(self, method: str, *, times: int = 1) -> None:
+        """Handle the next ``method`` request(s) but close the connection instead of responding."""
+        with self._lock:
+            self._faults.setdefault(method, deque()).extend([(DROP, None)] * times)
+
+    def reset_next(self, method: str, *, times: int = 1) -> None:
+        """Answer the next ``method`` request(s) with 200 but reset the connection halfway through the body."""
+        with self._lock:
+            self._faults.setdefault(method, deque()).extend([(RESET, None)] * times)
+
+    def count(self, method: str) -> int:
+        with self._lock:
+            return sum(1 for seen, _ in self.requests if seen == method)
+
+    # Request handling -------------------------------------------------
+
+    def _take_fault(self, method: str) -> tuple[int, str | None] | None:
+        queued = self._faults.get(method)
+        return queued.popleft() if queued else None
+
+    def handle(self, method: str, target: str, body: dict[str, Any] | None) -> tuple[int, dict[str, str], Any]:
+        with self._lock:
+            self.requests.append((method, target))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            fault = self._take_fault(method)
+        try:
+            if self.latency_s:
+                time.sleep(self.latency_s)
+            if fault is not None and fault[0] in (DROP, RESET):
+                with self._lock:
+                    _, headers, payload = self._dispatch(method, target, body)
+                return fault[0], headers, payload
+            if fault is not None:
+                status, retry_after = fault
+                headers = {"Retry-After": retry_after} if retry_after is not None else {}
+                return status, headers, {"error": {"code": status, "message": "injected fault"}}
+            with self._lock:
+                return self._dispatch(method, target, body)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _dispatch(self, method: str, target: str, body: dict[str, Any] | None) -> tuple[int, dict[str, str], Any]:
+        url = parse.urlsplit(target)
+        if not url.path.startswith(API_PREFIX):
+            return 404, {}, {"error": {"code": 404}}
+        path = parse.unquote(url.path[len(API_PREFIX):])
+        query = parse.parse_qs(url.query)
+
+        if method == "GET" and "/operations/" in path:
+            return self._operation(path)
+        if method == "GET" and "/indexes/" in path:
+            if path not in self.indexes:
+                return 404, {}, {"error": {"code": 404}}
+            self._advance(path)
+            return 200, {}, self.indexes[path]
+        if method == "GET" and path.endswith("/indexes"):
+            group = path.split("/collectionGroups/", 1)[1].split("/", 1)[0]
+            return self._list(group, query.get("pageToken", ["0"])[0])
+        if method == "POST" and path.endswith("/indexes"):
+            group = path.split("/collectionGroups/", 1)[1].split("/", 1)[0]
+            return self._create(group, body or {})
+        if method == "DELETE" and "/indexes/" in path:
+            if self.indexes.pop(path, None) is None:
+                return 404, {}, {"error": {"code": 404}}
+            return 200, {}, {}
+        return 404, {}, {"error": {"code": 404}}
+
+    def _list(self, group: str, token: str) -> tuple[int, dict[str, str], Any]:
+        matching = [
+            raw for name, raw in sorted(self.indexes.items())
+            if group == "-" or f"/collectionGroups/{group}/" in name
+        ]
+        start = int(token or "0")
+        page = matching[start:start + self.page_size]
+        payload: dict[str, Any] = {"indexes": page}
+        if start + self.page_size < len(matching):
+            payload["nextPageToken"] = str(start + self.page_size)
+        return 200, {}, payload
+
+    def _advance(self, name: str) -> None:
+        raw = self.indexes[name]
+        if raw["state"] != "CREATING":
+            return
+        self._polls[name] = self._polls.get(name, 0) + 1
+        if self._polls[name] >= self.build_polls:
+            failed = _group(name) in self.failing_groups
+            raw["state"] = "NEEDS_REPAIR" if failed else "READY"
+
+    def _operation(self, path: str) -> tuple[int, dict[str, str], Any]:
+        name = self.operations.get(path)
+        if name is None:
+            return 404, {}, {"error": {"code": 404}}
+        self._advance(name)
+        raw = self.indexes[name]
+        payload: dict[str, Any] = {"name": path, "metadata": {"index": name, "state": "PROCESSING"}}
+        if raw["state"] == "READY":
+            payload.update(done=True, response=raw)
+            payload["metadata"]["state"] = "SUCCESSFUL"
+        elif raw["state"] == "NEEDS_REPAIR":
+            payload.update(done=True, error={"code": 9, "message": f"build failed for {name}"})
+            payload["metadata"]["state"] = "FAILED"
+        return 200, {}, payload
+
+    def _create(self, group: str, body: dict[str, Any]) -> tuple[int, dict[str, str], Any]:
+        for name, raw in self.indexes.items():
+            if f"/collectionGroups/{group}/" in name and raw.get("fields") == body.get("fields") and (
+                raw.get("queryScope") == body.get("queryScope")
+            ):
+                return 409, {}, {"error": {"code": 409, "status": "ALREADY_EXISTS"}}
+        self._next_id += 1
+        name = f"{self.database}/collectionGroups/{group}/indexes/idx{self._next_id}"
+        self.indexes[name] = {"name": name, "state": "CREATING", **body}
+        self._polls[name] = 0
+        if self.build_polls <= 0:
+            self._advance(name)
+        operation = {
+            "name": f"{self.database}/operations/op{self._next_id}",
+            "metadata": {"index": name, "state": "INITIALIZING"},
+        }
+        self.operations[operation["name"]] = name
+        return 200, {}, operation
+
+
+def _group(name: str) -> str:
+    return name.split("/collectionGroups/", 1)[1].split("/", 1)[0]
+
+
+def _make_handler(admin: FakeFirestoreAdmin) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            with admin._lock:
+                admin.connections += 1
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            pass
+
+        def _respond(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            body = json.loads(raw) if raw else None
+            status, headers, payload = admin.handle(self.command, self.path, body)
+            if status == DROP:
+                self.close_connection = True
+                return
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(200 if status == RESET else status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            if status == RESET:
+                self.wfile.write(data[: len(data) // 2])
+                self.wfile.flush()
+                # Let the client consume the first half before the RST discards anything unread.
+                time.sleep(0.2)
+                self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+                self.connection.close()
+                self.close_connection = True
+                return
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_DELETE = _respond
+
+    return Handler
@@ -0,0 +1,98 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tools import analyze_rules_cost
+
+RULES = """rules_version = '2';
+
+service cloud.firestore {
+  match /databases/{database}/documents {
+    // get(/databases/$(database)/documents/ignored/comment)
+    function userDoc() {
+      return get(/databases/$(database)/documents/users/$(request.auth.uid));
+    }
+
+    function isCoach(clubId) {
+      return exists(/databases/$(database)/documents/clubs/$(clubId)/coaches/$(request.auth.uid))
+        || userDoc().data.role == 'coach';
+    }
+
+    function isMember(clubId) {
+      return isCoach(clubId)
+        || exists(/databases/$(database)/documents/clubs/$(clubId)/members/$(request.auth.uid));
+    }
+
+    match /clubs/{clubId} {
+      allow read: if isMember(clubId);
+      allow update: if isCoach(clubId) && userDoc().data.clubId == clubId;
+
+      match /sessions/{sessionId} {
+        function sessionDoc() {
+          return get(/databases/$(database)/documents/clubs/$(clubId)/sessions/$(sessionId));
+        }
+
+        allow get: if isMember(clubId) && sessionDoc().data.open;
+        allow delete: if false;
+      }
+    }
+  }
+}
+"""
+
+
+class AnalyzeRulesCostTests(unittest.TestCase):
+    def _costs(self, text: str = RULES) -> dict[tuple[str, str], analyze_rules_cost.OperationCost]:
+        return {(cost.path, cost.operation): cost for cost in analyze_rules_cost.analyze_rules(text)}
+
+    def test_resolves_call_graph_per_match_block(self):
+        costs = self._costs()
+
+        self.assertEqual(
+            {
+                ("/clubs/{clubId}", "get"),
+                ("/clubs/{clubId}", "list"),
+                ("/clubs/{clubId}", "update"),
+                ("/clubs/{clubId}/sessions/{sessionId}", "get"),
+                ("/clubs/{clubId}/sessions/{sessionId}", "delete"),
+            },
+            set(costs),
+        )
+        self.assertEqual(3, costs[("/clubs/{clubId}", "get")].read_count)
+        self.assertEqual(("isCoach", "isMember", "userDoc"), costs[("/clubs/{clubId}", "get")].functions)
+        # userDoc() is called twice but reads the same document once.
+        self.assertEqual(2, costs[("/clubs/{clubId}", "update")].read_count)
+        self.assertEqual(4, costs[("/clubs/{clubId}/sessions/{sessionId}", "get")].read_count)
+        self.assertEqual(0, costs[("/clubs/{clubId}/sessions/{sessionId}", "delete")].read_count)
+
+    def test_distinct_arguments_are_distinct_documents(self):
+        rules = RULES.replace(
+            "allow update: if isCoach(clubId) && userDoc().data.clubId == clubId;",
+            "allow update: if isCoach(clubId) && isCoach(userDoc().data.clubId);",
+        )
+
+        cost = self._costs(rules)[("/clubs/{clubId}", "update")]
+
+        self.assertEqual(3, cost.read_count)
+
+    def test_status_flags_reads_near_and_over_the_limits(self):
+        def rules_with_reads(count: int) -> str:
+            reads = " || ".join(f"exists(/databases/$(database)/documents/docs/d{index})" for index in range(count))
+            return f"service cloud.firestore {{\n  match /items/{{id}} {{\n    allow create: if {reads};\n  }}\n}}\n"
+
+        statuses = {
+            count: self._costs(rules_with_reads(count))[("/items/{id}", "create")].status()
+            for count in (7, 8, 11, 21)
+        }
+
+        self.assertEqual(
+            {7: "ok", 8: "near-limit", 11: "over-limit", 21: "over-batch-limit"},
+            statuses,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
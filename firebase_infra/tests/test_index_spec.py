@@ -0,0 +1,132 @@
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tools import sync_firestore_indexes
+from tools.index_spec import IndexSet, IndexSpec
+
+
+def _spec(group: str, *fields: str, scope: str = "COLLECTION") -> IndexSpec:
+    return IndexSpec.from_desired(
+        {
+            "collectionGroup": group,
+            "queryScope": scope,
+            "fields": [{"fieldPath": field, "order": "ASCENDING"} for field in fields],
+        }
+    )
+
+
+class IndexSpecTest(unittest.TestCase):
+    def test_desired_and_existing_definitions_compare_equal(self) -> None:
+        desired = _spec("sessions", "clubId", "date")
+        existing = IndexSpec.from_existing(
+            {
+                "name": "projects/p/databases/(default)/collectionGroups/sessions/indexes/abc",
+                "queryScope": "COLLECTION",
+                "fields": [
+                    {"order": "ASCENDING", "fieldPath": "clubId"},
+                    {"fieldPath": "date", "order": "ASCENDING"},
+                ],
+                "state": "READY",
+            }
+        )
+        self.assertEqual(desired, existing)
+        self.assertEqual(hash(desired), hash(existing))
+        self.assertNotEqual(desired, _spec("sessions", "date", "clubId"))
+        self.assertIs(sync_firestore_indexes.IndexSpec, IndexSpec)
+
+    def test_vector_config_specs_are_hashable(self) -> None:
+        raw = {
+            "collectionGroup": "docs",
+            "fields": [{"fieldPath": "embedding", "vectorConfig": {"dimension": 3, "flat": {}}}],
+        }
+        spec = IndexSpec.from_desired(raw)
+        self.assertIn(IndexSpec.from_desired(raw), {spec})
+        self.assertEqual(spec.describe_fields(), "embedding VECTOR")
+        self.assertEqual(spec.to_create_body()["fields"], raw["fields"])
+
+    def test_pickle_recomputes_hash_from_fields(self) -> None:
+        spec = _spec("sessions", "clubId", "date")
+        self.assertEqual(pickle.loads(pickle.dumps(spec)), spec)
+        self.assertEqual(hash(pickle.loads(pickle.dumps(spec))), hash(spec))
+
+        # A spec pickled by a process with another string hash seed must still match.
+        script = (
+            "import pickle, sys; from tools.index_spec import IndexSpec; "
+            "spec = IndexSpec.from_desired({'collectionGroup': 'sessions', 'fields': ["
+            "{'fieldPath': 'clubId', 'order': 'ASCENDING'}, {'fieldPath': 'date', 'order': 'ASCENDING'}]}); "
+            "sys.stdout.buffer.write(pickle.dumps(spec))"
+        )
+        pickled = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=ROOT,
+            env={**os.environ, "PYTHONHASHSEED": "1"},
+            capture_output=True,
+            check=True,
+        ).stdout
+        self.assertIn(pickle.loads(pickled), {spec})
+
+
+class IndexSetTest(unittest.TestCase):
+    def test_set_algebra_keeps_left_operand_order(self) -> None:
+        a, b, c = _spec("a", "x"), _spec("b", "x"), _spec("c", "x")
+        left = IndexSet([c, a, b, a])
+        right = IndexSet([b, _spec("d", "x")])
+
+        self.assertEqual(list(left), [c, a, b])
+        self.assertEqual(list(left - right), [c, a])
+        self.assertEqual(list(left & right), [b])
+        self.assertEqual([spec.collection_group for spec in left | right], ["c", "a", "b", "d"])
+        self.assertTrue(left.add(_spec("e", "x")))
+        self.assertFalse(left.add(_spec("a", "x")))
+        self.assertEqual(len(left), 4)
+
+    def test_lookup_by_collection_group_and_scope(self) -> None:
+        specs = IndexSet([_spec("a", "x"), _spec("b", "x"), _spec("a", "y", scope="COLLECTION_GROUP")])
+        self.assertEqual(specs.groups(), ["a", "b"])
+        self.assertEqual(len(specs.by_group("a")), 2)
+        self.assertEqual(specs.by_group("a", "COLLECTION_GROUP"), [_spec("a", "y", scope="COLLECTION_GROUP")])
+        self.assertEqual(specs.by_group("missing"), [])
+
+    def test_prefix_subsumption_ignores_trailing_name_and_other_scopes(self) -> None:
+        short = _spec("m", "coachId", "__name__")
+        longer = _spec("m", "coachId", "startDate", "__name__")
+        longest = _spec("m", "coachId", "startDate", "endDate")
+        other_scope = _spec("m", "coachId", "startDate", scope="COLLECTION_GROUP")
+        specs = IndexSet([longest, short, longer, other_scope, _spec("n", "coachId", "startDate")])
+
+        self.assertEqual(specs.subsumed_by(short), [longest, longer])
+        self.assertEqual(specs.subsumed_by(longest), [])
+        self.assertEqual(
+            sorted((spec.describe_fields(), other.describe_fields()) for spec, other in specs.prefix_pairs()),
+            [
+                ("coachId ASCENDING, __name__ ASCENDING", "coachId ASCENDING, startDate ASCENDING, __name__ ASCENDING"),
+                ("coachId ASCENDING, __name__ ASCENDING", "coachId ASCENDING, startDate ASCENDING, endDate ASCENDING"),
+                (
+                    "coachId ASCENDING, startDate ASCENDING, __name__ ASCENDING",
+                    "coachId ASCENDING, startDate ASCENDING, endDate ASCENDING",
+                ),
+            ],
+        )
+
+    def test_specs_without_ordered_fields_are_not_prefixes(self) -> None:
+        name_only = _spec("m", "__name__")
+        no_fields = _spec("m")
+        specs = IndexSet([name_only, no_fields, _spec("m", "coachId"), _spec("m", "coachId", "startDate")])
+
+        self.assertEqual(specs.subsumed_by(name_only), [])
+        self.assertEqual(specs.subsumed_by(no_fields), [])
+        self.assertEqual(
+            [(spec.describe_fields(), other.describe_fields()) for spec, other in specs.prefix_pairs()],
+            [("coachId ASCENDING", "coachId ASCENDING, startDate ASCENDING")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
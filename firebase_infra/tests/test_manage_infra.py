@@ -1,7 +1,9 @@
+import json
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
@@ -131,6 +133,300 @@ class ManageInfraTests(unittest.TestCase):
             self.assertIn("match /dailyTrainingRecords/{id}", firestore_rules)
             self.assertFalse((root / "generated" / "firestore.indexes.json").exists())
 
+    def _create_default_apps(self, root: Path) -> None:
+        (root / "apps").mkdir(parents=True, exist_ok=True)
+        (root / "generated").mkdir(parents=True, exist_ok=True)
+        self._create_app(
+            root,
+            app="swimify",
+            rules_paths=["/users/{userId}"],
+            index_groups=["users"],
+            storage_paths=[],
+            rules_part="    match /users/{userId} {\n      allow read: if true;\n    }\n",
+            storage_part="",
+        )
+
+    def test_compose_is_noop_when_digests_match(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+
+            self.assertEqual([], manage_infra.compose(root, check=False))
+            self.assertTrue((root / "generated" / manage_infra.DIGEST_MANIFEST_FILE).exists())
+
+            with mock.patch.object(manage_infra, "compose_firestore_rules", side_effect=AssertionError):
+                self.assertEqual([], manage_infra.compose(root, check=False))
+                self.assertEqual([], manage_infra.compose(root, check=True))
+
+    def test_compose_check_fails_until_manifest_matches_tool_code(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            manage_infra.compose(root, check=False)
+            manifest = root / "generated" / manage_infra.DIGEST_MANIFEST_FILE
+
+            with mock.patch.object(manage_infra, "tool_fingerprint", return_value="1+edited"):
+                with mock.patch.object(manage_infra, "compose_firestore_rules", return_value="stale\n"):
+                    errors = manage_infra.compose(root, check=True)
+                self.assertTrue(any(error.endswith("firestore.rules") for error in errors))
+
+                # Unchanged outputs still fail the check until the manifest is regenerated.
+                errors = manage_infra.compose(root, check=True)
+                self.assertEqual([f"Generated file out of date: {manifest}"], errors)
+                self.assertEqual([], manage_infra.compose(root, check=False))
+                self.assertEqual([], manage_infra.compose(root, check=True))
+
+    def test_compose_check_detects_changed_fragment_and_edited_output(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            manage_infra.compose(root, check=False)
+
+            part = root / "apps" / "swimify" / "firestore.rules.part"
+            part.write_text(part.read_text(encoding="utf-8") + "    match /other/{id} {}\n", encoding="utf-8")
+            errors = manage_infra.compose(root, check=True)
+            self.assertTrue(any("firestore.rules" in error for error in errors))
+
+            manage_infra.compose(root, check=False)
+            self.assertEqual([], manage_infra.compose(root, check=True))
+
+            (root / "generated" / "storage.rules").write_text("edited\n", encoding="utf-8")
+            errors = manage_infra.compose(root, check=True)
+            self.assertTrue(any("storage.rules" in error for error in errors))
+
+    def test_compose_check_without_digest_manifest_reports_only_the_manifest(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            manage_infra.compose(root, check=False)
+            manifest = root / "generated" / manage_infra.DIGEST_MANIFEST_FILE
+            manifest.unlink()
+
+            self.assertEqual([f"Generated file out of date: {manifest}"], manage_infra.compose(root, check=True))
+            self.assertFalse(manifest.exists())
+
+    @staticmethod
+    def _index(group: str, *fields: str, scope: str = "COLLECTION") -> dict:
+        return {
+            "collectionGroup": group,
+            "queryScope": scope,
+            "fields": [{"fieldPath": field, "order": "ASCENDING"} for field in fields],
+        }
+
+    def _write_index_part(self, root: Path, app: str, indexes: list[dict], overrides: list[dict]) -> None:
+        payload = {"indexes": indexes, "fieldOverrides": overrides}
+        (root / "apps" / app / "firestore.indexes.part.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    def test_compose_indexes_dedupes_sorts_and_merges_overrides(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            self._create_app(
+                root,
+                app="aquis",
+                rules_paths=[],
+                index_groups=["dailyTrainingRecords"],
+                storage_paths=[],
+                rules_part="",
+                storage_part="",
+            )
+            override = {
+                "collectionGroup": "executions",
+                "fieldPath": "startedAt",
+                "indexes": [{"order": "DESCENDING", "queryScope": "COLLECTION"}],
+            }
+            self._write_index_part(
+                root,
+                "swimify",
+                [
+                    self._index("users", "email"),
+                    self._index("users", "clubId", "createdAt"),
+                    {**self._index("users", "email"), "density": "SPARSE_ALL"},
+                ],
+                [override],
+            )
+            self._write_index_part(root, "aquis", [self._index("dailyTrainingRecords", "userId")], [override])
+
+            self.assertEqual([], manage_infra.compose_indexes(root, check=False))
+            merged = json.loads((root / "generated" / "firestore.indexes.json").read_text(encoding="utf-8"))
+
+            self.assertEqual(
+                [
+                    ("dailyTrainingRecords", ["userId"]),
+                    ("users", ["clubId", "createdAt"]),
+                    ("users", ["email"]),
+                ],
+                [
+                    (index["collectionGroup"], [field["fieldPath"] for field in index["fields"]])
+                    for index in merged["indexes"]
+                ],
+            )
+            self.assertEqual([override], merged["fieldOverrides"])
+            self.assertEqual([], manage_infra.compose_indexes(root, check=True))
+
+    def test_compose_indexes_enforces_collection_group_ownership(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            self._write_index_part(root, "swimify", [self._index("analysis_requests", "email")], [])
+
+            errors = manage_infra.compose_indexes(root, check=False)
+
+            self.assertTrue(any("analysis_requests" in error for error in errors))
+            self.assertFalse((root / "generated" / "firestore.indexes.json").exists())
+
+    def test_compose_indexes_reports_missing_index_part(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            self._create_app(
+                root,
+                app="aquis",
+                rules_paths=[],
+                index_groups=["dailyTrainingRecords"],
+                storage_paths=[],
+                rules_part="",
+                storage_part="",
+            )
+            self._write_index_part(root, "swimify", [self._index("users", "email")], [])
+
+            errors = manage_infra.compose_indexes(root, check=False)
+
+            self.assertEqual([f"Missing index part: {root / 'apps' / 'aquis' / 'firestore.indexes.part.json'}"], errors)
+            self.assertFalse((root / "generated" / "firestore.indexes.json").exists())
+
+    def test_compose_indexes_rejects_conflicting_field_overrides(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            self._create_app(
+                root,
+                app="aquis",
+                rules_paths=[],
+                index_groups=[],
+                storage_paths=[],
+                rules_part="",
+                storage_part="",
+            )
+            base = {"collectionGroup": "executions", "fieldPath": "startedAt"}
+            self._write_index_part(
+                root, "swimify", [], [{**base, "indexes": [{"order": "ASCENDING", "queryScope": "COLLECTION"}]}]
+            )
+            self._write_index_part(
+                root, "aquis", [], [{**base, "indexes": [{"order": "DESCENDING", "queryScope": "COLLECTION"}]}]
+            )
+
+            errors = manage_infra.compose_indexes(root, check=False)
+
+            self.assertTrue(any("executions.startedAt" in error for error in errors))
+
+    def test_analyze_indexes_reports_duplicates_prefixes_and_cross_app(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            self._create_app(
+                root,
+                app="aquis",
+                rules_paths=[],
+                index_groups=[],
+                storage_paths=[],
+                rules_part="",
+                storage_part="",
+            )
+            self._write_index_part(
+                root,
+                "swimify",
+                [
+                    self._index("users", "clubId", "__name__"),
+                    self._index("users", "clubId", "createdAt", "__name__"),
+                    self._index("users", "email"),
+                    self._index("users", "email"),
+                    {
+                        "collectionGroup": "users",
+                        "queryScope": "COLLECTION",
+                        "fields": [
+                            {"fieldPath": "roles", "arrayConfig": "CONTAINS"},
+                            {"fieldPath": "email", "order": "ASCENDING"},
+                        ],
+                    },
+                    {
+                        "collectionGroup": "users",
+                        "queryScope": "COLLECTION",
+                        "fields": [
+                            {"fieldPath": "roles", "arrayConfig": "CONTAINS"},
+                            {"fieldPath": "email", "order": "ASCENDING"},
+                            {"fieldPath": "age", "order": "ASCENDING"},
+                        ],
+                    },
+                ],
+                [],
+            )
+            self._write_index_part(
+                root,
+                "aquis",
+                [self._index("users", "uid"), self._index("users", "clubId", "createdAt", "__name__")],
+                [],
+            )
+
+            findings, errors = manage_infra.analyze_indexes(root)
+
+            self.assertEqual([], errors)
+            kinds = sorted((item.kind, item.collection_group, item.index) for item in findings)
+            self.assertEqual(
+                [
+                    ("cross_app", "users", "clubId ASCENDING, createdAt ASCENDING, __name__ ASCENDING"),
+                    ("duplicate", "users", "email ASCENDING"),
+                    ("prefix", "users", "clubId ASCENDING, __name__ ASCENDING"),
+                    ("prefix", "users", "roles CONTAINS, email ASCENDING"),
+                ],
+                kinds,
+            )
+            cross_app = next(item for item in findings if item.kind == "cross_app")
+            self.assertEqual(
+                ("apps/swimify/firestore.indexes.part.json", "apps/aquis/firestore.indexes.part.json"),
+                cross_app.sources,
+            )
+            fanout = manage_infra.ARRAY_CONTAINS_FANOUT
+            costs = {item.index: (item.write_cost, item.group_index_count) for item in findings}
+            group_cost = 4 + 2 * fanout
+            self.assertEqual((1, 6), costs["email ASCENDING"])
+            self.assertEqual((1, 6), costs["clubId ASCENDING, __name__ ASCENDING"])
+            self.assertEqual((1, 6), costs["clubId ASCENDING, createdAt ASCENDING, __name__ ASCENDING"])
+            self.assertEqual((fanout, 6), costs["roles CONTAINS, email ASCENDING"])
+            self.assertTrue(all(item.group_entries_per_write == group_cost for item in findings))
+            self.assertEqual(fanout, findings[-1].to_dict()["writeCost"])
+            report = manage_infra.format_index_findings(findings, set())
+            self.assertIn(
+                f"~{fanout} index entries per write to 'users' (~{group_cost} across 6 composite indexes", report
+            )
+            self.assertIn(
+                "createdAt ASCENDING, __name__ ASCENDING) defined in apps/swimify/firestore.indexes.part.json, "
+                "apps/aquis/firestore.indexes.part.json",
+                report,
+            )
+
+    def test_analyze_indexes_fails_only_on_findings_missing_from_baseline(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "firebase_infra"
+            self._create_default_apps(root)
+            self._write_index_part(
+                root, "swimify", [self._index("users", "email"), self._index("users", "email")], []
+            )
+            baseline = root / manage_infra.INDEX_BASELINE_FILE
+
+            with mock.patch("builtins.print"):
+                self.assertEqual(1, manage_infra.run_analyze_indexes(root, "text", baseline, False))
+                self.assertEqual(0, manage_infra.run_analyze_indexes(root, "text", baseline, True))
+                self.assertEqual(0, manage_infra.run_analyze_indexes(root, "json", baseline, False))
+
+                self._write_index_part(
+                    root,
+                    "swimify",
+                    [self._index("users", "email"), self._index("users", "email"), self._index("users", "email", "age")],
+                    [],
+                )
+                self.assertEqual(1, manage_infra.run_analyze_indexes(root, "text", baseline, False))
+
 
 if __name__ == "__main__":
     unittest.main()
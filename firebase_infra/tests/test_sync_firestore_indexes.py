@@ -0,0 +1,337 @@
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_firestore_admin import FakeFirestoreAdmin
+from tools import sync_firestore_indexes as sync
+
+
+def _index(group: str, *fields: str) -> dict:
+    return {
+        "collectionGroup": group,
+        "queryScope": "COLLECTION",
+        "fields": [{"fieldPath": field, "order": "ASCENDING"} for field in fields],
+    }
+
+
+def _existing(*fields: str) -> dict:
+    raw = _index("unused", *fields)
+    raw.pop("collectionGroup")
+    return raw
+
+
+class SyncFirestoreIndexesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.indexes_file = Path(self._tmp.name) / "firestore.indexes.json"
+        self.sleeps: list[float] = []
+
+    def _write_desired(self, *indexes: dict) -> None:
+        self.indexes_file.write_text(json.dumps({"indexes": list(indexes)}), encoding="utf-8")
+
+    def _sync(self, admin: FakeFirestoreAdmin, **kwargs) -> sync.SyncResult:
+        client = sync.ApiClient(
+            token="t", quota_project=admin.project_id, api_base=admin.api_base, sleep=self.sleeps.append
+        )
+        self.addCleanup(client.close)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sync.sync_indexes(admin.project_id, self.indexes_file, client=client, **kwargs)
+
+    def test_concurrent_create_and_delete_reuse_connections(self) -> None:
+        desired = [_index(f"group{n}", "a", f"f{n}") for n in range(12)]
+        self._write_desired(*desired)
+        with FakeFirestoreAdmin(latency_s=0.05) as admin:
+            admin.add_index("group0", _existing("a", "f0"))
+            stale = [admin.add_index("old", _existing("x", str(n))) for n in range(3)]
+
+            result = self._sync(admin, allow_delete=True, concurrency=4)
+
+            self.assertEqual((result.created, result.already_exists, result.deleted), (11, 0, 3))
+            self.assertEqual(len(result.operations), 11)
+            self.assertTrue(all(op["name"].startswith(admin.database) for op in result.operations))
+            self.assertFalse(any(name in admin.indexes for name in stale))
+            self.assertGreater(admin.max_in_flight, 1)
+            self.assertLessEqual(admin.max_in_flight, 4)
+            # One keep-alive connection per worker thread, not one per request.
+            self.assertLessEqual(admin.connections, 4)
+            self.assertGreater(len(admin.requests), admin.connections)
+
+    def test_existing_indexes_are_left_without_allow_delete(self) -> None:
+        self._write_desired(_index("sessions", "clubId", "date"))
+        with FakeFirestoreAdmin() as admin:
+            kept = admin.add_index("old", _existing("x"))
+            result = self._sync(admin, allow_delete=False)
+            self.assertEqual((result.created, result.deleted), (1, 0))
+            self.assertIn(kept, admin.indexes)
+            self.assertEqual(admin.count("DELETE"), 0)
+
+    def test_create_conflict_counts_as_already_exists(self) -> None:
+        self._write_desired(_index("sessions", "clubId"))
+        with FakeFirestoreAdmin() as admin:
+            admin.fail_next("POST", 409)
+            result = self._sync(admin, allow_delete=False)
+            self.assertEqual((result.created, result.already_exists), (0, 1))
+
+    def test_rate_limited_requests_back_off_and_honour_retry_after(self) -> None:
+        self._write_desired(_index("sessions", "clubId"))
+        with FakeFirestoreAdmin() as admin:
+            admin.fail_next("GET", 503, retry_after="2")
+            admin.fail_next("POST", 429, times=2)
+            result = self._sync(admin, allow_delete=False)
+            self.assertEqual(result.created, 1)
+            self.assertEqual(admin.count("POST"), 3)
+            self.assertEqual(self.sleeps[0], 2.0)
+            self.assertEqual(len(self.sleeps), 3)
+            self.assertTrue(all(delay <= sync.BACKOFF_MAX_S for delay in self.sleeps))
+
+    def test_retry_after_is_capped(self) -> None:
+        self._write_desired(_index("sessions", "clubId"))
+        with FakeFirestoreAdmin() as admin:
+            admin.fail_next("POST", 429, retry_after="86400")
+            result = self._sync(admin, allow_delete=False)
+            self.assertEqual(result.created, 1)
+            self.assertEqual(self.sleeps, [sync.RETRY_AFTER_MAX_S])
+
+    def test_dropped_connection_retries_reads_but_not_creates(self) -> None:
+        self._write_desired(_index("sessions", "clubId"))
+        with FakeFirestoreAdmin() as admin:
+            admin.drop_next("GET")
+            admin.drop_next("POST")
+            with self.assertRaisesRegex(RuntimeError, "1 index operation"):
+                self._sync(admin, allow_delete=False)
+            self.assertEqual((admin.count("GET"), admin.count("POST")), (2, 1))
+            self.assertEqual(len(admin.indexes), 1)
+
+            # The create went through on the server, so a rerun has nothing left to do.
+            result = self._sync(admin, allow_delete=False)
+            self.assertEqual((result.created, admin.count("POST")), (0, 1))
+
+    def test_failures_are_collected_after_all_operations_ran(self) -> None:
+        self._write_desired(*(_index(f"group{n}", "a") for n in range(3)))
+        with FakeFirestoreAdmin() as admin:
+            admin.fail_next("POST", 400, times=2)
+            with self.assertRaisesRegex(RuntimeError, "2 index operation"):
+                self._sync(admin, allow_delete=False, concurrency=1)
+            self.assertEqual(admin.count("POST"), 3)
+            self.assertEqual(len([n for n in admin.indexes if "/group" in n]), 1)
+
+    def test_wait_polls_operations_until_ready_and_reports_progress(self) -> None:
+        self._write_desired(
+            _index("sessions", "clubId", "date"), _index("sessions", "coachId"), _index("meets", "clubId")
+        )
+        with FakeFirestoreAdmin(build_polls=3) as admin:
+            creating = admin.add_index("meets", _existing("clubId"), state="CREATING")
+
+            result = self._sync(admin, allow_delete=False, wait=True, poll_initial_s=0.001)
+
+            self.assertEqual(result.created, 2)
+            self.assertEqual(len(result.builds), 3)
+            self.assertTrue(all(build.state == "READY" for build in result.builds))
+            self.assertEqual(admin.indexes[creating]["state"], "READY")
+            self.assertTrue(all(raw["state"] == "READY" for raw in admin.indexes.values()))
+
+    def test_wait_tracks_indexes_whose_create_conflicted(self) -> None:
+        self._write_desired(_index("sessions", "clubId"))
+        with FakeFirestoreAdmin(build_polls=2) as admin:
+            name = admin.add_index("sessions", _existing("clubId"), state="CREATING")
+            # An empty first listing stands in for an index created after it, so the create gets a 409.
+            admin.fail_next("GET", 200)
+
+            result = self._sync(admin, allow_delete=False, wait=True, poll_initial_s=0.001)
+
+            self.assertEqual((result.created, result.already_exists), (0, 1))
+            self.assertEqual([build.index for build in result.builds], [name])
+            self.assertEqual(admin.indexes[name]["state"], "READY")
+
+    def test_wait_timeout_must_be_positive(self) -> None:
+        with contextlib.redirect_stderr(io.StringIO()):
+            for value in ("0", "-5", "nan"):
+                with self.assertRaises(SystemExit):
+                    sync.parse_args(["--project-id", "p", "--wait", "--wait-timeout", value])
+        self.assertEqual(sync.parse_args(["--project-id", "p", "--wait-timeout", "2.5"]).wait_timeout, 2.5)
+
+    def test_wait_backs_off_adaptively_and_times_out(self) -> None:
+        self._write_desired(_index("sessions", "clubId"))
+        with FakeFirestoreAdmin(build_polls=1000) as admin:
+            name = admin.add_index("sessions", _existing("clubId"), state="CREATING")
+            client = sync.ApiClient(token="t", quota_project=admin.project_id, api_base=admin.api_base)
+            self.addCleanup(client.close)
+            now = [0.0]
+            delays: list[float] = []
+
+            def sleep(delay: float) -> None:
+                delays.append(delay)
+                now[0] += delay
+
+            builds = [sync.IndexBuild(collection_group="sessions", index=name)]
+            reports: list[str] = []
+            with self.assertRaisesRegex(TimeoutError, "1 index"):
+                sync.wait_for_indexes(
+                    client,
+                    builds,
+                    timeout_s=60,
+                    poll_initial_s=1,
+                    poll_max_s=10,
+                    clock=lambda: now[0],
+                    sleep=sleep,
+                    progress=reports.append,
+                )
+
+            self.assertEqual(delays[:3], [1, 1.5, 2.25])
+            self.assertEqual(max(delays), 10)
+            self.assertAlmostEqual(sum(delays), 60)
+            self.assertEqual(reports, ["Index build progress: sessions 0/1"])
+
+    def test_wait_reports_failed_builds(self) -> None:
+        self._write_desired(_index("sessions", "clubId"), _index("meets", "clubId"))
+        with FakeFirestoreAdmin(build_polls=2, failing_groups=frozenset({"meets"})) as admin:
+            with self.assertRaisesRegex(RuntimeError, "1 index build"):
+                self._sync(admin, allow_delete=False, wait=True, poll_initial_s=0.001)
+
+    def test_snapshot_then_offline_plan_matches_sync(self) -> None:
+        self._write_desired(_index("sessions", "clubId", "date"), _index("meets", "clubId"))
+        snapshot = Path(self._tmp.name) / "snapshot.json"
+        with FakeFirestoreAdmin() as admin:
+            admin.add_index("meets", {**_existing("clubId"), "density": "SPARSE_ALL"})
+            stale = admin.add_index("old", _existing("x"))
+            client = sync.ApiClient(token="t", quota_project=admin.project_id, api_base=admin.api_base)
+            self.addCleanup(client.close)
+            self.assertEqual(sync.write_snapshot(client, admin.project_id, snapshot), 2)
+            requests_before_plan = len(admin.requests)
+
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = sync.main(
+                    ["plan", "--indexes-file", str(self.indexes_file), "--snapshot", str(snapshot),
+                     "--allow-delete", "--format", "json", "--exit-code"]
+                )
+            self.assertEqual(len(admin.requests), requests_before_plan)
+            plan = json.loads(out.getvalue())
+            self.assertEqual(code, 2)
+            self.assertEqual([entry["collectionGroup"] for entry in plan["create"]], ["sessions"])
+            self.assertEqual(plan["delete"], [stale])
+            self.assertEqual(plan["unchanged"], 1)
+
+            result = self._sync(admin, allow_delete=True)
+            self.assertEqual((result.created, result.deleted), (1, 1))
+
+    def test_plan_text_lists_kept_extras_and_exits_zero_without_changes(self) -> None:
+        self._write_desired(_index("meets", "clubId"))
+        snapshot = Path(self._tmp.name) / "snapshot.json"
+        extra = {"name": "projects/p/databases/(default)/collectionGroups/old/indexes/i1", **_existing("x")}
+        present = {"name": "projects/p/databases/(default)/collectionGroups/meets/indexes/i2", **_existing("clubId")}
+        # A bare list, as printed by `gcloud firestore indexes composite list --format=json`.
+        snapshot.write_text(json.dumps([extra, present]), encoding="utf-8")
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = sync.main(["plan", "--snapshot", str(snapshot), "--indexes-file", str(self.indexes_file), "--exit-code"])
+
+        self.assertEqual(code, 0)
+        self.assertIn("keep", out.getvalue())
+        self.assertIn("old [COLLECTION] (x ASCENDING)", out.getvalue())
+        self.assertIn("Plan: create=0 delete=0 unchanged=1 extra_kept=1", out.getvalue())
+
+    def test_arguments_without_subcommand_mean_sync(self) -> None:
+        args = sync.parse_args(["--project-id", "p", "--allow-delete"])
+        self.assertEqual((args.command, args.project_id, args.allow_delete), ("sync", "p", True))
+        self.assertEqual(args.indexes_file, sync.DEFAULT_INDEXES_FILE)
+
+    def test_list_page_decoder_streams_entries_across_chunk_boundaries(self) -> None:
+        page = {
+            "nextPageToken": "tok\u00e9n",
+            "indexes": [
+                {"name": f"n{n}", "fields": [{"fieldPath": "caf\u00e9", "order": "ASCENDING"}], "n": 10**n}
+                for n in range(6)
+            ],
+            "total": 12345,
+        }
+        for text in (json.dumps(page), json.dumps(page, indent=3), json.dumps({"indexes": []}), "{}"):
+            data = text.encode("utf-8")
+            for size in (1, 2, 3, 7, 64):
+                chunks = [data[i:i + size] for i in range(0, len(data), size)]
+                entries: list[dict] = []
+                rest = sync._ListPageDecoder(lambda _: chunks.pop(0) if chunks else b"", entries.append).decode()
+                expected = json.loads(text)
+                self.assertEqual(entries, expected.pop("indexes", []))
+                self.assertEqual(rest, expected)
+
+        with self.assertRaises(ValueError):
+            truncated = [b'{"indexes": [{"a": 1}', b""]
+            sync._ListPageDecoder(lambda _: truncated.pop(0), lambda _: None).decode()
+
+    def test_listing_runs_per_desired_group_and_records_request_stats(self) -> None:
+        self._write_desired(*(_index(f"group{n}", "a", str(m)) for n in range(4) for m in range(3)))
+        with FakeFirestoreAdmin(latency_s=0.02) as admin:
+            for n in range(4):
+                for m in range(5):
+                    admin.add_index(f"group{n}", _existing("a", str(m)))
+            admin.add_index("unrelated", _existing("z"))
+            stats = sync.RequestStats()
+            client = sync.ApiClient(token="t", quota_project=admin.project_id, api_base=admin.api_base, stats=stats)
+            self.addCleanup(client.close)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = sync.sync_indexes(admin.project_id, self.indexes_file, False, client=client, concurrency=4)
+
+            self.assertEqual((result.created, result.already_exists), (0, 0))
+            listed = [target for method, target in admin.requests if method == "GET"]
+            self.assertFalse(any("/collectionGroups/-/" in target for target in listed))
+            self.assertFalse(any("/unrelated/" in target for target in listed))
+            self.assertEqual(len(listed), 12)  # 5 indexes per group, 2 per page
+            self.assertGreater(admin.max_in_flight, 1)
+
+            report = stats.to_dict()["list"]
+            self.assertEqual(report["requests"], 12)
+            self.assertGreater(report["bytes"], 0)
+            self.assertGreater(report["latency_max_s"], 0)
+            self.assertIn("list: 12 request(s)", stats.format_text())
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                sync.sync_indexes(admin.project_id, self.indexes_file, True, client=client)
+            self.assertTrue(any("/collectionGroups/-/" in target for _, target in admin.requests))
+            self.assertNotIn("/unrelated/", "".join(admin.indexes))
+
+    def test_listing_retried_mid_page_reports_each_entry_once(self) -> None:
+        # Large enough that the first streamed chunk is decoded before the reset.
+        with FakeFirestoreAdmin(page_size=1000) as admin:
+            for n in range(800):
+                admin.add_index(f"group{n}", _existing(f"field{n}", "x" * 60))
+            admin.reset_next("GET")
+            client = sync.ApiClient(token="t", quota_project=admin.project_id, api_base=admin.api_base)
+            self.addCleanup(client.close)
+
+            entries = sync._list_index_entries(client, admin.project_id)
+
+            self.assertEqual(admin.count("GET"), 2)
+            self.assertEqual(sorted(raw["name"] for raw in entries), sorted(admin.indexes))
+
+    def test_listing_failures_of_all_groups_are_reported(self) -> None:
+        self._write_desired(*(_index(f"group{n}", "a") for n in range(3)))
+        with FakeFirestoreAdmin() as admin:
+            admin.fail_next("GET", 400, times=2)
+            with self.assertRaisesRegex(RuntimeError, "2 collection group listing") as caught:
+                self._sync(admin, allow_delete=False, concurrency=1)
+            self.assertEqual(admin.count("GET"), 3)
+            self.assertEqual(admin.count("POST"), 0)
+            self.assertIn("for group0", str(caught.exception))
+            self.assertIn("for group1", str(caught.exception))
+
+    def test_retry_after_parses_seconds_and_http_dates(self) -> None:
+        self.assertEqual(sync._retry_after_s("3"), 3.0)
+        self.assertIsNone(sync._retry_after_s(None))
+        self.assertIsNone(sync._retry_after_s("soon"))
+        self.assertEqual(sync._retry_after_s("Mon, 01 Jan 2001 00:00:00 GMT"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""Estimate worst-case get()/exists() document reads per rules path and operation.
+
+Firestore rules allow 10 document access calls for single-document requests
+and queries, and 20 for multi-document reads, transactions and batched
+writes. This analyzer resolves helper-function calls (with argument
+substitution) for every ``allow`` statement and counts the distinct
+documents the rules could read, assuming no short-circuiting.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+SINGLE_REQUEST_LIMIT = 10
+BATCH_REQUEST_LIMIT = 20
+DEFAULT_WARN_AT = 8
+
+READ_OPS = ("get", "list")
+WRITE_OPS = ("create", "update", "delete")
+OP_EXPANSION = {"read": READ_OPS, "write": WRITE_OPS}
+ROOT_MATCH = "/databases/{database}/documents"
+
+ACCESS_CALL_RE = re.compile(r"(?<![\w.$])(get|exists|getAfter|existsAfter)\s*\(")
+CALL_RE = re.compile(r"(?<![\w.$])([A-Za-z_]\w*)\s*\(")
+BLOCK_HEADER_RE = re.compile(r"\s*(\S+)\s*\{")
+STATEMENT_RE = re.compile(r"\b(match|function|allow|service|rules_version)\b")
+SIMPLE_ARG_RE = re.compile(r"^[\w.]+(?:\([^()]*\))?$")
+MAX_CALL_DEPTH = 32
+
+
+@dataclass
+class RulesFunction:
+    name: str
+    params: list[str]
+    body: str
+    scope: "MatchBlock"
+
+
+@dataclass
+class AllowRule:
+    ops: tuple[str, ...]
+    condition: str
+    line: int
+
+
+@dataclass
+class MatchBlock:
+    path: str
+    line: int
+    parent: "MatchBlock | None" = None
+    functions: dict[str, RulesFunction] = field(default_factory=dict)
+    rules: list[AllowRule] = field(default_factory=list)
+    children: list["MatchBlock"] = field(default_factory=list)
+
+    @property
+    def full_path(self) -> str:
+        parts: list[str] = []
+        block: MatchBlock | None = self
+        while block is not None:
+            if block.path and block.path != ROOT_MATCH:
+                parts.append(block.path)
+            block = block.parent
+        return "".join(reversed(parts)) or "/"
+
+    def lookup(self, name: str) -> RulesFunction | None:
+        block: MatchBlock | None = self
+        while block is not None:
+            if name in block.functions:
+                return block.functions[name]
+            block = block.parent
+        return None
+
+
+@dataclass(frozen=True)
+class OperationCost:
+    path: str
+    operation: str
+    line: int
+    reads: tuple[str, ...]
+    functions: tuple[str, ...]
+
+    @property
+    def read_count(self) -> int:
+        return len(self.reads)
+
+    def status(self, warn_at: int = DEFAULT_WARN_AT) -> str:
+        if self.read_count > BATCH_REQUEST_LIMIT:
+            return "over-batch-limit"
+        if self.read_count > SINGLE_REQUEST_LIMIT:
+            return "over-limit"
+        if self.read_count >= warn_at:
+            return "near-limit"
+        return "ok"
+
+    def to_dict(self, warn_at: int = DEFAULT_WARN_AT) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "operation": self.operation,
+            "line": self.line,
+            "reads": self.read_count,
+            "status": self.status(warn_at),
+            "documents": list(self.reads),
+            "functions": list(self.functions),
+        }
+
+
+def strip_comments(text: str) -> str:
+    """Blank out ``//`` and ``/* */`` comments, keeping string literals and line numbers."""
+    output: list[str] = []
+    index = 0
+    quote: str | None = None
+    while index < len(text):
+        char = text[index]
+        if quote:
+            output.append(char)
+            if char == "\\" and index + 1 < len(text):
+                output.append(text[index + 1])
+                index += 2
+                continue
+            if char == quote:
+                quote = None
+            index += 1
+            continue
+        if char in "'\"":
+            quote = char
+            output.append(char)
+            index += 1
+            continue
+        if text.startswith("//", index):
+            end = text.find("\n", index)
+            end = len(text) if end == -1 else end
+            index = end
+            continue
+        if text.startswith("/*", index):
+            end = text.find("*/", index + 2)
+            end = len(text) if end == -1 else end + 2
+            output.append("".join("\n" if c == "\n" else " " for c in text[index:end]))
+            index = end
+            continue
+        output.append(char)
+        index += 1
+    return "".join(output)
+
+
+def _skip_string(text: str, index: int) -> int:
+    quote = text[index]
+    index += 1
+    while index < len(text) and text[index] != quote:
+        index += 2 if text[index] == "\\" else 1
+    return index + 1
+
+
+def find_closing(text: str, index: int) -> int:
+    """Index just past the bracket matching ``text[index]``."""
+    pairs = {"(": ")", "{": "}", "[": "]"}
+    stack = [pairs[text[index]]]
+    index += 1
+    while index < len(text) and stack:
+        char = text[index]
+        if char in "'\"":
+            index = _skip_string(text, index)
+            continue
+        if char in pairs:
+            stack.append(pairs[char])
+        elif char == stack[-1]:
+            stack.pop()
+        index += 1
+    return index
+
+
+def find_statement_end(text: str, index: int) -> int:
+    """Index of the ``;`` ending the statement at ``index``, outside brackets and strings."""
+    depth = 0
+    while index < len(text):
+        char = text[index]
+        if char in "'\"":
+            index = _skip_string(text, index)
+            continue
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            if depth == 0:
+                return index
+            depth -= 1
+        elif char == ";" and depth == 0:
+            return index
+        index += 1
+    return index
+
+
+def split_args(text: str) -> list[str]:
+    args: list[str] = []
+    depth = 0
+    start = 0
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char in "'\"":
+            index = _skip_string(text, index)
+            continue
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            args.append(text[start:index].strip())
+            start = index + 1
+        index += 1
+    tail = text[start:].strip()
+    if tail:
+        args.append(tail)
+    return args
+
+
+def parse_rules(text: str) -> MatchBlock:
+    """Parse match blocks, functions and allow statements into a tree rooted at the service."""
+    source = strip_comments(text)
+    root = MatchBlock(path="", line=1)
+    _parse_block(source, 0, len(source), root)
+    return root
+
+
+def _line_of(text: str, index: int) -> int:
+    return text.count("\n", 0, index) + 1
+
+
+def _parse_block(text: str, start: int, end: int, block: MatchBlock) -> None:
+    index = start
+    while True:
+        found = STATEMENT_RE.search(text, index, end)
+        if found is None:
+            return
+        keyword = found.group(1)
+        index = found.end()
+        if keyword in ("match", "service"):
+            # Paths contain braces themselves (``/users/{userId}``), so take the next token first.
+            header = BLOCK_HEADER_RE.match(text, index, end)
+            if header is None:
+                return
+            brace = header.end() - 1
+            close = find_closing(text, brace)
+            if keyword == "match":
+                child = MatchBlock(path=header.group(1), line=_line_of(text, found.start()), parent=block)
+                block.children.append(child)
+                _parse_block(text, brace + 1, close - 1, child)
+            else:
+                _parse_block(text, brace + 1, close - 1, block)
+            index = close
+        elif keyword == "function":
+            paren = text.find("(", index, end)
+            name = text[index:paren].strip()
+            params_end = find_closing(text, paren)
+            brace = text.find("{", params_end, end)
+            close = find_closing(text, brace)
+            block.functions[name] = RulesFunction(
+                name=name,
+                params=split_args(text[paren + 1 : params_end - 1]),
+                body=text[brace + 1 : close - 1],
+                scope=block,
+            )
+            index = close
+        elif keyword == "allow":
+            statement_end = find_statement_end(text, index)
+            statement = text[index:statement_end]
+            ops_text, _, condition = statement.partition(":")
+            condition = condition.strip()
+            if condition.startswith("if"):
+                condition = condition[2:].strip()
+            ops: list[str] = []
+            for op in (part.strip() for part in ops_text.split(",")):
+                ops.extend(OP_EXPANSION.get(op, (op,)))
+            block.rules.append(AllowRule(tuple(ops), condition, _line_of(text, found.start())))
+            index = statement_end + 1
+        else:
+            index = find_statement_end(text, index) + 1
+
+
+def _substitute(body: str, params: list[str], args: list[str]) -> str:
+    for param, arg in zip(params, args):
+        # Simple arguments are inserted bare so equal documents render as equal paths.
+        replacement = arg if SIMPLE_ARG_RE.match(arg) else f"({arg})"
+        body = re.sub(rf"(?<![\w.$]){re.escape(param)}(?!\w)", lambda _m, text=replacement: text, body)
+    return body
+
+
+def _normalize_path(path: str) -> str:
+    return re.sub(r"\s+", "", path)
+
+
+class _ReadCollector:
+    """Collect distinct document paths read by an expression, following helper calls."""
+
+    def __init__(self) -> None:
+        self._memo: dict[tuple[int, str], tuple[frozenset[str], frozenset[str]]] = {}
+
+    def collect(self, expression: str, scope: MatchBlock, depth: int = 0) -> tuple[frozenset[str], frozenset[str]]:
+        key = (id(scope), expression)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        reads: set[str] = set()
+        functions: set[str] = set()
+        for access in ACCESS_CALL_RE.finditer(expression):
+            close = find_closing(expression, access.end() - 1)
+            reads.add(_normalize_path(expression[access.end() : close - 1]))
+
+        if depth < MAX_CALL_DEPTH:
+            for call in CALL_RE.finditer(expression):
+                function = scope.lookup(call.group(1))
+                if function is None:
+                    continue
+                close = find_closing(expression, call.end() - 1)
+                args = split_args(expression[call.end() : close - 1])
+                body = _substitute(function.body, function.params, args)
+                nested_reads, nested_functions = self.collect(body, function.scope, depth + 1)
+                functions.add(function.name)
+                reads |= nested_reads
+                functions |= nested_functions
+
+        result = (frozenset(reads), frozenset(functions))
+        self._memo[key] = result
+        return result
+
+
+def analyze_rules(text: str) -> list[OperationCost]:
+    """Worst-case distinct document reads for every match path and operation."""
+    root = parse_rules(text)
+    collector = _ReadCollector()
+    costs: list[OperationCost] = []
+
+    def visit(block: MatchBlock) -> None:
+        per_op: dict[str, tuple[set[str], set[str], int]] = {}
+        for rule in block.rules:
+            reads, functions = collector.collect(rule.condition, block)
+            for op in rule.ops:
+                op_reads, op_functions, line = per_op.setdefault(op, (set(), set(), rule.line))
+                op_reads |= reads
+                op_functions |= functions
+        for op, (reads, functions, line) in per_op.items():
+            costs.append(
+                OperationCost(
+                    path=block.full_path,
+                    operation=op,
+                    line=line,
+                    reads=tuple(sorted(reads)),
+                    functions=tuple(sorted(functions)),
+                )
+            )
+        for child in block.children:
+            visit(child)
+
+    visit(root)
+    return costs
+
+
+SORT_KEYS = {
+    "reads": lambda cost: (-cost.read_count, cost.path, cost.operation),
+    "path": lambda cost: (cost.path, cost.operation),
+    "line": lambda cost: (cost.line, cost.operation),
+}
+
+
+def format_report(costs: list[OperationCost], warn_at: int = DEFAULT_WARN_AT) -> str:
+    if not costs:
+        return "No allow statements found."
+    width = max(len(cost.path) for cost in costs)
+    lines = [f"{'reads':>5}  {'status':<16}  {'op':<6}  {'path':<{width}}  line"]
+    for cost in costs:
+        lines.append(
+            f"{cost.read_count:>5}  {cost.status(warn_at):<16}  {cost.operation:<6}  "
+            f"{cost.path:<{width}}  {cost.line}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Estimate worst-case document reads in Firestore rules")
+    parser.add_argument(
+        "--rules-file",
+        default=str(Path(__file__).resolve().parents[1] / "generated" / "firestore.rules"),
+        help="Path to the composed firestore.rules",
+    )
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="reads")
+    parser.add_argument(
+        "--min-reads",
+        type=int,
+        default=0,
+        help="Only report operations with at least this many reads",
+    )
+    parser.add_argument(
+        "--warn-at",
+        type=int,
+        default=DEFAULT_WARN_AT,
+        help=f"Mark operations with at least this many reads as near the {SINGLE_REQUEST_LIMIT}-read limit",
+    )
+    parser.add_argument(
+        "--fail-on",
+        choices=["never", "near-limit", "over-limit"],
+        default="over-limit",
+        help="Exit 1 when any operation reaches this status",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    costs = analyze_rules(Path(args.rules_file).read_text(encoding="utf-8"))
+    costs = sorted((cost for cost in costs if cost.read_count >= args.min_reads), key=SORT_KEYS[args.sort])
+
+    if args.format == "json":
+        print(json.dumps([cost.to_dict(args.warn_at) for cost in costs], indent=2))
+    else:
+        print(format_report(costs, args.warn_at))
+
+    failing = {
+        "never": set(),
+        "near-limit": {"near-limit", "over-limit", "over-batch-limit"},
+        "over-limit": {"over-limit", "over-batch-limit"},
+    }[args.fail_on]
+    return 1 if any(cost.status(args.warn_at) in failing for cost in costs) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
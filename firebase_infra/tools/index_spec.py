@@ -0,0 +1,221 @@
+"""Canonical Firestore composite index specs and set operations over them."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+
+NAME_FIELD = "__name__"
+
+FieldSpec = tuple[tuple[str, Any], ...]
+
+
+def _canonical_value(value: Any) -> Any:
+    # arrayConfig/order are strings; vectorConfig is an object and needs a hashable form.
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return value
+
+
+@dataclass(frozen=True, eq=False, slots=True)
+class IndexSpec:
+    """One composite index, normalized so desired and deployed definitions compare equal.
+
+    The canonical key and its hash are computed once at construction, so
+    specs are cheap to use as dict keys and set members. Pickling keeps only
+    the public fields; string hashes differ between processes, so the key
+    and hash are recomputed on load.
+    """
+
+    collection_group: str
+    query_scope: str
+    fields: tuple[FieldSpec, ...]
+    density: str
+    key: tuple[Any, ...] = field(init=False, repr=False)
+    prefix_key: tuple[Any, ...] = field(init=False, repr=False)
+    _hash: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        fields_key = tuple(tuple((name, _canonical_value(value)) for name, value in pairs) for pairs in self.fields)
+        prefix = fields_key
+        if prefix and dict(self.fields[-1]).get("fieldPath") == NAME_FIELD:
+            prefix = prefix[:-1]
+        key = (self.collection_group, self.query_scope, fields_key, self.density)
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "prefix_key", prefix)
+        object.__setattr__(self, "_hash", hash(key))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IndexSpec):
+            return NotImplemented
+        return self is other or self.key == other.key
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (self.collection_group, self.query_scope, self.fields, self.density)
+
+    @staticmethod
+    def _norm_fields(fields: list[dict[str, Any]]) -> tuple[FieldSpec, ...]:
+        normalized: list[FieldSpec] = []
+        for raw_field in fields:
+            item: dict[str, Any] = {"fieldPath": raw_field["fieldPath"]}
+            for key in ("order", "arrayConfig", "vectorConfig"):
+                if key in raw_field:
+                    item[key] = raw_field[key]
+            normalized.append(tuple(sorted(item.items(), key=lambda kv: kv[0])))
+        return tuple(normalized)
+
+    @classmethod
+    def from_desired(cls, raw: dict[str, Any]) -> "IndexSpec":
+        return cls(
+            collection_group=raw["collectionGroup"],
+            query_scope=raw.get("queryScope", "COLLECTION"),
+            fields=cls._norm_fields(raw.get("fields", [])),
+            density=raw.get("density", "SPARSE_ALL"),
+        )
+
+    @classmethod
+    def from_existing(cls, raw: dict[str, Any]) -> "IndexSpec":
+        name = raw.get("name", "")
+        if "/collectionGroups/" in name:
+            collection_group = name.split("/collectionGroups/", 1)[1].split("/indexes/", 1)[0]
+        else:
+            collection_group = raw.get("collectionGroup", "")
+        return cls(
+            collection_group=collection_group,
+            query_scope=raw.get("queryScope", "COLLECTION"),
+            fields=cls._norm_fields(raw.get("fields", [])),
+            density=raw.get("density", "SPARSE_ALL"),
+        )
+
+    @property
+    def group_key(self) -> tuple[str, str]:
+        return self.collection_group, self.query_scope
+
+    @property
+    def sort_key(self) -> tuple[Any, ...]:
+        field_paths = tuple(dict(pairs)["fieldPath"] for pairs in self.fields)
+        return (self.collection_group, self.query_scope, field_paths, repr(self.fields), self.density)
+
+    def describe_fields(self) -> str:
+        parts = []
+        for pairs in self.fields:
+            field_map = dict(pairs)
+            mode = field_map.get("order") or field_map.get("arrayConfig") or (
+                "VECTOR" if "vectorConfig" in field_map else ""
+            )
+            parts.append(f"{field_map['fieldPath']} {mode}".rstrip())
+        return ", ".join(parts)
+
+    def to_create_body(self) -> dict[str, Any]:
+        fields: list[dict[str, Any]] = [dict(pairs) for pairs in self.fields]
+        body: dict[str, Any] = {
+            "queryScope": self.query_scope,
+            "fields": fields,
+        }
+        if self.density:
+            body["density"] = self.density
+        return body
+
+
+class IndexSet:
+    """Insertion-ordered set of ``IndexSpec`` with per-collection-group lookup.
+
+    Set operations keep the order of the left operand. ``subsumed_by`` and
+    ``prefix_pairs`` find indexes whose fields (ignoring a trailing
+    ``__name__``) are a strict prefix of another index in the same
+    collection group and query scope; a per-group prefix map is built once,
+    on first use, so those queries cost a dict lookup rather than a scan.
+    """
+
+    __slots__ = ("_specs", "_by_group", "_by_prefix")
+
+    def __init__(self, specs: Iterable[IndexSpec] = ()) -> None:
+        self._specs: dict[IndexSpec, None] = dict.fromkeys(specs)
+        self._by_group: dict[str, list[IndexSpec]] | None = None
+        self._by_prefix: dict[tuple[Any, ...], list[IndexSpec]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __iter__(self) -> Iterator[IndexSpec]:
+        return iter(self._specs)
+
+    def __contains__(self, spec: object) -> bool:
+        return spec in self._specs
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IndexSet):
+            return NotImplemented
+        return self._specs.keys() == other._specs.keys()
+
+    def __repr__(self) -> str:
+        return f"IndexSet({list(self._specs)!r})"
+
+    def add(self, spec: IndexSpec) -> bool:
+        """Add ``spec``; return False if an equal spec was already present."""
+        if spec in self._specs:
+            return False
+        self._specs[spec] = None
+        self._by_group = self._by_prefix = None
+        return True
+
+    def union(self, *others: Iterable[IndexSpec]) -> "IndexSet":
+        merged = IndexSet(self)
+        for other in others:
+            merged._specs.update(dict.fromkeys(other))
+        return merged
+
+    def difference(self, other: Iterable[IndexSpec]) -> "IndexSet":
+        excluded = other if isinstance(other, IndexSet) else IndexSet(other)
+        return IndexSet(spec for spec in self._specs if spec not in excluded)
+
+    def intersection(self, other: Iterable[IndexSpec]) -> "IndexSet":
+        included = other if isinstance(other, IndexSet) else IndexSet(other)
+        return IndexSet(spec for spec in self._specs if spec in included)
+
+    __or__ = union
+    __sub__ = difference
+    __and__ = intersection
+
+    def groups(self) -> list[str]:
+        return list(self._group_map())
+
+    def by_group(self, collection_group: str, query_scope: str | None = None) -> list[IndexSpec]:
+        specs = self._group_map().get(collection_group, [])
+        if query_scope is None:
+            return list(specs)
+        return [spec for spec in specs if spec.query_scope == query_scope]
+
+    def subsumed_by(self, spec: IndexSpec) -> list[IndexSpec]:
+        """Specs in this set that ``spec`` is a strict field prefix of."""
+        return list(self._prefix_map().get((spec.group_key, spec.prefix_key), []))
+
+    def prefix_pairs(self) -> Iterator[tuple[IndexSpec, IndexSpec]]:
+        """Yield ``(spec, longer)`` for every spec subsumed by a longer one in this set."""
+        prefixes = self._prefix_map()
+        for spec in self._specs:
+            for longer in prefixes.get((spec.group_key, spec.prefix_key), ()):
+                yield spec, longer
+
+    def _group_map(self) -> dict[str, list[IndexSpec]]:
+        if self._by_group is None:
+            by_group: dict[str, list[IndexSpec]] = {}
+            for spec in self._specs:
+                by_group.setdefault(spec.collection_group, []).append(spec)
+            self._by_group = by_group
+        return self._by_group
+
+    def _prefix_map(self) -> dict[tuple[Any, ...], list[IndexSpec]]:
+        if self._by_prefix is None:
+            by_prefix: dict[tuple[Any, ...], list[IndexSpec]] = {}
+            for spec in self._specs:
+                fields = spec.prefix_key
+                # An empty prefix subsumes nothing, so lengths start at one.
+                for length in range(1, len(fields)):
+                    by_prefix.setdefault((spec.group_key, fields[:length]), []).append(spec)
+            self._by_prefix = by_prefix
+        return self._by_prefix
@@ -4,14 +4,34 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import json
 import re
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+try:
+    from .index_spec import IndexSet, IndexSpec
+except ImportError:  # run as a script from tools/
+    from index_spec import IndexSet, IndexSpec
 
 MANIFEST_FILE = "ownership.yaml"
 RULES_PART_FILE = "firestore.rules.part"
 STORAGE_PART_FILE = "storage.rules.part"
+INDEXES_PART_FILE = "firestore.indexes.part.json"
+INDEXES_OUTPUT_FILE = "firestore.indexes.json"
+DIGEST_MANIFEST_FILE = ".compose_digests.json"
+INDEXES_DIGEST_MANIFEST_FILE = ".compose_indexes_digests.json"
+RULES_INPUT_FILES = (MANIFEST_FILE, RULES_PART_FILE, STORAGE_PART_FILE)
+INDEXES_INPUT_FILES = (MANIFEST_FILE, INDEXES_PART_FILE)
+
+# Bump whenever composition changes for identical inputs, so recorded digests go stale.
+TOOL_VERSION = "1"
+# The recorded version also hashes these sources, so a forgotten bump cannot keep stale digests valid.
+TOOL_SOURCES = ("manage_infra.py", "index_spec.py")
 
 LIST_KEYS = ("rules_paths", "index_collection_groups", "storage_paths")
 PREFERRED_ORDER = ("swimify", "swim_analyzer", "aquis")
@@ -260,35 +280,460 @@ def check_or_write(path: Path, content: str, check: bool) -> list[str]:
             errors.append(f"Generated file out of date: {path}")
         return errors
 
+    if current == content:
+        return errors
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(content, encoding="utf-8")
     return errors
 
 
-def compose(root_dir: Path, check: bool = False) -> list[str]:
+def sha256_file(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def input_digests(
+    root_dir: Path, app_names: list[str], filenames: tuple[str, ...] = RULES_INPUT_FILES
+) -> dict[str, str | None]:
+    """Hash every file composition reads, keyed by path relative to ``root_dir``."""
+    digests: dict[str, str | None] = {}
+    for app in app_names:
+        for filename in filenames:
+            path = root_dir / "apps" / app / filename
+            digests[path.relative_to(root_dir).as_posix()] = sha256_file(path)
+    return digests
+
+
+def load_digest_manifest(path: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+@functools.lru_cache(maxsize=1)
+def tool_fingerprint() -> str:
+    """``TOOL_VERSION`` plus a hash of the composition code, as recorded in digest manifests."""
+    digest = hashlib.sha256()
+    tools_dir = Path(__file__).resolve().parent
+    for name in TOOL_SOURCES:
+        digest.update(name.encode("utf-8") + b"\0" + (tools_dir / name).read_bytes())
+    return f"{TOOL_VERSION}+{digest.hexdigest()[:16]}"
+
+
+def digests_up_to_date(
+    recorded: dict[str, Any] | None,
+    app_names: list[str],
+    inputs: dict[str, str | None],
+    generated_dir: Path,
+    output_names: list[str],
+) -> bool:
+    """Whether ``recorded`` vouches for the current inputs and on-disk outputs."""
+    if recorded is None:
+        return False
+    if recorded.get("tool_version") != tool_fingerprint():
+        return False
+    if recorded.get("apps") != app_names or recorded.get("inputs") != inputs:
+        return False
+    outputs = recorded.get("outputs")
+    if not isinstance(outputs, dict) or sorted(outputs) != sorted(output_names):
+        return False
+    return all(sha256_file(generated_dir / name) == outputs[name] for name in output_names)
+
+
+def build_digest_manifest(
+    app_names: list[str], inputs: dict[str, str | None], outputs: dict[str, str]
+) -> str:
+    payload = {
+        "tool_version": tool_fingerprint(),
+        "apps": app_names,
+        "inputs": inputs,
+        "outputs": {
+            name: hashlib.sha256(content.encode("utf-8")).hexdigest() for name, content in outputs.items()
+        },
+    }
+    return json.dumps(payload, indent=2, sort_keys=True) + "\n"
+
+
+ComposeOutputs = Callable[[Path, list[str]], tuple[dict[str, str], list[str]]]
+
+
+def compose_with_digests(
+    root_dir: Path,
+    *,
+    check: bool,
+    manifest_name: str,
+    input_files: tuple[str, ...],
+    output_names: list[str],
+    build: ComposeOutputs,
+) -> list[str]:
+    """Build and check/write ``output_names``, skipping all work when the digest manifest is current.
+
+    ``--check`` is answered from the recorded digests when they match; a
+    missing or stale manifest falls back to composing and comparing outputs,
+    and is itself reported as out of date so it cannot silently stop
+    vouching for the outputs. Outputs are not written when ``build`` reports
+    errors.
+    """
     apps_dir = root_dir / "apps"
     generated_dir = root_dir / "generated"
 
     app_names = ordered_apps(discover_apps(apps_dir))
+    inputs = input_digests(root_dir, app_names, input_files)
+    manifest_path = generated_dir / manifest_name
+    if digests_up_to_date(load_digest_manifest(manifest_path), app_names, inputs, generated_dir, output_names):
+        return []
 
-    firestore_rules = compose_firestore_rules(root_dir, app_names)
-    storage_rules = compose_storage_rules(root_dir, app_names)
+    outputs, errors = build(root_dir, app_names)
+    if errors:
+        return errors
 
-    errors: list[str] = []
-    errors.extend(check_or_write(generated_dir / "firestore.rules", firestore_rules, check=check))
-    errors.extend(check_or_write(generated_dir / "storage.rules", storage_rules, check=check))
+    for name, content in outputs.items():
+        errors.extend(check_or_write(generated_dir / name, content, check=check))
+    errors.extend(check_or_write(manifest_path, build_digest_manifest(app_names, inputs, outputs), check=check))
 
     return errors
 
 
-def run(validate_only: bool, compose_only: bool, root_dir: Path, check: bool) -> int:
+def _compose_rules_outputs(root_dir: Path, app_names: list[str]) -> tuple[dict[str, str], list[str]]:
+    outputs = {
+        "firestore.rules": compose_firestore_rules(root_dir, app_names),
+        "storage.rules": compose_storage_rules(root_dir, app_names),
+    }
+    return outputs, []
+
+
+def compose(root_dir: Path, check: bool = False) -> list[str]:
+    return compose_with_digests(
+        root_dir,
+        check=check,
+        manifest_name=DIGEST_MANIFEST_FILE,
+        input_files=RULES_INPUT_FILES,
+        output_names=["firestore.rules", "storage.rules"],
+        build=_compose_rules_outputs,
+    )
+
+
+def index_sort_key(spec: IndexSpec) -> tuple[Any, ...]:
+    return spec.sort_key
+
+
+def compose_firestore_indexes(root_dir: Path, app_names: list[str]) -> tuple[str, list[str]]:
+    """Merge per-app index parts into one deploy-ready ``firestore.indexes.json``.
+
+    Specs are deduplicated after ``IndexSpec`` normalization (the first app in
+    compose order supplies the raw entry) and sorted by collection group and
+    field paths. Every app needs an index part (``{"indexes": []}`` when it
+    has none). An app may only define indexes on collection groups listed in
+    its ``index_collection_groups``. Field overrides are merged by
+    ``(collectionGroup, fieldPath)``; differing definitions are an error.
+    """
+    apps_dir = root_dir / "apps"
+    # Manifest problems themselves are reported by validate.
+    manifests, _ = load_manifests(apps_dir, app_names)
+    owners: dict[str, str] = {}
+    for app, manifest in manifests.items():
+        for group in manifest.get("index_collection_groups", []):
+            owners.setdefault(group, app)
+
+    errors: list[str] = []
+    specs: dict[IndexSpec, dict[str, Any]] = {}
+    overrides: dict[tuple[str, str], dict[str, Any]] = {}
+    override_sources: dict[tuple[str, str], str] = {}
+
+    for app in app_names:
+        part_path = apps_dir / app / INDEXES_PART_FILE
+        if not part_path.exists():
+            # Skipping it would silently drop the app's indexes from the deployed file.
+            errors.append(f"Missing index part: {part_path}")
+            continue
+        try:
+            payload = json.loads(part_path.read_text(encoding="utf-8"))
+            raw_indexes = payload.get("indexes", [])
+            raw_overrides = payload.get("fieldOverrides", [])
+            index_specs = [(IndexSpec.from_desired(raw), raw) for raw in raw_indexes]
+        except (ValueError, KeyError, AttributeError, TypeError) as exc:
+            errors.append(f"{part_path}: invalid index part: {exc}")
+            continue
+
+        for spec, raw in index_specs:
+            owner = owners.get(spec.collection_group)
+            if owner != app:
+                reason = f"owned by {owner}" if owner else "not declared in any index_collection_groups"
+                errors.append(
+                    f"{part_path}: index on collection group '{spec.collection_group}' is {reason}"
+                )
+                continue
+            specs.setdefault(spec, raw)
+
+        for raw in raw_overrides:
+            key = (str(raw.get("collectionGroup", "")), str(raw.get("fieldPath", "")))
+            current = overrides.get(key)
+            if current is None:
+                overrides[key] = raw
+                override_sources[key] = app
+            elif json.dumps(current, sort_keys=True) != json.dumps(raw, sort_keys=True):
+                errors.append(
+                    f"{part_path}: field override {key[0]}.{key[1]} conflicts with {override_sources[key]}"
+                )
+
+    merged = {
+        "indexes": [specs[spec] for spec in sorted(specs, key=index_sort_key)],
+        "fieldOverrides": [overrides[key] for key in sorted(overrides)],
+    }
+    return json.dumps(merged, indent=2) + "\n", errors
+
+
+def _compose_indexes_outputs(root_dir: Path, app_names: list[str]) -> tuple[dict[str, str], list[str]]:
+    content, errors = compose_firestore_indexes(root_dir, app_names)
+    return {INDEXES_OUTPUT_FILE: content}, errors
+
+
+def compose_indexes(root_dir: Path, check: bool = False) -> list[str]:
+    return compose_with_digests(
+        root_dir,
+        check=check,
+        manifest_name=INDEXES_DIGEST_MANIFEST_FILE,
+        input_files=INDEXES_INPUT_FILES,
+        output_names=[INDEXES_OUTPUT_FILE],
+        build=_compose_indexes_outputs,
+    )
+
+
+INDEX_BASELINE_FILE = "index_analysis_baseline.json"
+# Assumed average array length: an array-contains index writes one entry per element.
+ARRAY_CONTAINS_FANOUT = 4
+
+
+@dataclass(frozen=True)
+class IndexFinding:
+    """One redundancy found by ``analyze_indexes``.
+
+    ``kind`` is ``duplicate`` (same normalized spec listed twice in one
+    file), ``prefix`` (fields are a strict prefix of ``other``, ignoring a
+    trailing ``__name__``) or ``cross_app`` (same normalized spec defined in
+    the index parts of more than one app, listed in ``sources``).
+
+    ``entries_per_write`` is the number of index entries the reported index
+    adds to every document write; ``group_entries_per_write`` is the total
+    across the ``group_index_count`` composite indexes on the collection
+    group.
+    """
+
+    kind: str
+    collection_group: str
+    query_scope: str
+    index: str
+    other: str
+    sources: tuple[str, ...]
+    group_index_count: int
+    entries_per_write: int
+    group_entries_per_write: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}|{self.collection_group}|{self.query_scope}|{self.index}|{self.other}"
+
+    @property
+    def write_cost(self) -> int:
+        return self.entries_per_write
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "collectionGroup": self.collection_group,
+            "queryScope": self.query_scope,
+            "index": self.index,
+            "other": self.other,
+            "sources": list(self.sources),
+            "groupIndexCount": self.group_index_count,
+            "writeCost": self.write_cost,
+            "groupWriteCost": self.group_entries_per_write,
+            "key": self.key,
+        }
+
+
+def describe_index_fields(spec: IndexSpec) -> str:
+    return spec.describe_fields()
+
+
+def index_entries_per_write(spec: IndexSpec) -> int:
+    """Index entries one document write adds to ``spec`` (array-contains fans out per element)."""
+    array_fields = sum(1 for pairs in spec.fields if "arrayConfig" in dict(pairs))
+    return ARRAY_CONTAINS_FANOUT ** array_fields
+
+
+def _load_index_specs(path: Path) -> list[IndexSpec]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return [IndexSpec.from_desired(raw) for raw in payload.get("indexes", [])]
+
+
+def analyze_indexes(root_dir: Path) -> tuple[list[IndexFinding], list[str]]:
+    """Find duplicate, prefix-subsumed and cross-app indexes in the parts and generated output."""
+    apps_dir = root_dir / "apps"
+    errors: list[str] = []
+    specs_by_source: dict[str, list[IndexSpec]] = {}
+    app_by_source: dict[str, str] = {}
+
+    for app in ordered_apps(discover_apps(apps_dir)):
+        part_path = apps_dir / app / INDEXES_PART_FILE
+        if part_path.exists():
+            source = part_path.relative_to(root_dir).as_posix()
+            app_by_source[source] = app
+            try:
+                specs_by_source[source] = _load_index_specs(part_path)
+            except (ValueError, KeyError, AttributeError, TypeError) as exc:
+                errors.append(f"{part_path}: invalid index part: {exc}")
+    generated_path = root_dir / "generated" / INDEXES_OUTPUT_FILE
+    if generated_path.exists():
+        try:
+            specs_by_source[generated_path.relative_to(root_dir).as_posix()] = _load_index_specs(generated_path)
+        except (ValueError, KeyError, AttributeError, TypeError) as exc:
+            errors.append(f"{generated_path}: invalid index file: {exc}")
+
+    merged: dict[IndexSpec, list[str]] = {}
+    for source, specs in specs_by_source.items():
+        for spec in specs:
+            merged.setdefault(spec, [])
+            if source not in merged[spec]:
+                merged[spec].append(source)
+    group_counts: dict[tuple[str, str], int] = {}
+    group_entries: dict[tuple[str, str], int] = {}
+    for spec in merged:
+        group_counts[spec.group_key] = group_counts.get(spec.group_key, 0) + 1
+        group_entries[spec.group_key] = group_entries.get(spec.group_key, 0) + index_entries_per_write(spec)
+
+    def finding(kind: str, spec: IndexSpec, other: str, sources: list[str]) -> IndexFinding:
+        return IndexFinding(
+            kind=kind,
+            collection_group=spec.collection_group,
+            query_scope=spec.query_scope,
+            index=describe_index_fields(spec),
+            other=other,
+            sources=tuple(sources),
+            group_index_count=group_counts.get(spec.group_key, 0),
+            entries_per_write=index_entries_per_write(spec),
+            group_entries_per_write=group_entries.get(spec.group_key, 0),
+        )
+
+    findings: list[IndexFinding] = []
+    for source, specs in specs_by_source.items():
+        seen: set[IndexSpec] = set()
+        for spec in specs:
+            if spec in seen:
+                findings.append(finding("duplicate", spec, "", [source]))
+            seen.add(spec)
+
+    merged_set = IndexSet(sorted(merged, key=index_sort_key))
+    for spec, longer in merged_set.prefix_pairs():
+        findings.append(finding("prefix", spec, describe_index_fields(longer), merged[spec]))
+
+    # The generated file repeats every part, so only app parts are compared.
+    part_sources: dict[IndexSpec, list[str]] = {}
+    for source, specs in specs_by_source.items():
+        if source not in app_by_source:
+            continue
+        for spec in specs:
+            sources = part_sources.setdefault(spec, [])
+            if source not in sources:
+                sources.append(source)
+    for spec, sources in part_sources.items():
+        if len(sources) > 1:
+            findings.append(finding("cross_app", spec, "", sources))
+
+    return sorted(findings, key=lambda item: item.key), errors
+
+
+def load_index_baseline(path: Path) -> set[str]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return set()
+    return set(payload.get("findings", []))
+
+
+def write_index_baseline(path: Path, findings: list[IndexFinding]) -> None:
+    payload = {"findings": sorted({item.key for item in findings})}
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def format_index_findings(findings: list[IndexFinding], new_keys: set[str]) -> str:
+    if not findings:
+        return "No redundant indexes found."
+    lines: list[str] = []
+    for item in findings:
+        marker = "NEW " if item.key in new_keys else ""
+        if item.kind == "cross_app":
+            lines.append(
+                f"{marker}cross_app {item.collection_group} [{item.query_scope}] ({item.index}) "
+                f"defined in {', '.join(item.sources)}"
+            )
+        elif item.kind == "prefix":
+            lines.append(
+                f"{marker}prefix {item.collection_group} [{item.query_scope}] ({item.index}) "
+                f"is a prefix of ({item.other}) in {', '.join(item.sources)}"
+            )
+        else:
+            lines.append(
+                f"{marker}duplicate {item.collection_group} [{item.query_scope}] ({item.index}) "
+                f"in {', '.join(item.sources)}"
+            )
+        lines.append(
+            f"    write cost: ~{item.write_cost} index entries per write to '{item.collection_group}' "
+            f"(~{item.group_entries_per_write} across {item.group_index_count} composite indexes on the group)"
+        )
+    return "\n".join(lines)
+
+
+def run_analyze_indexes(root_dir: Path, output_format: str, baseline_path: Path, update_baseline: bool) -> int:
+    """Report index redundancy; exit 1 on findings missing from the baseline."""
+    findings, errors = analyze_indexes(root_dir)
+    if errors:
+        for error in errors:
+            print(f"ERROR: {error}")
+        return 1
+
+    if update_baseline:
+        write_index_baseline(baseline_path, findings)
+        print(f"Wrote {len(findings)} findings to {baseline_path}")
+        return 0
+
+    baseline = load_index_baseline(baseline_path)
+    new_keys = {item.key for item in findings} - baseline
+    if output_format == "json":
+        report = {
+            "findings": [item.to_dict() for item in findings],
+            "new": sorted(new_keys),
+            "resolved": sorted(baseline - {item.key for item in findings}),
+        }
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_index_findings(findings, new_keys))
+        if new_keys:
+            print(f"{len(new_keys)} new finding(s) not in {baseline_path.name}")
+    return 1 if new_keys else 0
+
+
+def run(
+    validate_only: bool,
+    compose_only: bool,
+    root_dir: Path,
+    check: bool,
+    indexes_only: bool = False,
+) -> int:
     errors: list[str] = []
 
     if not compose_only:
         errors.extend(validate(root_dir))
 
     if not validate_only:
-        errors.extend(compose(root_dir, check=check))
+        if not indexes_only:
+            errors.extend(compose(root_dir, check=check))
+        if indexes_only or not compose_only:
+            errors.extend(compose_indexes(root_dir, check=check))
 
     if errors:
         for error in errors:
@@ -320,6 +765,31 @@ def parse_args() -> argparse.Namespace:
     )
     compose_parser.set_defaults(validate_only=False, compose_only=True)
 
+    indexes_parser = subparsers.add_parser(
+        "compose-indexes", help="Merge per-app index parts into generated/firestore.indexes.json"
+    )
+    indexes_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Fail if generated files differ from on-disk content",
+    )
+    indexes_parser.set_defaults(validate_only=False, compose_only=True, indexes_only=True)
+
+    analyze_parser = subparsers.add_parser(
+        "analyze-indexes", help="Report duplicate, prefix-subsumed and cross-app composite indexes"
+    )
+    analyze_parser.add_argument("--format", choices=["text", "json"], default="text")
+    analyze_parser.add_argument(
+        "--baseline",
+        default=None,
+        help=f"Accepted findings file (default: <root>/{INDEX_BASELINE_FILE})",
+    )
+    analyze_parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Accept all current findings into the baseline",
+    )
+
     all_parser = subparsers.add_parser("all", help="Validate and compose artifacts")
     all_parser.add_argument(
         "--check",
@@ -334,11 +804,15 @@ def parse_args() -> argparse.Namespace:
 def main() -> int:
     args = parse_args()
     root_dir = Path(args.root).resolve()
+    if args.command == "analyze-indexes":
+        baseline = Path(args.baseline) if args.baseline else root_dir / INDEX_BASELINE_FILE
+        return run_analyze_indexes(root_dir, args.format, baseline, args.update_baseline)
     return run(
         validate_only=getattr(args, "validate_only", False),
         compose_only=getattr(args, "compose_only", False),
         root_dir=root_dir,
         check=getattr(args, "check", False),
+        indexes_only=getattr(args, "indexes_only", False),
     )
 
 
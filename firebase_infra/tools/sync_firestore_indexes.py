@@ -8,13 +8,44 @@ fails early on an existing-index 409.
 from __future__ import annotations
 
 import argparse
+import codecs
+import email.utils
+import http.client
 import json
+import os
+import random
+import statistics
 import subprocess
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
-from urllib import error, parse, request
+from typing import Any, Callable, Iterable
+from urllib import parse
+
+try:
+    from .index_spec import IndexSet, IndexSpec  # IndexSpec is re-exported for existing importers.
+except ImportError:  # run as a script from tools/
+    from index_spec import IndexSet, IndexSpec
+
+API_BASE = "https://firestore.googleapis.com/v1"
+DEFAULT_CONCURRENCY = 8
+RETRY_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "DELETE"})
+MAX_RETRIES = 5
+BACKOFF_BASE_S = 1.0
+BACKOFF_MAX_S = 32.0
+RETRY_AFTER_MAX_S = 120.0
+REQUEST_TIMEOUT_S = 60.0
+DEFAULT_WAIT_TIMEOUT_S = 1800.0
+POLL_INITIAL_S = 2.0
+POLL_MAX_S = 30.0
+POLL_GROWTH = 1.5
+READY_STATE = "READY"
+FAILED_STATES = frozenset({"NEEDS_REPAIR"})
 
 
 def _run(cmd: list[str]) -> str:
@@ -28,85 +59,231 @@ def _get_access_token() -> str:
     return token
 
 
-def _api_call(
-    *,
-    method: str,
-    url: str,
-    token: str,
-    quota_project: str,
-    body: dict[str, Any] | None = None,
-) -> tuple[int, dict[str, Any] | None]:
-    payload = None if body is None else json.dumps(body).encode("utf-8")
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "x-goog-user-project": quota_project,
-    }
-    if payload is not None:
-        headers["Content-Type"] = "application/json"
-    req = request.Request(url=url, data=payload, headers=headers, method=method)
+def _retry_after_s(value: str | None) -> float | None:
+    if not value:
+        return None
     try:
-        with request.urlopen(req) as resp:
-            data = resp.read().decode("utf-8")
-            return resp.status, (json.loads(data) if data else None)
-    except error.HTTPError as exc:
-        data = exc.read().decode("utf-8")
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class ApiClient:
+    """Firestore Admin REST client over a pool of keep-alive connections.
+
+    Idle HTTP(S) connections to the API host are reused across requests and
+    worker threads, so the pool never opens more connections than there were
+    requests in flight and calls skip repeated TCP/TLS handshakes. Responses
+    with a status in ``RETRY_STATUSES`` are retried with exponential backoff
+    (full jitter), honouring ``Retry-After`` up to ``retry_after_max_s``.
+
+    A connection dropped before the response arrives is retried once for
+    ``IDEMPOTENT_METHODS``; other requests (index creation) are only retried
+    when the drop happened while sending, since the server may already have
+    acted on them. Such a failure is reported, and rerunning the sync is safe
+    because a create that did go through comes back as 409.
+    """
+
+    def __init__(
+        self,
+        *,
+        token: str,
+        quota_project: str,
+        api_base: str = API_BASE,
+        max_retries: int = MAX_RETRIES,
+        backoff_base_s: float = BACKOFF_BASE_S,
+        backoff_max_s: float = BACKOFF_MAX_S,
+        retry_after_max_s: float = RETRY_AFTER_MAX_S,
+        timeout_s: float = REQUEST_TIMEOUT_S,
+        sleep: Callable[[float], None] = time.sleep,
+        stats: RequestStats | None = None,
+    ) -> None:
+        parsed = parse.urlsplit(api_base)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            raise ValueError(f"Unsupported API base URL: {api_base}")
+        self._scheme = parsed.scheme
+        self._netloc = parsed.netloc
+        self._base_path = parsed.path.rstrip("/")
+        self._headers = {"Authorization": f"Bearer {token}", "x-goog-user-project": quota_project}
+        self._max_retries = max_retries
+        self._backoff_base_s = backoff_base_s
+        self._backoff_max_s = backoff_max_s
+        self._retry_after_max_s = retry_after_max_s
+        self._timeout_s = timeout_s
+        self._sleep = sleep
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._idle: list[http.client.HTTPConnection] = []
+        self._opened = 0
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def connections_opened(self) -> int:
+        return self._opened
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+        factory = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        return factory(self._netloc, timeout=self._timeout_s)
+
+    def _checkin(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(connection)
+
+    def _send(
+        self,
+        method: str,
+        target: str,
+        payload: bytes | None,
+        decode: Callable[[Callable[[int], bytes]], Any] | None,
+    ) -> tuple[int, dict[str, str], Any, int]:
+        headers = dict(self._headers)
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+        # An idle pooled connection may have been closed by the server;
+        # retry once on a fresh one unless a non-idempotent request got out.
+        for attempt in (0, 1):
+            connection = self._checkout()
+            received = 0
+            sent = False
+            try:
+                connection.request(method, target, body=payload, headers=headers)
+                sent = True
+                response = connection.getresponse()
+                if decode is not None and response.status == 200:
+
+                    def read(size: int) -> bytes:
+                        nonlocal received
+                        chunk = response.read(size)
+                        received += len(chunk)
+                        return chunk
+
+                    data = decode(read)
+                    # Drain anything the decoder left so the connection can be reused.
+                    received += len(response.read())
+                else:
+                    data = response.read()
+                    received = len(data)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if attempt or (sent and method not in IDEMPOTENT_METHODS):
+                    raise
+                continue
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(connection)
+            return response.status, {key.lower(): value for key, value in response.getheaders()}, data, received
+        raise AssertionError("unreachable")
+
+    def target(self, path: str) -> str:
+        """Request target for ``path`` relative to the API base (e.g. an index ``name``)."""
+        return f"{self._base_path}/{path.lstrip('/')}"
+
+    def call(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        *,
+        kind: str | None = None,
+        decode: Callable[[Callable[[int], bytes]], Any] | None = None,
+    ) -> tuple[int, Any]:
+        """Send one request, retrying rate-limited responses.
+
+        A 200 response body is handed to ``decode`` as a ``read(size)``
+        function when given, so large pages can be decoded while they
+        arrive; every other body is parsed as JSON. Each attempt is recorded
+        in ``stats`` under ``kind`` (default: the HTTP method).
+        """
+        payload = None if body is None else json.dumps(body).encode("utf-8")
+        target = self.target(path)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            status, headers, data, received = self._send(method, target, payload, decode)
+            if self.stats is not None:
+                self.stats.record(kind or method, status, received, time.perf_counter() - started)
+            if status not in RETRY_STATUSES or attempt >= self._max_retries:
+                break
+            delay = _retry_after_s(headers.get("retry-after"))
+            if delay is None:
+                delay = random.uniform(0, min(self._backoff_max_s, self._backoff_base_s * 2**attempt))
+            else:
+                delay = min(delay, self._retry_after_max_s)
+            self._sleep(delay)
+            attempt += 1
+
+        if decode is not None and status == 200:
+            return status, data
+        text = data.decode("utf-8")
         try:
-            parsed = json.loads(data) if data else None
+            parsed = json.loads(text) if text else None
         except json.JSONDecodeError:
-            parsed = {"raw": data}
-        return exc.code, parsed
-
-
-@dataclass(frozen=True)
-class IndexSpec:
-    collection_group: str
-    query_scope: str
-    fields: tuple[tuple[tuple[str, Any], ...], ...]
-    density: str
-
-    @staticmethod
-    def _norm_fields(fields: list[dict[str, Any]]) -> tuple[tuple[tuple[str, Any], ...], ...]:
-        normalized: list[tuple[tuple[str, Any], ...]] = []
-        for field in fields:
-            item: dict[str, Any] = {"fieldPath": field["fieldPath"]}
-            for key in ("order", "arrayConfig", "vectorConfig"):
-                if key in field:
-                    item[key] = field[key]
-            normalized.append(tuple(sorted(item.items(), key=lambda kv: kv[0])))
-        return tuple(normalized)
-
-    @classmethod
-    def from_desired(cls, raw: dict[str, Any]) -> "IndexSpec":
-        return cls(
-            collection_group=raw["collectionGroup"],
-            query_scope=raw.get("queryScope", "COLLECTION"),
-            fields=cls._norm_fields(raw.get("fields", [])),
-            density=raw.get("density", "SPARSE_ALL"),
-        )
-
-    @classmethod
-    def from_existing(cls, raw: dict[str, Any]) -> "IndexSpec":
-        name = raw.get("name", "")
-        if "/collectionGroups/" in name:
-            collection_group = name.split("/collectionGroups/", 1)[1].split("/indexes/", 1)[0]
-        else:
-            collection_group = raw.get("collectionGroup", "")
-        return cls(
-            collection_group=collection_group,
-            query_scope=raw.get("queryScope", "COLLECTION"),
-            fields=cls._norm_fields(raw.get("fields", [])),
-            density=raw.get("density", "SPARSE_ALL"),
-        )
-
-    def to_create_body(self) -> dict[str, Any]:
-        fields: list[dict[str, Any]] = [dict(pairs) for pairs in self.fields]
-        body: dict[str, Any] = {
-            "queryScope": self.query_scope,
-            "fields": fields,
-        }
-        if self.density:
-            body["density"] = self.density
-        return body
+            parsed = {"raw": text}
+        return status, parsed
+
+
+@dataclass
+class RequestStats:
+    """Per-kind request counts, response bytes and latencies of an ``ApiClient``."""
+
+    calls: dict[str, list[tuple[int, int, float]]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, kind: str, status: int, received: int, latency_s: float) -> None:
+        with self._lock:
+            self.calls.setdefault(kind, []).append((status, received, latency_s))
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            calls = {kind: list(entries) for kind, entries in self.calls.items()}
+        summary: dict[str, dict[str, Any]] = {}
+        for kind, entries in sorted(calls.items()):
+            latencies = [latency for _, _, latency in entries]
+            summary[kind] = {
+                "requests": len(entries),
+                "retried": sum(1 for status, _, _ in entries if status in RETRY_STATUSES),
+                "bytes": sum(received for _, received, _ in entries),
+                "latency_total_s": round(sum(latencies), 6),
+                "latency_p50_s": round(statistics.median(latencies), 6),
+                "latency_max_s": round(max(latencies), 6),
+            }
+        return summary
+
+    def format_text(self) -> str:
+        lines = ["Request stats:"]
+        for kind, row in self.to_dict().items():
+            lines.append(
+                f"  {kind}: {row['requests']} request(s), {row['retried']} rate-limited, {row['bytes']} bytes, "
+                f"latency total {row['latency_total_s'] * 1000:.1f}ms p50 {row['latency_p50_s'] * 1000:.1f}ms "
+                f"max {row['latency_max_s'] * 1000:.1f}ms"
+            )
+        return "\n".join(lines)
 
 
 def _load_desired(path: Path) -> dict[IndexSpec, dict[str, Any]]:
@@ -118,104 +295,586 @@ def _load_desired(path: Path) -> dict[IndexSpec, dict[str, Any]]:
     return desired
 
 
-def _list_existing(project_id: str, token: str) -> dict[IndexSpec, str]:
-    base_url = (
-        "https://firestore.googleapis.com/v1/"
-        f"projects/{project_id}/databases/(default)/collectionGroups/-/indexes"
-    )
-    url = base_url
-    existing: dict[IndexSpec, str] = {}
+def _database_path(project_id: str) -> str:
+    return f"projects/{project_id}/databases/(default)"
+
+
+def _run_concurrently(
+    fn: Callable[[Any], Any], items: list[Any], concurrency: int
+) -> tuple[list[tuple[Any, Any]], list[Exception]]:
+    """Apply ``fn`` to every item over a bounded pool; failures are collected, not raised."""
+    if not items:
+        return [], []
+
+    def attempt(item: Any) -> tuple[Any, Any, Exception | None]:
+        try:
+            return item, fn(item), None
+        except Exception as exc:  # noqa: BLE001 - reported after all items ran
+            return item, None, exc
+
+    workers = max(1, min(concurrency, len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="index-sync") as executor:
+        outcomes = list(executor.map(attempt, items))
+    results = [(item, value) for item, value, exc in outcomes if exc is None]
+    failures = [exc for _, _, exc in outcomes if exc is not None]
+    return results, failures
+
+
+_STREAM_CHUNK = 64 * 1024
+_JSON_WHITESPACE = " \t\r\n"
+_JSON_DECODER = json.JSONDecoder()
+
+
+class _ListPageDecoder:
+    """Decodes an ``indexes.list`` page while it arrives.
+
+    Each element of the top-level ``indexes`` array is handed to ``on_entry``
+    as soon as it is complete, so the raw page text never sits in memory as
+    a whole. Other top-level members (``nextPageToken``) are returned from
+    ``decode``.
+    """
+
+    def __init__(self, read: Callable[[int], bytes], on_entry: Callable[[dict[str, Any]], None]) -> None:
+        self._read = read
+        self._on_entry = on_entry
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._read(_STREAM_CHUNK)
+        self._eof = not chunk
+        if self._pos > _STREAM_CHUNK:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        self._buffer += self._utf8.decode(chunk, final=self._eof)
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("truncated index list response")
+
+    def _take(self, expected: str) -> str:
+        char = self._peek()
+        if char not in expected:
+            raise ValueError(f"unexpected {char!r} in index list response")
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end < len(self._buffer):
+                self._pos = end
+                return value
+            # A value ending exactly at the buffer edge (e.g. a number) may continue in the next chunk.
+            length = end - self._pos
+            if not self._fill():
+                self._pos += length
+                return value
+
+    def decode(self) -> dict[str, Any]:
+        members: dict[str, Any] = {}
+        self._take("{")
+        if self._peek() == "}":
+            return members
+        while True:
+            key = self._value()
+            self._take(":")
+            if key == "indexes" and self._peek() == "[":
+                self._take("[")
+                if self._peek() == "]":
+                    self._take("]")
+                else:
+                    while True:
+                        self._on_entry(self._value())
+                        if self._take(",]") == "]":
+                            break
+            else:
+                members[key] = self._value()
+            if self._take(",}") == "}":
+                return members
+
+
+def _list_group(
+    client: ApiClient, project_id: str, group: str, on_entry: Callable[[dict[str, Any]], None]
+) -> None:
+    """Page through one collection group's indexes (``-`` for all groups).
+
+    A page's entries reach ``on_entry`` only once the page decoded
+    completely, so a request retried mid-body never reports an entry twice.
+    """
+    base_path = f"{_database_path(project_id)}/collectionGroups/{parse.quote(group, safe='-')}/indexes"
+    path = base_path
+
+    def decode(read: Callable[[int], bytes]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        entries: list[dict[str, Any]] = []
+        return _ListPageDecoder(read, entries.append).decode(), entries
 
     while True:
-        status, payload = _api_call(
-            method="GET",
-            url=url,
-            token=token,
-            quota_project=project_id,
-        )
+        status, payload = client.call("GET", path, kind="list", decode=decode)
         if status != 200 or payload is None:
-            raise RuntimeError(f"Failed to list indexes (HTTP {status}): {payload}")
+            raise RuntimeError(f"Failed to list indexes for {group} (HTTP {status}): {payload}")
+        members, entries = payload
+        for raw in entries:
+            on_entry(raw)
 
-        for raw in payload.get("indexes", []):
-            spec = IndexSpec.from_existing(raw)
-            name = raw.get("name", "")
-            if spec.collection_group and name:
-                existing.setdefault(spec, name)
-
-        next_page = payload.get("nextPageToken", "")
+        next_page = members.get("nextPageToken", "")
         if not next_page:
             break
-        url = f"{base_url}?pageToken={parse.quote(next_page, safe='')}"
+        path = f"{base_path}?pageToken={parse.quote(next_page, safe='')}"
+
+
+def _list_index_entries(client: ApiClient, project_id: str) -> list[dict[str, Any]]:
+    entries: list[dict[str, Any]] = []
+    _list_group(client, project_id, "-", entries.append)
+    return entries
 
+
+def _existing_from_entries(
+    entries: Iterable[dict[str, Any]], states: dict[str, str] | None = None
+) -> dict[IndexSpec, str]:
+    """Map every existing index to its name; with ``states``, also record each name's build state."""
+    existing: dict[IndexSpec, str] = {}
+    for raw in entries:
+        _add_existing(existing, raw, states)
     return existing
 
 
-def sync_indexes(project_id: str, indexes_file: Path, allow_delete: bool) -> None:
-    token = _get_access_token()
-    desired = _load_desired(indexes_file)
-    existing = _list_existing(project_id, token)
+def _add_existing(existing: dict[IndexSpec, str], raw: dict[str, Any], states: dict[str, str] | None) -> None:
+    spec = IndexSpec.from_existing(raw)
+    name = raw.get("name", "")
+    if spec.collection_group and name:
+        existing.setdefault(spec, name)
+        if states is not None:
+            states[name] = raw.get("state", "")
 
-    missing_specs = [spec for spec in desired if spec not in existing]
-    extra_specs = [spec for spec in existing if spec not in desired]
 
-    print(
-        f"Index sync for {project_id}: desired={len(desired)} existing={len(existing)} "
-        f"missing={len(missing_specs)} extra={len(extra_specs)}"
+def _list_existing(
+    client: ApiClient,
+    project_id: str,
+    states: dict[str, str] | None = None,
+    *,
+    groups: Iterable[str] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[IndexSpec, str]:
+    """Existing indexes of ``groups`` (default: every group), listed concurrently one group per worker.
+
+    Entries are normalized page by page. Results are merged in ``groups``
+    order, so the outcome does not depend on completion order. Every group
+    is listed before failures are raised, together, as one ``RuntimeError``.
+    """
+    group_list = ["-"] if groups is None else list(dict.fromkeys(groups))
+
+    def list_one(group: str) -> tuple[dict[IndexSpec, str], dict[str, str]]:
+        existing: dict[IndexSpec, str] = {}
+        group_states: dict[str, str] = {}
+        _list_group(client, project_id, group, lambda raw: _add_existing(existing, raw, group_states))
+        return existing, group_states
+
+    listed, failures = _run_concurrently(list_one, group_list, concurrency)
+    if failures:
+        details = "\n".join(f"  - {exc}" for exc in failures)
+        raise RuntimeError(f"{len(failures)} collection group listing(s) failed:\n{details}")
+    merged: dict[IndexSpec, str] = {}
+    for _, (existing, group_states) in listed:
+        for spec, name in existing.items():
+            merged.setdefault(spec, name)
+        if states is not None:
+            states.update(group_states)
+    return merged
+
+
+def _load_snapshot(path: Path) -> list[dict[str, Any]]:
+    """Index entries of a snapshot file, or of ``gcloud firestore indexes composite list --format=json`` output."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    entries = payload if isinstance(payload, list) else payload.get("indexes", [])
+    if not all(isinstance(raw, dict) for raw in entries):
+        raise ValueError(f"{path}: expected a list of index objects")
+    return entries
+
+
+def write_snapshot(client: ApiClient, project_id: str, output: Path) -> int:
+    """Write the project's existing composite indexes to ``output``; return how many there were."""
+    entries = sorted(_list_index_entries(client, project_id), key=lambda raw: raw.get("name", ""))
+    payload = {"projectId": project_id, "indexes": entries}
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return len(entries)
+
+
+@dataclass
+class IndexPlan:
+    """Indexes to create and existing indexes (with their names) that the desired spec no longer has."""
+
+    create: list[IndexSpec]
+    extra: list[tuple[IndexSpec, str]]
+    unchanged: int
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.create or self.extra)
+
+
+def plan_indexes(desired: Iterable[IndexSpec], existing: dict[IndexSpec, str]) -> IndexPlan:
+    desired_set = IndexSet(desired)
+    existing_set = IndexSet(existing)
+    return IndexPlan(
+        create=list(desired_set - existing_set),
+        extra=[(spec, existing[spec]) for spec in existing_set - desired_set],
+        unchanged=len(desired_set & existing_set),
+    )
+
+
+def describe_spec(spec: IndexSpec) -> str:
+    return f"{spec.collection_group} [{spec.query_scope}] ({spec.describe_fields()})"
+
+
+def format_plan(plan: IndexPlan, allow_delete: bool) -> str:
+    lines = []
+    for spec in sorted(plan.create, key=lambda spec: spec.sort_key):
+        lines.append(f"+ create {describe_spec(spec)}")
+    for spec, name in sorted(plan.extra, key=lambda item: item[0].sort_key):
+        action = "- delete" if allow_delete else "  keep  "
+        lines.append(f"{action} {describe_spec(spec)}  {name}")
+    deletes = len(plan.extra) if allow_delete else 0
+    lines.append(
+        f"Plan: create={len(plan.create)} delete={deletes} unchanged={plan.unchanged} "
+        f"extra_kept={len(plan.extra) - deletes}"
     )
+    return "\n".join(lines)
+
+
+def plan_to_dict(plan: IndexPlan, allow_delete: bool) -> dict[str, Any]:
+    extra = [name for _, name in sorted(plan.extra, key=lambda item: item[0].sort_key)]
+    return {
+        "create": [
+            {"collectionGroup": spec.collection_group, **spec.to_create_body()}
+            for spec in sorted(plan.create, key=lambda spec: spec.sort_key)
+        ],
+        "delete": extra if allow_delete else [],
+        "extraKept": [] if allow_delete else extra,
+        "unchanged": plan.unchanged,
+    }
+
+
+def run_plan(indexes_file: Path, snapshot: Path, *, allow_delete: bool, fmt: str, exit_code: bool) -> int:
+    """Diff the desired spec against a snapshot without any API access."""
+    plan = plan_indexes(_load_desired(indexes_file), _existing_from_entries(_load_snapshot(snapshot)))
+    if fmt == "json":
+        print(json.dumps(plan_to_dict(plan, allow_delete), indent=2))
+    else:
+        print(format_plan(plan, allow_delete))
+    changed = bool(plan.create or (allow_delete and plan.extra))
+    return 2 if exit_code and changed else 0
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync run; ``operations`` holds the long-running operation of each created index."""
+
+    created: int = 0
+    already_exists: int = 0
+    deleted: int = 0
+    operations: list[dict[str, Any]] = field(default_factory=list)
+    builds: list[IndexBuild] = field(default_factory=list)
+
+
+def _create_index(client: ApiClient, project_id: str, spec: IndexSpec) -> dict[str, Any] | None:
+    """Create one index; return its operation, or ``None`` when it already exists."""
+    group = parse.quote(spec.collection_group, safe="")
+    path = f"{_database_path(project_id)}/collectionGroups/{group}/indexes"
+    status, payload = client.call("POST", path, spec.to_create_body())
+    if status in (200, 201):
+        return payload or {}
+    if status == 409:
+        return None
+    raise RuntimeError(f"Failed to create index for {spec.collection_group} (HTTP {status}): {payload}")
+
+
+def _delete_index(client: ApiClient, name: str) -> None:
+    status, payload = client.call("DELETE", name)
+    if status not in (200, 204, 404):
+        raise RuntimeError(f"Failed to delete index {name} (HTTP {status}): {payload}")
+
 
-    created = 0
-    already_exists = 0
-    for spec in missing_specs:
-        group = parse.quote(spec.collection_group, safe="")
-        url = (
-            "https://firestore.googleapis.com/v1/"
-            f"projects/{project_id}/databases/(default)/collectionGroups/{group}/indexes"
+@dataclass
+class IndexBuild:
+    """One index being waited on, tracked by its long-running operation or, failing that, its name."""
+
+    collection_group: str
+    index: str = ""
+    operation: str = ""
+    state: str = ""
+    error: str = ""
+
+    @property
+    def finished(self) -> bool:
+        return self.state == READY_STATE or bool(self.error)
+
+
+def _group_from_name(name: str) -> str:
+    return name.split("/collectionGroups/", 1)[1].split("/", 1)[0] if "/collectionGroups/" in name else ""
+
+
+def _build_from_operation(operation: dict[str, Any]) -> IndexBuild:
+    index = (operation.get("metadata") or {}).get("index", "")
+    return IndexBuild(collection_group=_group_from_name(index), index=index, operation=operation.get("name", ""))
+
+
+def _poll_build(client: ApiClient, build: IndexBuild) -> None:
+    if build.operation:
+        status, payload = client.call("GET", build.operation)
+        if status != 200 or payload is None:
+            raise RuntimeError(f"Failed to poll operation {build.operation} (HTTP {status}): {payload}")
+        build.index = build.index or (payload.get("metadata") or {}).get("index", "")
+        if not payload.get("done"):
+            build.state = (payload.get("metadata") or {}).get("state", "") or "CREATING"
+            return
+        if "error" in payload:
+            build.error = payload["error"].get("message") or json.dumps(payload["error"])
+            return
+        build.operation = ""
+        response = payload.get("response") or {}
+        if response.get("state"):
+            build.state = response["state"]
+            if build.state in FAILED_STATES:
+                build.error = f"index state {build.state}"
+            if build.finished:
+                return
+        # Without a finished index in the response, fall through to the index itself.
+    status, payload = client.call("GET", build.index)
+    if status != 200 or payload is None:
+        raise RuntimeError(f"Failed to read index {build.index} (HTTP {status}): {payload}")
+    build.state = payload.get("state", "")
+    if build.state in FAILED_STATES:
+        build.error = f"index state {build.state}"
+
+
+def _format_progress(builds: list[IndexBuild]) -> str:
+    groups: dict[str, list[int]] = {}
+    for build in builds:
+        counts = groups.setdefault(build.collection_group or "?", [0, 0])
+        counts[0] += build.state == READY_STATE
+        counts[1] += 1
+    return ", ".join(f"{group} {ready}/{total}" for group, (ready, total) in sorted(groups.items()))
+
+
+def wait_for_indexes(
+    client: ApiClient,
+    builds: list[IndexBuild],
+    *,
+    timeout_s: float = DEFAULT_WAIT_TIMEOUT_S,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    poll_initial_s: float = POLL_INITIAL_S,
+    poll_max_s: float = POLL_MAX_S,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+    progress: Callable[[str], None] = print,
+) -> list[IndexBuild]:
+    """Poll ``builds`` until every index is ``READY``.
+
+    Unfinished builds are polled concurrently each round. The interval grows
+    by ``POLL_GROWTH`` up to ``poll_max_s`` while nothing finishes and drops
+    back to ``poll_initial_s`` when something does. Progress per collection
+    group is reported whenever it changes. Raises ``RuntimeError`` when a
+    build fails and ``TimeoutError`` when ``timeout_s`` elapses first.
+    """
+    deadline = clock() + timeout_s
+    interval = poll_initial_s
+    last_report = ""
+    while True:
+        pending = [build for build in builds if not build.finished]
+        if pending:
+            _, failures = _run_concurrently(lambda build: _poll_build(client, build), pending, concurrency)
+            if failures:
+                details = "\n".join(f"  - {exc}" for exc in failures)
+                raise RuntimeError(f"{len(failures)} index poll(s) failed:\n{details}")
+
+        report = _format_progress(builds)
+        if report and report != last_report:
+            progress(f"Index build progress: {report}")
+        failed = [build for build in builds if build.error]
+        if failed:
+            details = "\n".join(f"  - {build.index or build.operation}: {build.error}" for build in failed)
+            raise RuntimeError(f"{len(failed)} index build(s) failed:\n{details}")
+        still_pending = [build for build in builds if not build.finished]
+        if not still_pending:
+            return builds
+
+        remaining = deadline - clock()
+        if remaining <= 0:
+            names = ", ".join(build.index or build.operation for build in still_pending)
+            raise TimeoutError(f"Timed out after {timeout_s:g}s waiting for {len(still_pending)} index(es): {names}")
+        if len(still_pending) < len(pending) or report != last_report:
+            interval = poll_initial_s
+        else:
+            interval = min(poll_max_s, interval * POLL_GROWTH)
+        last_report = report
+        sleep(min(interval, remaining))
+
+
+def sync_indexes(
+    project_id: str,
+    indexes_file: Path,
+    allow_delete: bool,
+    *,
+    token: str | None = None,
+    api_base: str = API_BASE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    client: ApiClient | None = None,
+    wait: bool = False,
+    wait_timeout_s: float = DEFAULT_WAIT_TIMEOUT_S,
+    poll_initial_s: float = POLL_INITIAL_S,
+    stats: RequestStats | None = None,
+) -> SyncResult:
+    """Create missing (and optionally delete extra) indexes with up to ``concurrency`` requests in flight.
+
+    Every create and delete is attempted; if any failed, a ``RuntimeError``
+    listing all failures is raised afterwards. With ``wait``, it then blocks
+    until every desired index, new or pre-existing, is ``READY``; indexes
+    whose create returned 409 are looked up again so their builds are
+    waited on too.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    if wait and wait_timeout_s <= 0:
+        raise ValueError("wait_timeout_s must be > 0")
+    desired = _load_desired(indexes_file)
+    own_client = client is None
+    if client is None:
+        client = ApiClient(
+            token=token or _get_access_token(), quota_project=project_id, api_base=api_base, stats=stats
         )
-        status, payload = _api_call(
-            method="POST",
-            url=url,
-            token=token,
-            quota_project=project_id,
-            body=spec.to_create_body(),
+    try:
+        states: dict[str, str] = {}
+        # Without deletes only the desired groups matter, and those can be listed in parallel.
+        groups = None if allow_delete else sorted({spec.collection_group for spec in desired})
+        existing = _list_existing(client, project_id, states, groups=groups, concurrency=concurrency)
+
+        plan = plan_indexes(desired, existing)
+        missing_specs = plan.create
+        extra_specs = [spec for spec, _ in plan.extra]
+
+        print(
+            f"Index sync for {project_id}: desired={len(desired)} existing={len(existing)} "
+            f"missing={len(missing_specs)} extra={len(extra_specs)}"
         )
-        if status in (200, 201):
-            created += 1
-            continue
-        if status == 409:
-            already_exists += 1
-            continue
-        raise RuntimeError(
-            f"Failed to create index for {spec.collection_group} (HTTP {status}): {payload}"
+
+        result = SyncResult()
+        created, failures = _run_concurrently(
+            lambda spec: _create_index(client, project_id, spec), missing_specs, concurrency
         )
+        conflicted: list[IndexSpec] = []
+        for spec, operation in created:
+            if operation is None:
+                result.already_exists += 1
+                conflicted.append(spec)
+            else:
+                result.created += 1
+                result.operations.append(operation)
+
+        if allow_delete:
+            deleted, delete_failures = _run_concurrently(
+                lambda spec: _delete_index(client, existing[spec]), extra_specs, concurrency
+            )
+            result.deleted = len(deleted)
+            failures.extend(delete_failures)
 
-    deleted = 0
-    if allow_delete:
-        for spec in extra_specs:
-            name = existing[spec]
-            url = f"https://firestore.googleapis.com/v1/{name}"
-            status, payload = _api_call(
-                method="DELETE",
-                url=url,
-                token=token,
-                quota_project=project_id,
+        print(
+            f"Index sync complete: created={result.created} already_exists={result.already_exists} "
+            f"deleted={result.deleted}"
+        )
+        if failures:
+            details = "\n".join(f"  - {exc}" for exc in failures)
+            raise RuntimeError(f"{len(failures)} index operation(s) failed:\n{details}")
+
+        if wait:
+            if conflicted:
+                # The listing missed these (created concurrently); find their names and build states.
+                groups = sorted({spec.collection_group for spec in conflicted})
+                relisted = _list_existing(client, project_id, states, groups=groups, concurrency=concurrency)
+                unlisted = [spec for spec in conflicted if spec not in relisted]
+                if unlisted:
+                    details = "\n".join(f"  - {describe_spec(spec)}" for spec in unlisted)
+                    raise RuntimeError(f"{len(unlisted)} index(es) returned 409 but are not listed:\n{details}")
+                existing = {**existing, **{spec: relisted[spec] for spec in conflicted}}
+            result.builds = [_build_from_operation(operation) for operation in result.operations]
+            result.builds.extend(
+                IndexBuild(collection_group=spec.collection_group, index=existing[spec], state=states[existing[spec]])
+                for spec in desired
+                if spec in existing and states.get(existing[spec]) != READY_STATE
             )
-            if status in (200, 204, 404):
-                deleted += 1
-                continue
-            raise RuntimeError(f"Failed to delete index {name} (HTTP {status}): {payload}")
+            if result.builds:
+                print(f"Waiting for {len(result.builds)} index build(s)...")
+                wait_for_indexes(
+                    client,
+                    result.builds,
+                    timeout_s=wait_timeout_s,
+                    concurrency=concurrency,
+                    poll_initial_s=poll_initial_s,
+                )
+            print("All desired indexes are READY")
+    finally:
+        if own_client:
+            client.close()
 
-    print(
-        f"Index sync complete: created={created} already_exists={already_exists} "
-        f"deleted={deleted}"
-    )
+    return result
 
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Sync Firestore composite indexes via API")
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return number
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError("must be > 0")
+    return number
+
+
+COMMANDS = ("sync", "plan", "snapshot")
+DEFAULT_INDEXES_FILE = "firebase_infra/generated/firestore.indexes.json"
+
+
+def _add_api_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--project-id", required=True, help="Firebase/GCP project ID")
+    parser.add_argument("--api-base", default=API_BASE, help="Firestore Admin API base URL")
+    parser.add_argument(
+        "--access-token",
+        default=os.environ.get("FIRESTORE_ACCESS_TOKEN"),
+        help="OAuth access token (default: $FIRESTORE_ACCESS_TOKEN, else `gcloud auth print-access-token`)",
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="text",
+        choices=["text", "json"],
+        help="Print per-request-kind counts, bytes and latency to stderr",
+    )
+
+
+def _add_desired_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--indexes-file",
-        default="firebase_infra/generated/firestore.indexes.json",
+        default=DEFAULT_INDEXES_FILE,
         help="Path to firestore index spec JSON",
     )
     parser.add_argument(
@@ -223,20 +882,99 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Delete existing indexes that are not present in the desired spec",
     )
-    return parser.parse_args()
 
 
-def main() -> int:
-    args = parse_args()
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Invocations without a subcommand keep meaning `sync`.
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "sync")
+
+    parser = argparse.ArgumentParser(description="Sync Firestore composite indexes via API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Create missing (and optionally delete extra) indexes (default)")
+    _add_api_args(sync_parser)
+    _add_desired_args(sync_parser)
+    sync_parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum concurrent create/delete requests (default: {DEFAULT_CONCURRENCY})",
+    )
+    sync_parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Wait until every desired index is READY before exiting",
+    )
+    sync_parser.add_argument(
+        "--wait-timeout",
+        type=_positive_float,
+        default=DEFAULT_WAIT_TIMEOUT_S,
+        help=f"Seconds to wait for index builds with --wait (default: {DEFAULT_WAIT_TIMEOUT_S:g})",
+    )
+
+    plan_parser = subparsers.add_parser("plan", help="Diff the desired spec against a snapshot, offline")
+    _add_desired_args(plan_parser)
+    plan_parser.add_argument("--snapshot", required=True, help="Snapshot JSON written by the snapshot command")
+    plan_parser.add_argument("--format", choices=["text", "json"], default="text")
+    plan_parser.add_argument(
+        "--exit-code",
+        action="store_true",
+        help="Exit with status 2 when the plan would create or delete indexes",
+    )
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Write the project's existing indexes to JSON")
+    _add_api_args(snapshot_parser)
+    snapshot_parser.add_argument("--output", required=True, help="Snapshot file to write")
+
+    return parser.parse_args(argv)
+
+
+def _print_stats(stats: RequestStats | None, fmt: str | None) -> None:
+    if stats is None:
+        return
+    if fmt == "json":
+        print(json.dumps(stats.to_dict(), indent=2), file=sys.stderr)
+    else:
+        print(stats.format_text(), file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    stats = RequestStats() if getattr(args, "stats", None) else None
     try:
+        if args.command == "plan":
+            return run_plan(
+                Path(args.indexes_file),
+                Path(args.snapshot),
+                allow_delete=args.allow_delete,
+                fmt=args.format,
+                exit_code=args.exit_code,
+            )
+        if args.command == "snapshot":
+            token = args.access_token or _get_access_token()
+            with ApiClient(token=token, quota_project=args.project_id, api_base=args.api_base, stats=stats) as client:
+                count = write_snapshot(client, args.project_id, Path(args.output))
+            print(f"Wrote {count} index(es) to {args.output}")
+            _print_stats(stats, args.stats)
+            return 0
         sync_indexes(
             project_id=args.project_id,
             indexes_file=Path(args.indexes_file),
             allow_delete=args.allow_delete,
+            token=args.access_token,
+            api_base=args.api_base,
+            concurrency=args.concurrency,
+            wait=args.wait,
+            wait_timeout_s=args.wait_timeout,
+            stats=stats,
         )
     except Exception as exc:  # noqa: BLE001
+        _print_stats(stats, getattr(args, "stats", None))
         print(f"ERROR: {exc}", file=sys.stderr)
         return 1
+    _print_stats(stats, getattr(args, "stats", None))
     return 0
 
 
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: per-document vs batch decoding of domain models.
+
+Usage: python3 benchmarks/bench_models.py [--docs 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from swim_apps_shared.domain.models import ClubMember  # noqa: E402
+
+_ROLES = ("swimmer", "swimmer", "swimmer", "coach", "clubadmin", "owner", "Swimmer")
+_STATUSES = ("active", "active", "inactive", "pending", "revoked")
+
+
+def synthetic_member_docs(count: int) -> list[dict]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    docs: list[dict] = []
+    for i in range(count):
+        doc = {
+            "uid": f"user-{i}",
+            "role": _ROLES[i % len(_ROLES)],
+            "status": _STATUSES[i % len(_STATUSES)],
+            "groupId": f"group-{i % 40}",
+        }
+        if i % 3 == 0:
+            doc["registerDate"] = f"2024-{(i % 12) + 1:02d}-01T08:00:00Z"
+        else:
+            doc["joinedAt"] = base + timedelta(days=i % 700)
+        docs.append(doc)
+    return docs
+
+
+def _time(label: str, fn, docs: list[dict]) -> float:
+    start = time.perf_counter()
+    decoded = fn(docs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s  {len(decoded) / elapsed:12,.0f} docs/s")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=1_000_000, help="Number of synthetic member docs")
+    args = parser.parse_args()
+
+    docs = synthetic_member_docs(args.docs)
+    print(f"Decoding {len(docs):,} synthetic member docs")
+    per_doc = _time("ClubMember.from_firestore_dict", lambda items: [ClubMember.from_firestore_dict(d) for d in items], docs)
+    batch = _time("ClubMember.from_firestore_dicts", ClubMember.from_firestore_dicts, docs)
+    print(f"speedup: {per_doc / batch:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
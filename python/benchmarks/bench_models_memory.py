@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Memory benchmark: bytes per instance for dict-backed vs slotted/compact models.
+
+Usage: python3 benchmarks/bench_models_memory.py [--instances 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from swim_apps_shared.domain.models import ClubMember, CompactGroup, CompactUser, Group, User  # noqa: E402
+
+
+@dataclass(frozen=True)
+class _DictBackedUser:
+    display_name: str
+    email: str
+    photo_url: str | None
+    created_at: datetime
+    roles: list[str]
+
+
+@dataclass(frozen=True)
+class _DictBackedClubMember:
+    uid: str
+    role: str
+    group_id: str | None
+    status: str
+    joined_at: datetime
+
+
+@dataclass(frozen=True)
+class _DictBackedGroup:
+    name: str
+    coach_ids: list[str]
+    created_at: datetime
+
+
+_CREATED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_NAME = "Jane Swimmer"
+_EMAIL = "jane@example.com"
+
+
+def _bytes_per_instance(factory: Callable[[int], object], count: int) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Exclude the holding list itself.
+    list_bytes = sys.getsizeof(instances)
+    del instances
+    return (after - before - list_bytes) / count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, default=100_000, help="Instances allocated per model")
+    args = parser.parse_args()
+
+    # Field values are shared between instances so only the container layout is measured.
+    cases: list[tuple[str, Callable[[int], object]]] = [
+        ("User (dict-backed, list)", lambda i: _DictBackedUser(_NAME, _EMAIL, None, _CREATED, ["coach", "staff"])),
+        ("User (slotted, list)", lambda i: User(_NAME, _EMAIL, None, _CREATED, ["coach", "staff"])),
+        ("CompactUser (slotted, tuple)", lambda i: CompactUser(_NAME, _EMAIL, None, _CREATED, tuple(["coach", "staff"]))),
+        ("ClubMember (dict-backed)", lambda i: _DictBackedClubMember("u1", "swimmer", "g1", "active", _CREATED)),
+        ("ClubMember (slotted)", lambda i: ClubMember("u1", "swimmer", "g1", "active", _CREATED)),
+        ("Group (dict-backed, list)", lambda i: _DictBackedGroup("A Group", ["c1", "c2"], _CREATED)),
+        ("Group (slotted, list)", lambda i: Group("A Group", ["c1", "c2"], _CREATED)),
+        ("CompactGroup (slotted, tuple)", lambda i: CompactGroup("A Group", tuple(["c1", "c2"]), _CREATED)),
+    ]
+
+    print(f"Bytes per instance over {args.instances:,} instances")
+    for label, factory in cases:
+        print(f"{label:<32} {_bytes_per_instance(factory, args.instances):8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
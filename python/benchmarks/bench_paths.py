@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: baseline path builders vs cached ClubPaths/club_paths.
+
+Usage: python3 benchmarks/bench_paths.py [--calls 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from swim_apps_shared.firestore import paths  # noqa: E402
+
+
+def _baseline_required_id(value: str, field_name: str) -> str:
+    normalized = str(value or "").strip()
+    if not normalized:
+        raise ValueError(f"{field_name} must be a non-empty string")
+    if "/" in normalized:
+        raise ValueError(f"{field_name} must not contain '/'")
+    return normalized
+
+
+def _baseline_club_member_doc(club_id: str, uid: str) -> str:
+    # Pre-ClubPaths implementation: club_doc -> club_members_col -> member doc.
+    club = f"{paths.CLUBS_COLLECTION}/{_baseline_required_id(club_id, 'club_id')}"
+    return f"{club}/{paths.MEMBERS_SUBCOLLECTION}/{_baseline_required_id(uid, 'uid')}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000, help="Path builds per case")
+    args = parser.parse_args()
+
+    uids = [f"user-{i}" for i in range(1000)]
+    club_ids = [f"club-{i}" for i in range(16)]
+    assert _baseline_club_member_doc("club-1", "user-1") == paths.club_member_doc("club-1", "user-1")
+
+    def baseline() -> None:
+        for i in range(args.calls):
+            _baseline_club_member_doc(club_ids[i & 15], uids[i % 1000])
+
+    def function_api() -> None:
+        for i in range(args.calls):
+            paths.club_member_doc(club_ids[i & 15], uids[i % 1000])
+
+    scoped = [paths.ClubPaths(club_id) for club_id in club_ids]
+
+    def club_paths_object() -> None:
+        for i in range(args.calls):
+            scoped[i & 15].member_doc(uids[i % 1000])
+
+    cases = [
+        ("baseline club_member_doc", baseline, None),
+        ("club_member_doc", function_api, None),
+        ("club_member_doc + id cache", function_api, 4096),
+        ("ClubPaths.member_doc", club_paths_object, None),
+        ("ClubPaths.member_doc + id cache", club_paths_object, 4096),
+    ]
+    print(f"{args.calls:,} club member paths per case")
+    reference = None
+    for label, fn, id_cache in cases:
+        paths.configure_id_cache(id_cache)
+        elapsed = timeit.timeit(fn, number=1)
+        reference = reference or elapsed
+        print(f"{label:<34} {elapsed:7.3f}s  {reference / elapsed:5.2f}x")
+    paths.configure_id_cache(None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark: reference allocations and time with and without RefCache.
+
+Uses a fake client that counts every reference object it allocates.
+
+Usage: python3 benchmarks/bench_refs.py [--calls 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from swim_apps_shared.firestore.paths import RefCache, club_members_ref, groups_ref  # noqa: E402
+
+
+class _CountingRef:
+    allocated = 0
+
+    def __init__(self, path: str):
+        _CountingRef.allocated += 1
+        self.path = path
+
+    def collection(self, name: str):
+        return _CountingRef(f"{self.path}/{name}")
+
+    def document(self, doc_id: str):
+        return _CountingRef(f"{self.path}/{doc_id}")
+
+
+class _CountingClient:
+    def collection(self, name: str):
+        return _CountingRef(name)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000, help="Reference lookups per case")
+    parser.add_argument("--clubs", type=int, default=8, help="Distinct hot club ids")
+    args = parser.parse_args()
+
+    db = _CountingClient()
+    cache = RefCache(db)
+    club_ids = [f"club-{i}" for i in range(args.clubs)]
+
+    def uncached() -> None:
+        for i in range(args.calls):
+            club_id = club_ids[i % args.clubs]
+            club_members_ref(db, club_id)
+            groups_ref(db, club_id)
+
+    def cached() -> None:
+        for i in range(args.calls):
+            club_id = club_ids[i % args.clubs]
+            cache.club_members_ref(club_id)
+            cache.groups_ref(club_id)
+
+    print(f"{args.calls:,} x (club_members_ref + groups_ref) over {args.clubs} clubs")
+    for label, fn in (("uncached", uncached), ("RefCache", cached)):
+        _CountingRef.allocated = 0
+        elapsed = timeit.timeit(fn, number=1)
+        print(f"{label:<10} {elapsed:7.3f}s  {_CountingRef.allocated:>12,} refs allocated")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
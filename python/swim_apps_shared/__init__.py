@@ -1,5 +1,6 @@
 """Shared SwimSuite Python primitives."""
 
-from swim_apps_shared.domain.models import ClubMember, Group, User
+from swim_apps_shared.domain.member_table import MemberTable, MemberTableBuilder
+from swim_apps_shared.domain.models import ClubMember, CompactGroup, CompactUser, Group, User
 
-__all__ = ["User", "ClubMember", "Group"]
+__all__ = ["User", "ClubMember", "Group", "CompactUser", "CompactGroup", "MemberTable", "MemberTableBuilder"]
@@ -0,0 +1,364 @@
+"""Columnar roster storage for whole-club and cross-club membership analytics."""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator, Mapping
+
+from swim_apps_shared.domain.models import (
+    _EMPTY_PAYLOAD,
+    ClubMember,
+    MemberRole,
+    MemberStatus,
+    _as_non_empty_str,
+    _as_optional_str,
+    _batch_memo,
+    _normalize_member_role,
+    _normalize_member_status,
+    _to_utc_datetime,
+)
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    _np = None
+
+
+ROLES: tuple[MemberRole, ...] = ("swimmer", "coach", "admin")
+STATUSES: tuple[MemberStatus, ...] = ("active", "inactive")
+GROUP_BY_KEYS = ("club_id", "role", "group_id", "status", "joined_month")
+
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_ANY: Any = object()
+
+
+
+def _to_epoch_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+
+def _from_epoch_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+class _Interner:
+    __slots__ = ("values", "codes")
+
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+        self.codes: dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class MemberTableBuilder:
+    """Accumulates member rows, optionally across several clubs, into a ``MemberTable``.
+
+    Payloads and document snapshots are decoded straight into columns with the
+    same normalization as ``ClubMember.from_firestore_dict``; no intermediate
+    ``ClubMember`` objects are created.
+    """
+
+    def __init__(self) -> None:
+        self._clubs = _Interner()
+        self._groups = _Interner()
+        self._uids: list[str] = []
+        self._club_codes = array("i")
+        self._role_codes = array("b")
+        self._group_codes = array("i")
+        self._status_codes = array("b")
+        self._joined_at_us = array("q")
+        self._normalize_role = _batch_memo(_normalize_member_role)
+        self._normalize_status = _batch_memo(_normalize_member_status)
+
+    def __len__(self) -> int:
+        return len(self._uids)
+
+    def _append(
+        self,
+        club_id: str | None,
+        uid: str,
+        role: MemberRole,
+        group_id: str | None,
+        status: MemberStatus,
+        joined_at: datetime,
+    ) -> None:
+        self._uids.append(uid)
+        self._club_codes.append(self._clubs.code(club_id))
+        self._role_codes.append(_ROLE_CODES[role])
+        self._group_codes.append(self._groups.code(group_id))
+        self._status_codes.append(_STATUS_CODES[status])
+        self._joined_at_us.append(_to_epoch_micros(joined_at))
+
+    def add_members(self, members: Iterable[ClubMember], *, club_id: str | None = None) -> "MemberTableBuilder":
+        for member in members:
+            self._append(club_id, member.uid, member.role, member.group_id, member.status, member.joined_at)
+        return self
+
+    def add_firestore_dicts(
+        self,
+        items: Iterable[Mapping[str, Any] | None],
+        *,
+        club_id: str | None = None,
+    ) -> "MemberTableBuilder":
+        for data in items:
+            self._add_payload(data or _EMPTY_PAYLOAD, club_id, default_uid="")
+        return self
+
+    def add_documents(self, docs: Iterable[Any], *, club_id: str | None = None) -> "MemberTableBuilder":
+        """Add member document snapshots, e.g. ``club_members_ref(db, club_id).stream()``."""
+        for doc in docs:
+            self._add_payload(doc.to_dict() or _EMPTY_PAYLOAD, club_id, default_uid=doc.id)
+        return self
+
+    def _add_payload(self, payload: Mapping[str, Any], club_id: str | None, *, default_uid: str) -> None:
+        get = payload.get
+        # Mirrors compat.get_club_members, which defaults "uid" to the document id.
+        self._append(
+            club_id,
+            _as_non_empty_str(get("uid", default_uid) or get("userId"), default=""),
+            self._normalize_role(get("role") or get("userType")),
+            _as_optional_str(get("activeGroupId")) or _as_optional_str(get("groupId")),
+            self._normalize_status(get("status") or get("membershipStatus")),
+            _to_utc_datetime(get("joinedAt") or get("registerDate") or get("createdAt")),
+        )
+
+    def build(self, *, use_numpy: bool | None = None) -> "MemberTable":
+        """Snapshot the accumulated rows; ``use_numpy=None`` uses NumPy when it is installed."""
+        if use_numpy is None:
+            use_numpy = _np is not None
+        if use_numpy and _np is None:
+            raise RuntimeError("numpy is not installed; install swim-apps-shared[analytics]")
+
+        # Slicing copies, so the builder can keep accepting rows afterwards.
+        columns: tuple[Any, ...] = (
+            self._club_codes[:],
+            self._role_codes[:],
+            self._group_codes[:],
+            self._status_codes[:],
+            self._joined_at_us[:],
+        )
+        if use_numpy:
+            columns = tuple(
+                _np.frombuffer(column, dtype=dtype)
+                for column, dtype in zip(columns, (_np.int32, _np.int8, _np.int32, _np.int8, _np.int64))
+            )
+        return MemberTable(
+            uids=list(self._uids),
+            club_ids=tuple(self._clubs.values),
+            group_ids=tuple(self._groups.values),
+            club_codes=columns[0],
+            role_codes=columns[1],
+            group_codes=columns[2],
+            status_codes=columns[3],
+            joined_at_us=columns[4],
+        )
+
+
+class MemberTable:
+    """Club members stored as parallel columns.
+
+    ``role_codes``/``status_codes`` index into ``ROLES``/``STATUSES``,
+    ``club_codes``/``group_codes`` index into ``club_ids``/``group_ids`` and
+    ``joined_at_us`` holds UTC epoch microseconds. Columns are ``array.array``
+    or NumPy arrays; filters and group-by counts are vectorized on NumPy.
+    """
+
+    __slots__ = (
+        "uids",
+        "club_ids",
+        "group_ids",
+        "club_codes",
+        "role_codes",
+        "group_codes",
+        "status_codes",
+        "joined_at_us",
+    )
+
+    def __init__(
+        self,
+        *,
+        uids: list[str],
+        club_ids: tuple[str | None, ...],
+        group_ids: tuple[str | None, ...],
+        club_codes: Any,
+        role_codes: Any,
+        group_codes: Any,
+        status_codes: Any,
+        joined_at_us: Any,
+    ) -> None:
+        self.uids = uids
+        self.club_ids = club_ids
+        self.group_ids = group_ids
+        self.club_codes = club_codes
+        self.role_codes = role_codes
+        self.group_codes = group_codes
+        self.status_codes = status_codes
+        self.joined_at_us = joined_at_us
+
+    @staticmethod
+    def from_members(members: Iterable[ClubMember], *, club_id: str | None = None) -> "MemberTable":
+        return MemberTableBuilder().add_members(members, club_id=club_id).build()
+
+    @staticmethod
+    def from_firestore_dicts(
+        items: Iterable[Mapping[str, Any] | None],
+        *,
+        club_id: str | None = None,
+    ) -> "MemberTable":
+        return MemberTableBuilder().add_firestore_dicts(items, club_id=club_id).build()
+
+    @staticmethod
+    def from_documents(docs: Iterable[Any], *, club_id: str | None = None) -> "MemberTable":
+        return MemberTableBuilder().add_documents(docs, club_id=club_id).build()
+
+    @property
+    def is_numpy(self) -> bool:
+        return _np is not None and isinstance(self.role_codes, _np.ndarray)
+
+    def __len__(self) -> int:
+        return len(self.uids)
+
+    def _conditions(self, club_id: Any, role: Any, group_id: Any, status: Any) -> list[tuple[Any, int]] | None:
+        """Resolve filter values to (column, code) pairs; ``None`` if nothing can match."""
+        conditions: list[tuple[Any, int]] = []
+        for column, lookup, value in (
+            (self.club_codes, self.club_ids, club_id),
+            (self.role_codes, ROLES, role),
+            (self.group_codes, self.group_ids, group_id),
+            (self.status_codes, STATUSES, status),
+        ):
+            if value is _ANY:
+                continue
+            try:
+                conditions.append((column, lookup.index(value)))
+            except ValueError:
+                return None
+        return conditions
+
+    def _select(self, club_id: Any, role: Any, group_id: Any, status: Any) -> Any:
+        """Row indices matching every given filter, or ``None`` for all rows."""
+        conditions = self._conditions(club_id, role, group_id, status)
+        if conditions is None:
+            return _np.empty(0, dtype=_np.intp) if self.is_numpy else []
+        if not conditions:
+            return None
+        if self.is_numpy:
+            mask = _np.ones(len(self), dtype=bool)
+            for column, code in conditions:
+                mask &= column == code
+            return _np.flatnonzero(mask)
+        rows: Iterable[int] = range(len(self))
+        for column, code in conditions:
+            rows = [i for i in rows if column[i] == code]
+        return rows
+
+    def filter(
+        self,
+        *,
+        club_id: Any = _ANY,
+        role: Any = _ANY,
+        group_id: Any = _ANY,
+        status: Any = _ANY,
+    ) -> "MemberTable":
+        """Return the rows matching every given value; ``group_id=None`` selects ungrouped members."""
+        rows = self._select(club_id, role, group_id, status)
+        if rows is None:
+            return self
+        if self.is_numpy:
+            return MemberTable(
+                uids=[self.uids[i] for i in rows.tolist()],
+                club_ids=self.club_ids,
+                group_ids=self.group_ids,
+                club_codes=self.club_codes[rows],
+                role_codes=self.role_codes[rows],
+                group_codes=self.group_codes[rows],
+                status_codes=self.status_codes[rows],
+                joined_at_us=self.joined_at_us[rows],
+            )
+        return MemberTable(
+            uids=[self.uids[i] for i in rows],
+            club_ids=self.club_ids,
+            group_ids=self.group_ids,
+            club_codes=array("i", (self.club_codes[i] for i in rows)),
+            role_codes=array("b", (self.role_codes[i] for i in rows)),
+            group_codes=array("i", (self.group_codes[i] for i in rows)),
+            status_codes=array("b", (self.status_codes[i] for i in rows)),
+            joined_at_us=array("q", (self.joined_at_us[i] for i in rows)),
+        )
+
+    def count(
+        self,
+        *,
+        club_id: Any = _ANY,
+        role: Any = _ANY,
+        group_id: Any = _ANY,
+        status: Any = _ANY,
+    ) -> int:
+        rows = self._select(club_id, role, group_id, status)
+        return len(self) if rows is None else len(rows)
+
+    def count_by(
+        self,
+        key: str,
+        *,
+        club_id: Any = _ANY,
+        role: Any = _ANY,
+        group_id: Any = _ANY,
+        status: Any = _ANY,
+    ) -> dict[Any, int]:
+        """Count filtered rows per ``key`` (one of ``GROUP_BY_KEYS``); ``joined_month`` keys are ``YYYY-MM``."""
+        if key not in GROUP_BY_KEYS:
+            raise ValueError(f"key must be one of {', '.join(GROUP_BY_KEYS)}")
+        rows = self._select(club_id, role, group_id, status)
+
+        if key == "joined_month":
+            return self._count_by_month(rows)
+
+        column, labels = {
+            "club_id": (self.club_codes, self.club_ids),
+            "role": (self.role_codes, ROLES),
+            "group_id": (self.group_codes, self.group_ids),
+            "status": (self.status_codes, STATUSES),
+        }[key]
+        if self.is_numpy:
+            selected = column if rows is None else column[rows]
+            counts = _np.bincount(selected, minlength=len(labels)).tolist()
+            return {labels[code]: count for code, count in enumerate(counts) if count}
+        selected_codes = column if rows is None else (column[i] for i in rows)
+        return {labels[code]: count for code, count in sorted(Counter(selected_codes).items())}
+
+    def _count_by_month(self, rows: Any) -> dict[str, int]:
+        if self.is_numpy:
+            micros = self.joined_at_us if rows is None else self.joined_at_us[rows]
+            months = micros.astype("datetime64[us]").astype("datetime64[M]")
+            values, counts = _np.unique(months, return_counts=True)
+            return {str(value): int(count) for value, count in zip(values, counts)}
+        micros_iter = self.joined_at_us if rows is None else (self.joined_at_us[i] for i in rows)
+        counter: Counter[str] = Counter()
+        for micros in micros_iter:
+            joined = _from_epoch_micros(micros)
+            counter[f"{joined.year:04d}-{joined.month:02d}"] += 1
+        return dict(sorted(counter.items()))
+
+    def iter_members(self) -> Iterator[ClubMember]:
+        """Materialize rows as ``ClubMember`` objects (club ids are not part of the model)."""
+        for i, uid in enumerate(self.uids):
+            yield ClubMember(
+                uid=uid,
+                role=ROLES[self.role_codes[i]],
+                group_id=self.group_ids[self.group_codes[i]],
+                status=STATUSES[self.status_codes[i]],
+                joined_at=_from_epoch_micros(self.joined_at_us[i]),
+            )
@@ -2,12 +2,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Literal
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Literal, Mapping, TypeVar
 
 
 MemberRole = Literal["swimmer", "coach", "admin"]
 MemberStatus = Literal["active", "inactive"]
 
+_T = TypeVar("_T")
+
+_EMPTY_PAYLOAD: Mapping[str, Any] = MappingProxyType({})
+
+# Legacy exports repeat the same ``registerDate`` strings across a whole club.
+_ISO_STRING_CACHE_SIZE = 4096
+
 
 
 def _utc_now() -> datetime:
@@ -15,15 +24,31 @@ def _utc_now() -> datetime:
 
 
 
-def _to_utc_datetime(value: Any, *, default: datetime | None = None) -> datetime:
-    if isinstance(value, datetime):
-        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 
+
+@lru_cache(maxsize=_ISO_STRING_CACHE_SIZE)
+def _parse_iso_string(value: str) -> datetime | None:
+    raw = value.strip()
+    if not raw:
+        return None
+    normalized = raw[:-1] + "+00:00" if raw.endswith("Z") else raw
+    try:
+        return _as_utc(datetime.fromisoformat(normalized))
+    except ValueError:
+        return None
+
+
+
+def _from_protocol(value: Any) -> datetime | None:
+    """Duck-typed coercion for Firestore timestamps and other unknown types."""
     if hasattr(value, "to_datetime"):
         try:
             as_dt = value.to_datetime()
             if isinstance(as_dt, datetime):
-                return as_dt if as_dt.tzinfo else as_dt.replace(tzinfo=timezone.utc)
+                return _as_utc(as_dt)
         except Exception:
             pass
 
@@ -31,22 +56,48 @@ def _to_utc_datetime(value: Any, *, default: datetime | None = None) -> datetime
         try:
             ts = value.timestamp()
             if isinstance(ts, datetime):
-                return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+                return _as_utc(ts)
             if isinstance(ts, (int, float)):
                 return datetime.fromtimestamp(float(ts), tz=timezone.utc)
         except Exception:
             pass
 
     if isinstance(value, str):
-        raw = value.strip()
-        if raw:
-            normalized = raw[:-1] + "+00:00" if raw.endswith("Z") else raw
-            try:
-                parsed = datetime.fromisoformat(normalized)
-                return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
-            except ValueError:
-                pass
+        return _parse_iso_string(value)
+
+    return None
+
+
 
+def _from_unsupported(value: Any) -> None:
+    return None
+
+
+
+def _resolve_datetime_converter(value_type: type) -> Callable[[Any], datetime | None]:
+    if value_type is str:
+        return _parse_iso_string
+    if value_type in (type(None), bool, int, float):
+        return _from_unsupported
+    return _from_protocol
+
+
+_DATETIME_CONVERTERS: dict[type, Callable[[Any], datetime | None]] = {}
+
+
+
+def _to_utc_datetime(value: Any, *, default: datetime | None = None) -> datetime:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    value_type = type(value)
+    converter = _DATETIME_CONVERTERS.get(value_type)
+    if converter is None:
+        converter = _DATETIME_CONVERTERS[value_type] = _resolve_datetime_converter(value_type)
+
+    converted = converter(value)
+    if converted is not None:
+        return converted
     return default or _utc_now()
 
 
@@ -75,6 +126,13 @@ def _as_list_of_str(value: Any) -> list[str]:
 
 
 
+def _as_tuple_of_str(value: Any) -> tuple[str, ...]:
+    if not isinstance(value, list):
+        return ()
+    return tuple(text for text in (str(item or "").strip() for item in value) if text)
+
+
+
 def _normalize_member_role(value: Any) -> MemberRole:
     role = _as_non_empty_str(value, default="swimmer").lower()
     if role in {"swimmer", "coach", "admin"}:
@@ -94,7 +152,27 @@ def _normalize_member_status(value: Any) -> MemberStatus:
     return "active"
 
 
-@dataclass(frozen=True)
+def _batch_memo(fn: Callable[[Any], _T]) -> Callable[[Any], _T]:
+    """Memoize a normalizer for the lifetime of one batch decode.
+
+    Only used for role/status values, where every non-string input maps to the
+    default, so hash-equal keys such as ``1``/``True`` cannot disagree.
+    """
+    cache: dict[Any, _T] = {}
+
+    def lookup(value: Any) -> _T:
+        try:
+            return cache[value]
+        except KeyError:
+            result = cache[value] = fn(value)
+            return result
+        except TypeError:
+            return fn(value)
+
+    return lookup
+
+
+@dataclass(frozen=True, slots=True)
 class User:
     display_name: str
     email: str
@@ -103,16 +181,29 @@ class User:
     roles: list[str]
 
     @staticmethod
-    def from_firestore_dict(data: dict[str, Any]) -> "User":
-        payload = dict(data or {})
+    def _from_payload(payload: Mapping[str, Any]) -> "User":
+        get = payload.get
         return User(
-            display_name=_as_non_empty_str(payload.get("displayName") or payload.get("name"), default=""),
-            email=_as_non_empty_str(payload.get("email"), default=""),
-            photo_url=_as_optional_str(payload.get("photoURL")),
-            created_at=_to_utc_datetime(payload.get("createdAt")),
-            roles=_as_list_of_str(payload.get("roles")),
+            display_name=_as_non_empty_str(get("displayName") or get("name"), default=""),
+            email=_as_non_empty_str(get("email"), default=""),
+            photo_url=_as_optional_str(get("photoURL")),
+            created_at=_to_utc_datetime(get("createdAt")),
+            roles=_as_list_of_str(get("roles")),
         )
 
+    @staticmethod
+    def from_firestore_dict(data: dict[str, Any]) -> "User":
+        return User._from_payload(dict(data or {}))
+
+    @staticmethod
+    def from_firestore_dicts(items: Iterable[Mapping[str, Any] | None]) -> list["User"]:
+        """Decode many payloads; equivalent to ``from_firestore_dict`` per item.
+
+        Payloads are only read, so they are not copied.
+        """
+        decode = User._from_payload
+        return [decode(data or _EMPTY_PAYLOAD) for data in items]
+
     def to_firestore_dict(self) -> dict[str, Any]:
         return {
             "displayName": self.display_name,
@@ -123,7 +214,7 @@ class User:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClubMember:
     uid: str
     role: MemberRole
@@ -132,20 +223,36 @@ class ClubMember:
     joined_at: datetime
 
     @staticmethod
-    def from_firestore_dict(data: dict[str, Any]) -> "ClubMember":
-        payload = dict(data or {})
-        uid = _as_non_empty_str(payload.get("uid") or payload.get("userId"), default="")
-        resolved_group_id = _as_optional_str(payload.get("activeGroupId")) or _as_optional_str(
-            payload.get("groupId")
-        )
+    def _from_payload(
+        payload: Mapping[str, Any],
+        normalize_role: Callable[[Any], MemberRole] = _normalize_member_role,
+        normalize_status: Callable[[Any], MemberStatus] = _normalize_member_status,
+    ) -> "ClubMember":
+        get = payload.get
         return ClubMember(
-            uid=uid,
-            role=_normalize_member_role(payload.get("role") or payload.get("userType")),
-            group_id=resolved_group_id,
-            status=_normalize_member_status(payload.get("status") or payload.get("membershipStatus")),
-            joined_at=_to_utc_datetime(payload.get("joinedAt") or payload.get("registerDate") or payload.get("createdAt")),
+            uid=_as_non_empty_str(get("uid") or get("userId"), default=""),
+            role=normalize_role(get("role") or get("userType")),
+            group_id=_as_optional_str(get("activeGroupId")) or _as_optional_str(get("groupId")),
+            status=normalize_status(get("status") or get("membershipStatus")),
+            joined_at=_to_utc_datetime(get("joinedAt") or get("registerDate") or get("createdAt")),
         )
 
+    @staticmethod
+    def from_firestore_dict(data: dict[str, Any]) -> "ClubMember":
+        return ClubMember._from_payload(dict(data or {}))
+
+    @staticmethod
+    def from_firestore_dicts(items: Iterable[Mapping[str, Any] | None]) -> list["ClubMember"]:
+        """Decode many payloads; equivalent to ``from_firestore_dict`` per item.
+
+        Payloads are only read, so they are not copied, and role/status
+        normalization is memoized across the batch.
+        """
+        normalize_role = _batch_memo(_normalize_member_role)
+        normalize_status = _batch_memo(_normalize_member_status)
+        decode = ClubMember._from_payload
+        return [decode(data or _EMPTY_PAYLOAD, normalize_role, normalize_status) for data in items]
+
     def to_firestore_dict(self) -> dict[str, Any]:
         return {
             "uid": self.uid,
@@ -157,21 +264,114 @@ class ClubMember:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Group:
     name: str
     coach_ids: list[str]
     created_at: datetime
 
     @staticmethod
-    def from_firestore_dict(data: dict[str, Any]) -> "Group":
-        payload = dict(data or {})
+    def _from_payload(payload: Mapping[str, Any]) -> "Group":
+        get = payload.get
         return Group(
+            name=_as_non_empty_str(get("name"), default=""),
+            coach_ids=_as_list_of_str(get("coachIds")),
+            created_at=_to_utc_datetime(get("createdAt")),
+        )
+
+    @staticmethod
+    def from_firestore_dict(data: dict[str, Any]) -> "Group":
+        return Group._from_payload(dict(data or {}))
+
+    @staticmethod
+    def from_firestore_dicts(items: Iterable[Mapping[str, Any] | None]) -> list["Group"]:
+        """Decode many payloads; equivalent to ``from_firestore_dict`` per item.
+
+        Payloads are only read, so they are not copied.
+        """
+        decode = Group._from_payload
+        return [decode(data or _EMPTY_PAYLOAD) for data in items]
+
+    def to_firestore_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "coachIds": list(self.coach_ids),
+            "createdAt": self.created_at,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class CompactUser:
+    """``User`` variant for bulk in-memory use; ``roles`` is an immutable tuple."""
+
+    display_name: str
+    email: str
+    photo_url: str | None
+    created_at: datetime
+    roles: tuple[str, ...]
+
+    @staticmethod
+    def from_firestore_dict(data: Mapping[str, Any] | None) -> "CompactUser":
+        payload = data or _EMPTY_PAYLOAD
+        return CompactUser(
+            display_name=_as_non_empty_str(payload.get("displayName") or payload.get("name"), default=""),
+            email=_as_non_empty_str(payload.get("email"), default=""),
+            photo_url=_as_optional_str(payload.get("photoURL")),
+            created_at=_to_utc_datetime(payload.get("createdAt")),
+            roles=_as_tuple_of_str(payload.get("roles")),
+        )
+
+    @staticmethod
+    def from_firestore_dicts(items: Iterable[Mapping[str, Any] | None]) -> list["CompactUser"]:
+        decode = CompactUser.from_firestore_dict
+        return [decode(data) for data in items]
+
+    @staticmethod
+    def from_user(user: User) -> "CompactUser":
+        return CompactUser(
+            display_name=user.display_name,
+            email=user.email,
+            photo_url=user.photo_url,
+            created_at=user.created_at,
+            roles=tuple(user.roles),
+        )
+
+    def to_firestore_dict(self) -> dict[str, Any]:
+        return {
+            "displayName": self.display_name,
+            "email": self.email,
+            "photoURL": self.photo_url,
+            "createdAt": self.created_at,
+            "roles": list(self.roles),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class CompactGroup:
+    """``Group`` variant for bulk in-memory use; ``coach_ids`` is an immutable tuple."""
+
+    name: str
+    coach_ids: tuple[str, ...]
+    created_at: datetime
+
+    @staticmethod
+    def from_firestore_dict(data: Mapping[str, Any] | None) -> "CompactGroup":
+        payload = data or _EMPTY_PAYLOAD
+        return CompactGroup(
             name=_as_non_empty_str(payload.get("name"), default=""),
-            coach_ids=_as_list_of_str(payload.get("coachIds")),
+            coach_ids=_as_tuple_of_str(payload.get("coachIds")),
             created_at=_to_utc_datetime(payload.get("createdAt")),
         )
 
+    @staticmethod
+    def from_firestore_dicts(items: Iterable[Mapping[str, Any] | None]) -> list["CompactGroup"]:
+        decode = CompactGroup.from_firestore_dict
+        return [decode(data) for data in items]
+
+    @staticmethod
+    def from_group(group: Group) -> "CompactGroup":
+        return CompactGroup(name=group.name, coach_ids=tuple(group.coach_ids), created_at=group.created_at)
+
     def to_firestore_dict(self) -> dict[str, Any]:
         return {
             "name": self.name,
@@ -0,0 +1,80 @@
+"""Asyncio counterparts of ``paths`` and ``compat`` for ``google.cloud.firestore.AsyncClient``.
+
+Reference construction is synchronous on the async client as well, so the
+``paths`` builders are re-exported unchanged; only reads are coroutines.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator
+
+from swim_apps_shared.domain.models import ClubMember
+from swim_apps_shared.firestore.compat import (
+    _alias_member_from_doc,
+    _alias_members_ref,
+    _member_from_doc,
+    _warn_alias_fallback,
+)
+from swim_apps_shared.firestore.paths import (
+    club_member_ref,
+    club_members_ref,
+    group_ref,
+    groups_ref,
+    user_ref,
+)
+
+try:
+    from google.cloud.firestore import AsyncClient as _AsyncClient
+except ImportError:  # optional at runtime: callers may pass any client-shaped object
+    _AsyncClient = None
+
+__all__ = [
+    "club_member_ref",
+    "club_members_ref",
+    "get_club_members",
+    "group_ref",
+    "groups_ref",
+    "is_async_client",
+    "iter_club_members",
+    "user_ref",
+]
+
+
+
+def is_async_client(db: Any) -> bool:
+    """Whether ``db`` is a ``google.cloud.firestore.AsyncClient``.
+
+    Wrappers and test doubles are not recognized; callers that accept those
+    take an explicit ``is_async`` flag instead.
+    """
+    return _AsyncClient is not None and isinstance(db, _AsyncClient)
+
+
+
+async def iter_club_members(db: Any, club_id: str) -> AsyncIterator[ClubMember]:
+    """Async variant of ``compat.iter_club_members`` with the same canonical-first fallback."""
+    member_docs = club_members_ref(db, club_id).stream().__aiter__()
+    try:
+        first_doc = await member_docs.__anext__()
+    except StopAsyncIteration:
+        first_doc = None
+
+    if first_doc is not None:
+        yield _member_from_doc(first_doc)
+        async for member_doc in member_docs:
+            yield _member_from_doc(member_doc)
+        return
+
+    warned = False
+    async for alias_doc in _alias_members_ref(db, club_id).stream():
+        if not warned:
+            _warn_alias_fallback(club_id)
+            warned = True
+        member = _alias_member_from_doc(alias_doc)
+        if member is not None:
+            yield member
+
+
+
+async def get_club_members(db: Any, club_id: str) -> list[ClubMember]:
+    return [member async for member in iter_club_members(db, club_id)]
@@ -7,16 +7,20 @@ This module exists only for temporary dual-read support during migration.
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from swim_apps_shared.domain.models import ClubMember
 from swim_apps_shared.firestore.paths import (
+    _required_id,
     club_doc,
     club_members_ref,
 )
 
 DEPRECATION_REMOVE_AFTER = "2026-06-30"
 
+# Firestore caps the value list of an ``in`` filter.
+_IN_QUERY_LIMIT = 30
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -47,33 +51,143 @@ def _map_alias_doc_to_member(uid: str, payload: dict[str, Any]) -> ClubMember:
 
 
 
-def get_club_members(db: Any, club_id: str) -> list[ClubMember]:
-    member_docs = list(club_members_ref(db, club_id).stream())
-    if member_docs:
-        out: list[ClubMember] = []
-        for member_doc in member_docs:
-            payload = member_doc.to_dict() or {}
-            payload.setdefault("uid", member_doc.id)
-            out.append(ClubMember.from_firestore_dict(payload))
-        return out
-
-    alias_docs = list(
-        db.document(club_doc(club_id))
-        .collection("users")
-        .stream()
+def _member_from_doc(member_doc: Any) -> ClubMember:
+    payload = member_doc.to_dict() or {}
+    payload.setdefault("uid", member_doc.id)
+    return ClubMember.from_firestore_dict(payload)
+
+
+
+def _alias_member_from_doc(alias_doc: Any) -> ClubMember | None:
+    payload = alias_doc.to_dict() or {}
+    uid = str(payload.get("uid") or payload.get("userId") or alias_doc.id).strip()
+    if not uid:
+        return None
+    return _map_alias_doc_to_member(uid, payload)
+
+
+
+def _warn_alias_fallback(club_id: str) -> None:
+    _LOGGER.warning(
+        "Compat fallback to legacy alias membership path /swimClubs/{clubId}/users",
+        extra={"club_id": club_id, "remove_after": DEPRECATION_REMOVE_AFTER},
     )
 
-    if alias_docs:
-        _LOGGER.warning(
-            "Compat fallback to legacy alias membership path /swimClubs/{clubId}/users",
-            extra={"club_id": club_id, "remove_after": DEPRECATION_REMOVE_AFTER},
-        )
-
-    fallback_members: list[ClubMember] = []
-    for alias_doc in alias_docs:
-        payload = alias_doc.to_dict() or {}
-        uid = str(payload.get("uid") or payload.get("userId") or alias_doc.id).strip()
-        if not uid:
-            continue
-        fallback_members.append(_map_alias_doc_to_member(uid, payload))
-    return fallback_members
+
+
+def _alias_members_ref(db: Any, club_id: str):
+    return db.document(club_doc(club_id)).collection("users")
+
+
+
+def _iter_alias_members(db: Any, club_id: str) -> Iterator[ClubMember]:
+    warned = False
+    for alias_doc in _alias_members_ref(db, club_id).stream():
+        if not warned:
+            _warn_alias_fallback(club_id)
+            warned = True
+        member = _alias_member_from_doc(alias_doc)
+        if member is not None:
+            yield member
+
+
+
+def iter_club_members(db: Any, club_id: str) -> Iterator[ClubMember]:
+    """Yield club members as the canonical (or, if empty, legacy alias) stream produces them.
+
+    Only the first canonical document is inspected to decide on the alias
+    fallback, so memory stays bounded by a single document.
+    """
+    member_docs = iter(club_members_ref(db, club_id).stream())
+    first_doc = next(member_docs, None)
+    if first_doc is not None:
+        yield _member_from_doc(first_doc)
+        for member_doc in member_docs:
+            yield _member_from_doc(member_doc)
+        return
+
+    yield from _iter_alias_members(db, club_id)
+
+
+
+def load_club_members(db: Any, club_id: str) -> tuple[list[ClubMember], bool]:
+    """Like ``get_club_members`` but also reports whether the legacy alias path was used."""
+    members = [_member_from_doc(member_doc) for member_doc in club_members_ref(db, club_id).stream()]
+    if members:
+        return members, False
+    return list(_iter_alias_members(db, club_id)), True
+
+
+
+def get_club_members(db: Any, club_id: str) -> list[ClubMember]:
+    return list(iter_club_members(db, club_id))
+
+
+
+def _get_documents(db: Any, refs: list[Any]) -> list[Any]:
+    if not refs:
+        return []
+    get_all = getattr(db, "get_all", None)
+    if get_all is not None:
+        return list(get_all(refs))
+    return [ref.get() for ref in refs]
+
+
+
+def _query_alias_docs(alias_col: Any, field: str, uids: list[str]) -> Iterator[Any]:
+    for start in range(0, len(uids), _IN_QUERY_LIMIT):
+        yield from alias_col.where(field, "in", uids[start : start + _IN_QUERY_LIMIT]).stream()
+
+
+
+def get_club_members_by_uid(db: Any, club_id: str, uids: Iterable[str]) -> dict[str, ClubMember]:
+    """Fetch specific members with direct document reads instead of a collection stream.
+
+    Canonical member docs are read in one ``db.get_all`` batch when the client
+    supports it. Uids without a canonical doc fall back to the legacy alias doc
+    with the same id, then to ``uid``/``userId`` ``in`` queries for alias docs
+    keyed differently. Alias members are keyed by the uid their payload maps to,
+    as in ``get_club_members``. Missing uids are absent from the result, which
+    keeps input order.
+    """
+    wanted = list(dict.fromkeys(_required_id(uid, "uid") for uid in uids))
+    members_col = club_members_ref(db, club_id)
+    found: dict[str, ClubMember] = {}
+    for snapshot in _get_documents(db, [members_col.document(uid) for uid in wanted]):
+        if snapshot.exists:
+            found[snapshot.id] = _member_from_doc(snapshot)
+
+    missing = [uid for uid in wanted if uid not in found]
+    if missing:
+        alias_col = _alias_members_ref(db, club_id)
+        missing_set = set(missing)
+        warned = False
+
+        def add_alias(snapshot: Any) -> None:
+            nonlocal warned
+            if not snapshot.exists:
+                return
+            member = _alias_member_from_doc(snapshot)
+            if member is None or member.uid not in missing_set or member.uid in found:
+                return
+            if not warned:
+                _warn_alias_fallback(club_id)
+                warned = True
+            found[member.uid] = member
+
+        for snapshot in _get_documents(db, [alias_col.document(uid) for uid in missing]):
+            add_alias(snapshot)
+        for field in ("uid", "userId"):
+            remaining = [uid for uid in missing if uid not in found]
+            if not remaining:
+                break
+            for snapshot in _query_alias_docs(alias_col, field, remaining):
+                add_alias(snapshot)
+
+    return {uid: found[uid] for uid in wanted if uid in found}
+
+
+
+def get_club_member(db: Any, club_id: str, uid: str) -> ClubMember | None:
+    normalized_uid = _required_id(uid, "uid")
+    return get_club_members_by_uid(db, club_id, [normalized_uid]).get(normalized_uid)
@@ -1,25 +1,105 @@
 from __future__ import annotations
 
+import bisect
+import codecs
+import functools
+import hashlib
+import heapq
+import json
+import mmap
 import os
 import re
-from typing import Iterable
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, NamedTuple
 
-_ALIAS_PATTERNS = [
-    re.compile(r"(?:swimClubs|clubs)/[^\s'\"`]+/users(?:/|$)"),
-    re.compile(r"(?:swimClubs|clubs)/\{[^}]+\}/users(?:/|$)"),
-    re.compile(
-        r"collection\(\s*(?:(['\"])(?:swimClubs|clubs)\1|CLUBS_COLLECTION)\s*\)\s*"
+# Quote backreferences use named groups so the sources can be merged into one
+# combined pattern below; group names are prefixed per pattern when merging.
+_ALIAS_PATTERN_SOURCES = [
+    r"(?:swimClubs|clubs)/[^\s'\"`]+/users(?:/|$)",
+    r"(?:swimClubs|clubs)/\{[^}]+\}/users(?:/|$)",
+    (
+        r"collection\(\s*(?:(?P<q1>['\"])(?:swimClubs|clubs)(?P=q1)|CLUBS_COLLECTION)\s*\)\s*"
         r"\.\s*document\([^)]*\)\s*"
-        r"\.\s*collection\(\s*(['\"])users\2\s*\)",
-        re.DOTALL,
+        r"\.\s*collection\(\s*(?P<q2>['\"])users(?P=q2)\s*\)"
     ),
-    re.compile(
+    (
         r"document\(\s*club_doc\([^)]*\)\s*\)\s*"
-        r"\.\s*collection\(\s*(['\"])users\1\s*\)",
-        re.DOTALL,
+        r"\.\s*collection\(\s*(?P<q1>['\"])users(?P=q1)\s*\)"
     ),
 ]
 
+_ALIAS_PATTERNS = [re.compile(source, re.DOTALL) for source in _ALIAS_PATTERN_SOURCES]
+
+# Characters matched by ``\s`` in str patterns; bytes patterns only know the ASCII six.
+_ASCII_SPACES = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f "
+_UNICODE_SPACES = "\x85\xa0\u1680" + "".join(map(chr, range(0x2000, 0x200B))) + "\u2028\u2029\u202f\u205f\u3000"
+_BYTE_SPACE_CLASS = "".join(f"\\x{ord(char):02x}" for char in _ASCII_SPACES)
+_BYTE_WIDE_SPACE = "|".join(
+    "".join(f"\\x{byte:02x}" for byte in char.encode("utf-8")) for char in _UNICODE_SPACES
+)
+
+
+
+def _byte_source(source: str) -> bytes:
+    """Translate a str pattern source to match the same text in UTF-8 bytes."""
+    # A negated class starting with \s becomes "not a wide space, then not an ASCII space".
+    source = re.sub(
+        r"\[\^\\s([^\]]*)\]",
+        lambda m: f"(?:(?!{_BYTE_WIDE_SPACE})[^{_BYTE_SPACE_CLASS}{m.group(1)}])",
+        source,
+    )
+    source = source.replace(r"\s", f"(?:[{_BYTE_SPACE_CLASS}]|{_BYTE_WIDE_SPACE})")
+    return source.encode("ascii")
+
+
+# Byte-level twins of the patterns for large files scanned without decoding.
+_ALIAS_BYTE_PATTERNS = [re.compile(_byte_source(source), re.DOTALL) for source in _ALIAS_PATTERN_SOURCES]
+
+# Files of at least this many bytes are scanned through mmap, or in chunks.
+LARGE_FILE_THRESHOLD = 4 * 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+# Matches longer than the overlap window may be missed at chunk boundaries.
+_CHUNK_OVERLAP = 64 * 1024
+
+# Scan cache entries written under a different pattern set are ignored.
+_PATTERN_SET_VERSION = hashlib.sha256("\n".join(_ALIAS_PATTERN_SOURCES).encode("utf-8")).hexdigest()[:16]
+# Bumped when the entry layout or the scan semantics change.
+_CACHE_FORMAT_VERSION = 2
+
+# Every alias pattern contains this literal, so files without it are skipped.
+_ALIAS_LITERAL = "users"
+# Every alias pattern starts with "swimClubs", "clubs", "collection(" or
+# "document("; a first-character class lets the engine skip other positions
+# cheaply, and the gate below does the precise check.
+_ALIAS_ANCHOR = r"(?=[scd])"
+
+
+
+def _scoped_source(prefix: str, source: str) -> str:
+    return re.sub(r"\(\?P([<=])(\w+)", lambda m: f"(?P{m.group(1)}{prefix}{m.group(2)}", source)
+
+
+# One pass over the text finds, at each anchor position where at least one alias
+# pattern matches (the gate), which patterns match there: each optional
+# lookahead captures its own pattern's span. Positions failing the gate never
+# leave the regex engine.
+_COMBINED_ALIAS_PATTERN = re.compile(
+    _ALIAS_ANCHOR
+    + "(?="
+    + "|".join(
+        f"(?:{_scoped_source(f'gate{index}_', source)})" for index, source in enumerate(_ALIAS_PATTERN_SOURCES)
+    )
+    + ")"
+    + "".join(
+        f"(?=(?P<alias{index}>{_scoped_source(f'p{index}_', source)})|)"
+        for index, source in enumerate(_ALIAS_PATTERN_SOURCES)
+    ),
+    re.DOTALL,
+)
+_COMBINED_GROUPS = [f"alias{index}" for index in range(len(_ALIAS_PATTERN_SOURCES))]
+
 
 
 def assert_no_alias_paths(path: str) -> None:
@@ -30,54 +110,643 @@ def assert_no_alias_paths(path: str) -> None:
 
 
 
-def _iter_text_files(root_dir: str) -> Iterable[str]:
-    skip_dirs = {
-        ".git",
-        "venv",
-        ".venv",
-        "node_modules",
-        "build",
-        "__pycache__",
-        ".dart_tool",
-        ".idea",
-        ".firebase",
-    }
-    allowed_ext = {
-        ".py",
-        ".pyi",
-        ".txt",
-        ".md",
-        ".rules",
-        ".yaml",
-        ".yml",
-        ".json",
-        ".toml",
-    }
+_SKIP_DIRS = {
+    ".git",
+    "venv",
+    ".venv",
+    "node_modules",
+    "build",
+    "__pycache__",
+    ".dart_tool",
+    ".idea",
+    ".firebase",
+}
+_ALLOWED_EXT = {
+    ".py",
+    ".pyi",
+    ".txt",
+    ".md",
+    ".rules",
+    ".yaml",
+    ".yml",
+    ".json",
+    ".toml",
+}
 
+
+
+def _has_allowed_ext(file_path: str) -> bool:
+    _, ext = os.path.splitext(file_path)
+    return ext.lower() in _ALLOWED_EXT
+
+
+
+def _iter_text_files(root_dir: str, stats: ScanStats | None = None) -> Iterable[str]:
     for current_root, dirs, files in os.walk(root_dir):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
+        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS]
         for filename in files:
-            _, ext = os.path.splitext(filename)
-            if ext.lower() not in allowed_ext:
+            if stats is not None:
+                stats.files_visited += 1
+            if not _has_allowed_ext(filename):
+                if stats is not None:
+                    stats.skipped_extension += 1
                 continue
             yield os.path.join(current_root, filename)
 
 
 
-def scan_repo_for_alias_paths(root_dir: str) -> list[tuple[str, int]]:
-    findings: list[tuple[str, int]] = []
-    for file_path in _iter_text_files(root_dir):
+def _normalize_newlines(content: str) -> str:
+    # Universal newlines, as text-mode reads apply them: "\r\n" and a lone "\r" become "\n".
+    if "\r" not in content:
+        return content
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+
+def _newline_offsets(content: str) -> list[int]:
+    offsets: list[int] = []
+    position = content.find("\n")
+    while position != -1:
+        offsets.append(position)
+        position = content.find("\n", position + 1)
+    return offsets
+
+
+
+def _find_alias_lines(content: str) -> list[int]:
+    """Return matched line numbers in the order the per-pattern scan reports them.
+
+    Equivalent to running ``finditer`` for each of ``_ALIAS_PATTERNS`` in turn:
+    per pattern, a match is only accepted if it starts at or after the end of
+    that pattern's previously accepted match.
+    """
+    if _ALIAS_LITERAL not in content:
+        return []
+
+    pattern_count = len(_COMBINED_GROUPS)
+    accepted: list[list[int]] = [[] for _ in range(pattern_count)]
+    last_end = [0] * pattern_count
+    for match in _COMBINED_ALIAS_PATTERN.finditer(content):
+        for index, group in enumerate(_COMBINED_GROUPS):
+            start = match.start(group)
+            if start != -1 and start >= last_end[index]:
+                accepted[index].append(start)
+                last_end[index] = match.end(group)
+
+    if not any(accepted):
+        return []
+
+    newlines = _newline_offsets(content)
+    seen: set[int] = set()
+    lines: list[int] = []
+    for starts in accepted:
+        for start in starts:
+            line_number = bisect.bisect_left(newlines, start) + 1
+            if line_number in seen:
+                continue
+            seen.add(line_number)
+            lines.append(line_number)
+    return lines
+
+
+
+def _count_newlines(buffer: Any, start: int, end: int) -> int:
+    total = 0
+    while start < end:
+        stop = min(end, start + _CHUNK_SIZE)
+        total += buffer[start:stop].count(b"\n")
+        start = stop
+    return total
+
+
+
+def _scan_window(
+    buffer: Any,
+    offset: int,
+    core_end: int,
+    final: bool,
+    last_end: list[int],
+    base_line: int,
+    lines_by_pattern: list[list[int]],
+    pattern_s: list[float] | None = None,
+) -> int | None:
+    """Record matches starting in ``buffer[:core_end]``; ``buffer[0]`` is at file ``offset``.
+
+    ``last_end`` carries each pattern's previous match end across windows so
+    the result equals one ``finditer`` per pattern over the whole file. In a
+    non-final window a match reaching the last two bytes may depend on the
+    cut (``$`` also matches before a trailing ``\n``); it is not recorded,
+    and the window-relative start of the earliest such match is returned so
+    the caller can rescan from there.
+    """
+    found: list[tuple[int, int]] = []
+    deferred: int | None = None
+    for index, pattern in enumerate(_ALIAS_BYTE_PATTERNS):
+        started = time.perf_counter()
+        for match in pattern.finditer(buffer, max(0, last_end[index] - offset)):
+            if match.start() >= core_end:
+                break
+            if not final and match.end() >= len(buffer) - 1:
+                deferred = match.start() if deferred is None else min(deferred, match.start())
+                break
+            found.append((match.start(), index))
+            last_end[index] = offset + match.end()
+        if pattern_s is not None:
+            pattern_s[index] += time.perf_counter() - started
+
+    found.sort()
+    line_number = base_line
+    previous = 0
+    for start, index in found:
+        line_number += _count_newlines(buffer, previous, start)
+        previous = start
+        lines_by_pattern[index].append(line_number)
+    return deferred
+
+
+
+def _ordered_unique_lines(lines_by_pattern: list[list[int]]) -> list[int]:
+    return list(dict.fromkeys(line for lines in lines_by_pattern for line in lines))
+
+
+
+def _check_utf8(buffer: Any) -> None:
+    """Raise ``UnicodeDecodeError`` unless ``buffer`` is valid UTF-8, decoding one chunk at a time."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for start in range(0, len(buffer), _CHUNK_SIZE):
+        decoder.decode(buffer[start:start + _CHUNK_SIZE])
+    decoder.decode(b"", final=True)
+
+
+
+class _NormalizedReader:
+    """Binary reader over UTF-8 text that applies ``_normalize_newlines`` and validates as it reads."""
+
+    def __init__(self, handle: Any) -> None:
+        self._handle = handle
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._pending = b""
+        self._carriage_return = False
+
+    def read(self, size: int) -> bytes:
+        while len(self._pending) < size:
+            chunk = self._handle.read(size)
+            self._utf8.decode(chunk, final=not chunk)
+            if not chunk:
+                if self._carriage_return:
+                    self._pending += b"\n"
+                    self._carriage_return = False
+                break
+            if self._carriage_return:
+                chunk = b"\r" + chunk
+                self._carriage_return = False
+            # A trailing "\r" may start a "\r\n" pair split across reads.
+            if chunk.endswith(b"\r"):
+                chunk = chunk[:-1]
+                self._carriage_return = True
+            self._pending += chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+
+def _scan_large_file(handle: Any, pattern_s: list[float] | None = None) -> list[int]:
+    """Scan a binary ``handle`` with bounded memory: mmap, else overlapping chunks.
+
+    Like the text path, the content must be UTF-8 (``UnicodeDecodeError``
+    otherwise) and is matched with universal newlines; files containing
+    ``\r`` go through the chunked reader, which translates them.
+    """
+    pattern_count = len(_ALIAS_BYTE_PATTERNS)
+    lines_by_pattern: list[list[int]] = [[] for _ in range(pattern_count)]
+    last_end = [0] * pattern_count
+    try:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        mapped = None
+    if mapped is not None:
+        with mapped:
+            _check_utf8(mapped)
+            if mapped.find(b"\r") == -1:
+                if mapped.find(_ALIAS_LITERAL.encode("ascii")) != -1:
+                    _scan_window(mapped, 0, len(mapped), True, last_end, 1, lines_by_pattern, pattern_s)
+                return _ordered_unique_lines(lines_by_pattern)
+
+    handle.seek(0)
+    handle = _NormalizedReader(handle)
+    window = _CHUNK_SIZE + _CHUNK_OVERLAP
+    offset = 0
+    base_line = 1
+    buffer = handle.read(window)
+    exhausted = len(buffer) < window
+    while True:
+        core_end = len(buffer) if exhausted else _CHUNK_SIZE
+        deferred = _scan_window(
+            buffer, offset, core_end, exhausted, last_end, base_line, lines_by_pattern, pattern_s
+        )
+        if exhausted:
+            break
+        advance = core_end if deferred is None else deferred
+        if advance == 0:
+            # A match spans the whole window: widen it instead of moving on.
+            more = handle.read(_CHUNK_SIZE)
+            exhausted = len(more) < _CHUNK_SIZE
+            buffer += more
+            continue
+        base_line += buffer.count(b"\n", 0, advance)
+        offset += advance
+        buffer = buffer[advance:]
+        needed = window - len(buffer)
+        if needed > 0:
+            more = handle.read(needed)
+            exhausted = len(more) < needed
+            buffer += more
+    return _ordered_unique_lines(lines_by_pattern)
+
+
+
+def _profile_patterns(content: str, pattern_s: list[float]) -> None:
+    # The combined engine cannot attribute time to a pattern, so rerun each one alone.
+    for index, pattern in enumerate(_ALIAS_PATTERNS):
+        started = time.perf_counter()
+        for _ in pattern.finditer(content):
+            pass
+        pattern_s[index] += time.perf_counter() - started
+
+
+
+class _FileScan(NamedTuple):
+    # ``lines`` is None when the content hash equals the digest the caller already knows.
+    lines: list[int] | None
+    status: str
+    size: int
+    digest: str | None
+    elapsed_s: float
+    pattern_s: tuple[float, ...] | None
+
+
+_SCANNED = "scanned"
+_UNCHANGED = "unchanged"
+_DECODE_ERROR = "decode_error"
+_UNREADABLE = "unreadable"
+
+
+
+def _scan_job(
+    job: tuple[str, str | None],
+    *,
+    hashed: bool = False,
+    large_file_threshold: int = LARGE_FILE_THRESHOLD,
+    profile: bool = False,
+) -> _FileScan:
+    """Scan one ``(path, known_digest)``; with ``hashed`` the sha256 is computed first."""
+    file_path, known_digest = job
+    started = time.perf_counter()
+    pattern_s = [0.0] * len(_ALIAS_PATTERNS) if profile else None
+
+    def result(lines: list[int] | None, status: str, size: int = 0, digest: str | None = None) -> _FileScan:
+        profiled = tuple(pattern_s) if pattern_s is not None else None
+        return _FileScan(lines, status, size, digest, time.perf_counter() - started, profiled)
+
+    try:
+        with open(file_path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size >= large_file_threshold:
+                digest = hashlib.file_digest(handle, "sha256").hexdigest() if hashed else None
+                if digest is not None and digest == known_digest:
+                    return result(None, _UNCHANGED, size, digest)
+                try:
+                    lines = _scan_large_file(handle, pattern_s)
+                except UnicodeDecodeError:
+                    return result([], _DECODE_ERROR, size, digest)
+                return result(lines, _SCANNED, size, digest)
+            raw = handle.read()
+    except OSError:
+        return result([], _UNREADABLE)
+
+    digest = hashlib.sha256(raw).hexdigest() if hashed else None
+    if digest is not None and digest == known_digest:
+        return result(None, _UNCHANGED, len(raw), digest)
+    try:
+        content = _normalize_newlines(raw.decode("utf-8"))
+    except UnicodeDecodeError:
+        return result([], _DECODE_ERROR, len(raw), digest)
+    if pattern_s is not None:
+        _profile_patterns(content, pattern_s)
+    return result(_find_alias_lines(content), _SCANNED, len(raw), digest)
+
+
+
+def _scan_file(file_path: str, large_file_threshold: int = LARGE_FILE_THRESHOLD) -> list[int]:
+    return _scan_job((file_path, None), large_file_threshold=large_file_threshold).lines or []
+
+
+
+@dataclass
+class ScanStats:
+    """Counters filled in by ``scan_repo_for_alias_paths(stats=...)``.
+
+    Per-pattern times rerun each pattern separately, so collecting stats
+    roughly doubles scan cost; with ``jobs > 1`` times are summed over workers.
+    """
+
+    top_n: int = 10
+    files_visited: int = 0
+    files_scanned: int = 0
+    skipped_extension: int = 0
+    skipped_decode_error: int = 0
+    skipped_unreadable: int = 0
+    cache_hits: int = 0
+    bytes_scanned: int = 0
+    findings: int = 0
+    wall_time_s: float = 0.0
+    pattern_time_s: list[float] = field(default_factory=lambda: [0.0] * len(_ALIAS_PATTERN_SOURCES))
+    _slowest: list[tuple[float, str, int]] = field(default_factory=list, repr=False)
+
+    def record(self, file_path: str, scan: _FileScan) -> None:
+        if scan.status == _UNREADABLE:
+            self.skipped_unreadable += 1
+            return
+        if scan.status == _DECODE_ERROR:
+            self.skipped_decode_error += 1
+            return
+        if scan.status == _UNCHANGED:
+            self.cache_hits += 1
+            return
+        self.files_scanned += 1
+        self.bytes_scanned += scan.size
+        if scan.pattern_s is not None:
+            for index, elapsed in enumerate(scan.pattern_s):
+                self.pattern_time_s[index] += elapsed
+        entry = (scan.elapsed_s, file_path, scan.size)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest_files(self) -> list[tuple[str, float, int]]:
+        """``(path, seconds, bytes)`` for the slowest scanned files, slowest first."""
+        return [(path, elapsed, size) for elapsed, path, size in sorted(self._slowest, reverse=True)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "files_visited": self.files_visited,
+            "files_scanned": self.files_scanned,
+            "skipped_extension": self.skipped_extension,
+            "skipped_decode_error": self.skipped_decode_error,
+            "skipped_unreadable": self.skipped_unreadable,
+            "cache_hits": self.cache_hits,
+            "bytes_scanned": self.bytes_scanned,
+            "findings": self.findings,
+            "wall_time_s": self.wall_time_s,
+            "patterns": [
+                {"pattern": source, "time_s": elapsed}
+                for source, elapsed in zip(_ALIAS_PATTERN_SOURCES, self.pattern_time_s)
+            ],
+            "slowest_files": [
+                {"path": path, "time_s": elapsed, "bytes": size} for path, elapsed, size in self.slowest_files
+            ],
+        }
+
+    def format_text(self) -> str:
+        lines = [
+            f"files visited:        {self.files_visited}",
+            f"files scanned:        {self.files_scanned}",
+            f"skipped (extension):  {self.skipped_extension}",
+            f"skipped (decode):     {self.skipped_decode_error}",
+            f"skipped (unreadable): {self.skipped_unreadable}",
+            f"cache hits:           {self.cache_hits}",
+            f"bytes scanned:        {self.bytes_scanned}",
+            f"findings:             {self.findings}",
+            f"wall time:            {self.wall_time_s:.3f}s",
+            "time per pattern:",
+        ]
+        for index, elapsed in enumerate(self.pattern_time_s):
+            lines.append(f"  [{index}] {elapsed:.4f}s  {_ALIAS_PATTERN_SOURCES[index][:60]}")
+        lines.append(f"slowest files (top {self.top_n}):")
+        for path, elapsed, size in self.slowest_files:
+            lines.append(f"  {elapsed * 1000:8.2f}ms {size:>10}B  {path}")
+        return "\n".join(lines)
+
+
+
+def _cache_version() -> str:
+    return f"{_CACHE_FORMAT_VERSION}-{_PATTERN_SET_VERSION}"
+
+
+
+class AliasScanCache:
+    """On-disk findings per file, keyed by size, mtime, content hash and pattern set.
+
+    A file whose size and mtime are unchanged is not read at all; otherwise it
+    is hashed and only rescanned when its content changed. Each entry keeps
+    the scan status, so a file that failed to decode is still reported as a
+    decode error on a hit. The whole cache is discarded when
+    ``_ALIAS_PATTERN_SOURCES`` or ``_CACHE_FORMAT_VERSION`` changes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == _cache_version():
+            files = payload.get("files")
+            if isinstance(files, dict):
+                self._entries = files
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, file_path: str, stat: os.stat_result) -> tuple[list[int], str] | None:
+        """``(lines, status)`` when size and mtime still match the cached entry."""
+        entry = self._entries.get(file_path)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return list(entry["lines"]), entry.get("status", _SCANNED)
+        return None
+
+    def digest(self, file_path: str) -> str | None:
+        entry = self._entries.get(file_path)
+        return entry.get("sha256") if entry else None
+
+    def lines(self, file_path: str) -> list[int]:
+        return list(self._entries[file_path]["lines"])
+
+    def status(self, file_path: str) -> str:
+        return self._entries[file_path].get("status", _SCANNED)
+
+    def store(
+        self, file_path: str, stat: os.stat_result, digest: str, lines: list[int], status: str = _SCANNED
+    ) -> None:
+        self._entries[file_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "lines": lines,
+            "status": status,
+        }
+        self._dirty = True
+
+    def retain(self, file_paths: Iterable[str]) -> None:
+        """Drop entries for files that no longer exist in a full scan."""
+        keep = set(file_paths)
+        stale = [file_path for file_path in self._entries if file_path not in keep]
+        for file_path in stale:
+            del self._entries[file_path]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": _cache_version(), "files": self._entries}, handle, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+
+def _resolve_jobs(jobs: int) -> int:
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+
+def _map_files(fn: Any, items: list[Any], jobs: int) -> Iterator[Any]:
+    if jobs == 1 or len(items) < 2:
+        yield from map(fn, items)
+        return
+    # A few chunks per worker keeps the pool balanced without per-file IPC.
+    chunksize = max(1, min(256, len(items) // (jobs * 8)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Yield results as they arrive while the pool is still alive.
+        yield from executor.map(fn, items, chunksize=chunksize)
+
+
+
+def _scan_files(
+    file_paths: Iterable[str], jobs: int, large_file_threshold: int, profile: bool
+) -> Iterator[tuple[str, _FileScan]]:
+    """Yield ``(path, scan)`` in input order, scanning on ``jobs`` processes when > 1."""
+    scan = functools.partial(_scan_job, large_file_threshold=large_file_threshold, profile=profile)
+    if jobs == 1:
+        for file_path in file_paths:
+            yield file_path, scan((file_path, None))
+        return
+
+    paths = list(file_paths)
+    yield from zip(paths, _map_files(scan, [(file_path, None) for file_path in paths], jobs))
+
+
+
+def _scan_files_cached(
+    file_paths: Iterable[str], jobs: int, large_file_threshold: int, profile: bool, cache: AliasScanCache
+) -> Iterator[tuple[str, _FileScan]]:
+    paths = list(file_paths)
+    results: dict[str, _FileScan] = {}
+    pending: list[tuple[str, os.stat_result]] = []
+    for file_path in paths:
         try:
-            with open(file_path, "r", encoding="utf-8") as handle:
-                content = handle.read()
-                matched_lines: set[int] = set()
-                for pattern in _ALIAS_PATTERNS:
-                    for match in pattern.finditer(content):
-                        line_number = content.count("\n", 0, match.start()) + 1
-                        if line_number in matched_lines:
-                            continue
-                        matched_lines.add(line_number)
-                        findings.append((file_path, line_number))
-        except (OSError, UnicodeDecodeError):
+            stat = os.stat(file_path)
+        except OSError:
+            results[file_path] = _FileScan([], _UNREADABLE, 0, None, 0.0, None)
             continue
+        cached = cache.lookup(file_path, stat)
+        if cached is not None:
+            lines, status = cached
+            status = _DECODE_ERROR if status == _DECODE_ERROR else _UNCHANGED
+            results[file_path] = _FileScan(lines, status, stat.st_size, None, 0.0, None)
+        else:
+            pending.append((file_path, stat))
+
+    jobs_in = [(file_path, cache.digest(file_path)) for file_path, _ in pending]
+    scan = functools.partial(
+        _scan_job, hashed=True, large_file_threshold=large_file_threshold, profile=profile
+    )
+    for (file_path, stat), result in zip(pending, _map_files(scan, jobs_in, jobs)):
+        if result.status == _UNREADABLE:
+            results[file_path] = result
+            continue
+        if result.lines is None:
+            lines, status = cache.lines(file_path), cache.status(file_path)
+        else:
+            lines, status = result.lines, result.status
+        cache.store(file_path, stat, result.digest or "", lines, status)
+        if status == _DECODE_ERROR:
+            result = result._replace(status=_DECODE_ERROR)
+        results[file_path] = result._replace(lines=lines)
+
+    for file_path in paths:
+        yield file_path, results[file_path]
+
+
+
+def scan_repo_for_alias_paths(
+    root_dir: str,
+    *,
+    jobs: int = 1,
+    cache_path: str | None = None,
+    paths: Iterable[str] | None = None,
+    large_file_threshold: int = LARGE_FILE_THRESHOLD,
+    stats: ScanStats | None = None,
+) -> list[tuple[str, int]]:
+    """Scan text files under ``root_dir`` for alias path usage.
+
+    ``jobs > 1`` shards files across a process pool (``jobs <= 0`` uses every
+    CPU); findings keep the serial scan's order either way. ``cache_path``
+    enables the persistent ``AliasScanCache``. ``paths`` restricts the scan to
+    those files (relative to ``root_dir`` unless absolute) instead of walking
+    the tree. Files of ``large_file_threshold`` bytes or more are scanned as
+    bytes through ``mmap`` (or overlapping chunks) instead of being read whole.
+    A ``ScanStats`` passed as ``stats`` is filled in as files are scanned.
+    The cache file itself is never scanned.
+    """
+    started = time.perf_counter()
+    if paths is None:
+        file_paths = list(_iter_text_files(root_dir, stats))
+    else:
+        file_paths = []
+        for path in dict.fromkeys(paths):
+            file_path = path if os.path.isabs(path) else os.path.join(root_dir, path)
+            if stats is not None:
+                stats.files_visited += 1
+            if not _has_allowed_ext(file_path):
+                if stats is not None:
+                    stats.skipped_extension += 1
+            elif os.path.isfile(file_path):
+                file_paths.append(file_path)
+            elif stats is not None:
+                stats.skipped_unreadable += 1
+
+    if cache_path:
+        cache_file = os.path.realpath(cache_path)
+        file_paths = [file_path for file_path in file_paths if os.path.realpath(file_path) != cache_file]
+    cache = AliasScanCache(cache_path) if cache_path else None
+    resolved_jobs = _resolve_jobs(jobs)
+    profile = stats is not None
+    if cache is None:
+        scanned = _scan_files(file_paths, resolved_jobs, large_file_threshold, profile)
+    else:
+        scanned = _scan_files_cached(file_paths, resolved_jobs, large_file_threshold, profile, cache)
+
+    findings: list[tuple[str, int]] = []
+    for file_path, scan in scanned:
+        findings.extend((file_path, line_number) for line_number in scan.lines or ())
+        if stats is not None:
+            stats.record(file_path, scan)
+
+    if cache is not None:
+        if paths is None:
+            cache.retain(file_paths)
+        cache.save()
+    if stats is not None:
+        stats.findings += len(findings)
+        stats.wall_time_s += time.perf_counter() - started
     return findings
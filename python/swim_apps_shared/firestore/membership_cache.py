@@ -0,0 +1,210 @@
+"""Read-through TTL/LRU cache of club membership for permission checks."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping
+
+from swim_apps_shared.domain.models import ClubMember, MemberRole
+from swim_apps_shared.firestore.compat import DEPRECATION_REMOVE_AFTER, load_club_members
+
+MembershipLoader = Callable[[Any, str], tuple[list[ClubMember], bool]]
+
+# Alias-path results may be cached up to the end of the removal date (UTC).
+ALIAS_CACHE_DEADLINE = (
+    datetime.fromisoformat(DEPRECATION_REMOVE_AFTER).replace(tzinfo=timezone.utc) + timedelta(days=1)
+).timestamp()
+
+
+@dataclass(frozen=True, slots=True)
+class ClubMembership:
+    """One club's members indexed by uid and by role."""
+
+    club_id: str
+    by_uid: Mapping[str, ClubMember]
+    by_role: Mapping[str, frozenset[str]]
+    from_alias: bool
+
+    @staticmethod
+    def from_members(club_id: str, members: Iterable[ClubMember], *, from_alias: bool = False) -> "ClubMembership":
+        by_uid: dict[str, ClubMember] = {}
+        for member in members:
+            if member.uid:
+                by_uid[member.uid] = member
+        by_role: dict[str, set[str]] = {}
+        for uid, member in by_uid.items():
+            by_role.setdefault(member.role, set()).add(uid)
+        return ClubMembership(
+            club_id=club_id,
+            by_uid=MappingProxyType(by_uid),
+            by_role=MappingProxyType({role: frozenset(uids) for role, uids in by_role.items()}),
+            from_alias=from_alias,
+        )
+
+    def member(self, uid: str) -> ClubMember | None:
+        return self.by_uid.get(uid)
+
+    def has_role(self, uid: str, *roles: MemberRole) -> bool:
+        return any(uid in self.by_role.get(role, ()) for role in roles)
+
+    def uids_with_role(self, role: MemberRole) -> frozenset[str]:
+        return self.by_role.get(role, frozenset())
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    membership: ClubMembership
+    expires_at: float
+    stale_uids: set[str] = field(default_factory=set)
+
+
+class ClubMembershipCache:
+    """Caches ``ClubMembership`` per club_id with a TTL and LRU bound.
+
+    Results that came from the legacy alias path never outlive
+    ``DEPRECATION_REMOVE_AFTER``; once that date has passed they are not
+    cached at all. ``invalidate(club_id, uid)`` marks a single uid stale so
+    only lookups touching it reload the club.
+
+    Every ``invalidate`` bumps the club's generation (and ``clear`` the
+    cache-wide epoch); a load that started under an older generation still
+    answers its caller but is not stored, so a revoked role cannot be cached
+    by a read that raced the invalidation.
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        *,
+        ttl_s: float = 60.0,
+        max_entries: int = 1024,
+        loader: MembershipLoader = load_club_members,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        if ttl_s <= 0:
+            raise ValueError("ttl_s must be > 0")
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self._db = db
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+        self._loader = loader
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _generation(self, club_id: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(club_id, 0)
+
+    def _cached(self, club_id: str, uid: str | None) -> tuple[ClubMembership | None, tuple[int, int]]:
+        """The cached membership, or None, plus the generation a load on a miss must store under."""
+        with self._lock:
+            generation = self._generation(club_id)
+            entry = self._entries.get(club_id)
+            if entry is None:
+                self._stats.misses += 1
+                return None, generation
+            if self._clock() >= entry.expires_at:
+                del self._entries[club_id]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None, generation
+            if entry.stale_uids and (uid is None or uid in entry.stale_uids):
+                self._stats.misses += 1
+                return None, generation
+            self._entries.move_to_end(club_id)
+            self._stats.hits += 1
+            return entry.membership, generation
+
+    def _expiry(self, from_alias: bool) -> float | None:
+        now = self._clock()
+        expires_at = now + self._ttl_s
+        if from_alias:
+            remaining = ALIAS_CACHE_DEADLINE - self._wall_clock()
+            if remaining <= 0:
+                return None
+            expires_at = min(expires_at, now + remaining)
+        return expires_at
+
+    def _store(self, membership: ClubMembership, generation: tuple[int, int]) -> None:
+        expires_at = self._expiry(membership.from_alias)
+        with self._lock:
+            if self._generation(membership.club_id) != generation:
+                # Invalidated while loading: the result may predate the change.
+                return
+            if expires_at is None:
+                self._entries.pop(membership.club_id, None)
+                return
+            self._entries[membership.club_id] = _Entry(membership, expires_at)
+            self._entries.move_to_end(membership.club_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def _get(self, club_id: str, uid: str | None) -> ClubMembership:
+        cached, generation = self._cached(club_id, uid)
+        if cached is not None:
+            return cached
+        members, from_alias = self._loader(self._db, club_id)
+        membership = ClubMembership.from_members(club_id, members, from_alias=from_alias)
+        self._store(membership, generation)
+        return membership
+
+    def get(self, club_id: str) -> ClubMembership:
+        return self._get(club_id, None)
+
+    def member(self, club_id: str, uid: str) -> ClubMember | None:
+        return self._get(club_id, uid).member(uid)
+
+    def has_role(self, club_id: str, uid: str, *roles: MemberRole) -> bool:
+        return self._get(club_id, uid).has_role(uid, *roles)
+
+    def uids_with_role(self, club_id: str, role: MemberRole) -> frozenset[str]:
+        return self._get(club_id, None).uids_with_role(role)
+
+    def invalidate(self, club_id: str, uid: str | None = None) -> None:
+        """Drop a club's entry, or with ``uid`` mark just that member as stale."""
+        with self._lock:
+            self._generations[club_id] = self._generations.get(club_id, 0) + 1
+            entry = self._entries.get(club_id)
+            if entry is None:
+                return
+            self._stats.invalidations += 1
+            if uid is None:
+                del self._entries[club_id]
+            else:
+                entry.stale_uids.add(uid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
@@ -0,0 +1,156 @@
+"""Load the member lists of many clubs concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from swim_apps_shared.domain.models import ClubMember
+from swim_apps_shared.firestore import aio
+from swim_apps_shared.firestore.aio import is_async_client
+from swim_apps_shared.firestore.compat import get_club_members
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class ClubLoadResult:
+    club_id: str
+    members: list[ClubMember] | None
+    error: Exception | None
+    elapsed_s: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class MultiClubMembers:
+    """Per-club outcomes of a fan-out load, in the order the club ids were given."""
+
+    results: dict[str, ClubLoadResult]
+    wall_time_s: float
+    max_workers: int
+    timing: dict[str, float] = field(init=False)
+
+    def __post_init__(self) -> None:
+        elapsed = [result.elapsed_s for result in self.results.values()]
+        timing = {"wall_s": self.wall_time_s}
+        if elapsed:
+            timing.update(
+                {
+                    "sum_s": sum(elapsed),
+                    "min_s": min(elapsed),
+                    "max_s": max(elapsed),
+                    "mean_s": statistics.fmean(elapsed),
+                    "p50_s": statistics.median(elapsed),
+                }
+            )
+        object.__setattr__(self, "timing", timing)
+
+    @property
+    def members(self) -> dict[str, list[ClubMember]]:
+        return {club_id: result.members for club_id, result in self.results.items() if result.members is not None}
+
+    @property
+    def errors(self) -> dict[str, Exception]:
+        return {club_id: result.error for club_id, result in self.results.items() if result.error is not None}
+
+
+
+def _unique(club_ids: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(club_ids))
+
+
+
+def _load_one(db: Any, club_id: str) -> ClubLoadResult:
+    start = time.perf_counter()
+    try:
+        members = get_club_members(db, club_id)
+    except Exception as exc:  # noqa: BLE001 - reported per club
+        return ClubLoadResult(club_id, None, exc, time.perf_counter() - start)
+    return ClubLoadResult(club_id, members, None, time.perf_counter() - start)
+
+
+
+def get_members_for_clubs(
+    db: Any,
+    club_ids: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    is_async: bool | None = None,
+) -> MultiClubMembers:
+    """Load every club's members over a bounded thread pool.
+
+    A failing club is reported in ``errors`` without aborting the others. For an
+    ``AsyncClient`` this runs ``get_members_for_clubs_async`` on a fresh event
+    loop; inside a running loop, await that coroutine instead. ``is_async``
+    overrides client detection, e.g. for wrapped clients.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    unique_ids = _unique(club_ids)
+
+    use_async = is_async_client(db) if is_async is None else is_async
+    if use_async:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(
+                get_members_for_clubs_async(db, unique_ids, max_workers=max_workers, is_async=True)
+            )
+        raise RuntimeError("AsyncClient used inside a running event loop; await get_members_for_clubs_async")
+
+    start = time.perf_counter()
+    workers = max(1, min(max_workers, len(unique_ids)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="club-members") as executor:
+        loaded = list(executor.map(lambda club_id: _load_one(db, club_id), unique_ids))
+    return MultiClubMembers(
+        results={result.club_id: result for result in loaded},
+        wall_time_s=time.perf_counter() - start,
+        max_workers=workers,
+    )
+
+
+
+async def get_members_for_clubs_async(
+    db: Any,
+    club_ids: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    is_async: bool | None = None,
+) -> MultiClubMembers:
+    """Async counterpart of ``get_members_for_clubs`` with at most ``max_workers`` loads in flight.
+
+    ``AsyncClient`` streams are consumed natively; a sync client is driven
+    through ``asyncio.to_thread``. ``is_async`` overrides client detection.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    unique_ids = _unique(club_ids)
+    use_async = is_async_client(db) if is_async is None else is_async
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def load(club_id: str) -> ClubLoadResult:
+        async with semaphore:
+            if not use_async:
+                return await asyncio.to_thread(_load_one, db, club_id)
+            started = time.perf_counter()
+            try:
+                members = await aio.get_club_members(db, club_id)
+            except Exception as exc:  # noqa: BLE001 - reported per club
+                return ClubLoadResult(club_id, None, exc, time.perf_counter() - started)
+            return ClubLoadResult(club_id, members, None, time.perf_counter() - started)
+
+    start = time.perf_counter()
+    loaded = await asyncio.gather(*(load(club_id) for club_id in unique_ids))
+    return MultiClubMembers(
+        results={result.club_id: result for result in loaded},
+        wall_time_s=time.perf_counter() - start,
+        max_workers=max_workers,
+    )
@@ -1,23 +1,90 @@
 from __future__ import annotations
 
-from typing import Any
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Callable, Hashable
 
 USERS_COLLECTION = "users"
 CLUBS_COLLECTION = "swimClubs"
 MEMBERS_SUBCOLLECTION = "members"
 GROUPS_SUBCOLLECTION = "groups"
 
+CLUB_PATHS_CACHE_SIZE = 1024
+REF_CACHE_SIZE = 256
+
+# Optional memo of raw id -> validated id; see configure_id_cache().
+_ID_CACHE: dict[str, str] | None = None
+_ID_CACHE_MAXSIZE = 0
+
+
+
+def configure_id_cache(maxsize: int | None) -> None:
+    """Enable a bounded cache of validated ids (``maxsize > 0``) or disable it (``None``/``0``)."""
+    global _ID_CACHE, _ID_CACHE_MAXSIZE
+    if maxsize:
+        _ID_CACHE, _ID_CACHE_MAXSIZE = {}, maxsize
+    else:
+        _ID_CACHE, _ID_CACHE_MAXSIZE = None, 0
+
 
 
 def _required_id(value: str, field_name: str) -> str:
+    cache = _ID_CACHE
+    if cache is not None and type(value) is str:
+        cached = cache.get(value)
+        if cached is not None:
+            return cached
+
     normalized = str(value or "").strip()
     if not normalized:
         raise ValueError(f"{field_name} must be a non-empty string")
     if "/" in normalized:
         raise ValueError(f"{field_name} must not contain '/'")
+
+    if cache is not None and type(value) is str:
+        if len(cache) >= _ID_CACHE_MAXSIZE:
+            cache.clear()
+        cache[value] = normalized
     return normalized
 
 
+class ClubPaths:
+    """Path builder for one club: ``club_id`` is validated once and prefixes are precomputed."""
+
+    __slots__ = ("club_id", "doc", "members_col", "groups_col", "_member_prefix", "_group_prefix")
+
+    def __init__(self, club_id: str):
+        self.club_id = _required_id(club_id, "club_id")
+        self.doc = f"{CLUBS_COLLECTION}/{self.club_id}"
+        self.members_col = f"{self.doc}/{MEMBERS_SUBCOLLECTION}"
+        self.groups_col = f"{self.doc}/{GROUPS_SUBCOLLECTION}"
+        self._member_prefix = f"{self.members_col}/"
+        self._group_prefix = f"{self.groups_col}/"
+
+    def __repr__(self) -> str:
+        return f"ClubPaths({self.club_id!r})"
+
+    def member_doc(self, uid: str) -> str:
+        return self._member_prefix + _required_id(uid, "uid")
+
+    def group_doc(self, group_id: str) -> str:
+        return self._group_prefix + _required_id(group_id, "group_id")
+
+
+
+@lru_cache(maxsize=CLUB_PATHS_CACHE_SIZE)
+def _cached_club_paths(club_id: str) -> ClubPaths:
+    return ClubPaths(club_id)
+
+
+
+def club_paths(club_id: str) -> ClubPaths:
+    # Cache on the validated id: raw values that merely hash equal (True, 1.0)
+    # must not share an entry, and unhashable ids still go through validation.
+    return _cached_club_paths(_required_id(club_id, "club_id"))
+
+
 
 def user_doc(uid: str) -> str:
     return f"{USERS_COLLECTION}/{_required_id(uid, 'uid')}"
@@ -25,27 +92,27 @@ def user_doc(uid: str) -> str:
 
 
 def club_doc(club_id: str) -> str:
-    return f"{CLUBS_COLLECTION}/{_required_id(club_id, 'club_id')}"
+    return club_paths(club_id).doc
 
 
 
 def club_members_col(club_id: str) -> str:
-    return f"{club_doc(club_id)}/{MEMBERS_SUBCOLLECTION}"
+    return club_paths(club_id).members_col
 
 
 
 def club_member_doc(club_id: str, uid: str) -> str:
-    return f"{club_members_col(club_id)}/{_required_id(uid, 'uid')}"
+    return club_paths(club_id).member_doc(uid)
 
 
 
 def groups_col(club_id: str) -> str:
-    return f"{club_doc(club_id)}/{GROUPS_SUBCOLLECTION}"
+    return club_paths(club_id).groups_col
 
 
 
 def group_doc(club_id: str, group_id: str) -> str:
-    return f"{groups_col(club_id)}/{_required_id(group_id, 'group_id')}"
+    return club_paths(club_id).group_doc(group_id)
 
 
 
@@ -71,3 +138,77 @@ def groups_ref(db: Any, club_id: str):
 
 def group_ref(db: Any, club_id: str, group_id: str):
     return groups_ref(db, club_id).document(_required_id(group_id, "group_id"))
+
+
+
+class RefCache:
+    """Opt-in, bounded cache of client-side references for a single Firestore client.
+
+    Only a weak reference to ``db`` is held. References built by the real
+    client point back to it, so keep the cache alongside the client (not in a
+    module global) and both are released together. Hits are lock-free; when the
+    cache is full the oldest entry is evicted.
+    """
+
+    __slots__ = ("_client_ref", "_maxsize", "_refs", "_lock", "__weakref__")
+
+    def __init__(self, db: Any, *, maxsize: int = REF_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self._client_ref = weakref.ref(db)
+        self._maxsize = maxsize
+        self._refs: dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def _client(self) -> Any:
+        db = self._client_ref()
+        if db is None:
+            raise ReferenceError("Firestore client of this RefCache was garbage collected")
+        return db
+
+    def _store(self, key: Hashable, build: Callable[[Any], Any]) -> Any:
+        ref = build(self._client())
+        with self._lock:
+            refs = self._refs
+            if key not in refs and len(refs) >= self._maxsize:
+                refs.pop(next(iter(refs)), None)
+            refs[key] = ref
+        return ref
+
+    def clear(self) -> None:
+        with self._lock:
+            self._refs.clear()
+
+    def user_ref(self, uid: str):
+        key = ("user", uid)
+        ref = self._refs.get(key)
+        return ref if ref is not None else self._store(key, lambda db: user_ref(db, uid))
+
+    def club_members_ref(self, club_id: str):
+        key = ("members", club_id)
+        ref = self._refs.get(key)
+        return ref if ref is not None else self._store(key, lambda db: club_members_ref(db, club_id))
+
+    def club_member_ref(self, club_id: str, uid: str):
+        key = ("member", club_id, uid)
+        ref = self._refs.get(key)
+        if ref is not None:
+            return ref
+        members_ref = self.club_members_ref(club_id)
+        return self._store(key, lambda db: members_ref.document(_required_id(uid, "uid")))
+
+    def groups_ref(self, club_id: str):
+        key = ("groups", club_id)
+        ref = self._refs.get(key)
+        return ref if ref is not None else self._store(key, lambda db: groups_ref(db, club_id))
+
+    def group_ref(self, club_id: str, group_id: str):
+        key = ("group", club_id, group_id)
+        ref = self._refs.get(key)
+        if ref is not None:
+            return ref
+        collection_ref = self.groups_ref(club_id)
+        return self._store(key, lambda db: collection_ref.document(_required_id(group_id, "group_id")))
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from swim_apps_shared.firestore import aio
+
+
+class _FakeDoc:
+    def __init__(self, doc_id: str, data: dict):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _AsyncFakeCollection:
+    def __init__(self, db: "_AsyncFakeDB", path: str):
+        self._db = db
+        self._path = path
+
+    def document(self, doc_id: str):
+        return _AsyncFakeDocument(self._db, f"{self._path}/{doc_id}")
+
+    async def stream(self):
+        prefix = f"{self._path}/"
+        for key, value in list(self._db.store.items()):
+            if not key.startswith(prefix) or "/" in key[len(prefix) :]:
+                continue
+            await asyncio.sleep(0)
+            self._db.produced += 1
+            yield _FakeDoc(key[len(prefix) :], value)
+
+
+class _AsyncFakeDocument:
+    def __init__(self, db: "_AsyncFakeDB", path: str):
+        self._db = db
+        self.path = path
+
+    def collection(self, name: str):
+        return _AsyncFakeCollection(self._db, f"{self.path}/{name}")
+
+    async def get(self):
+        raise NotImplementedError
+
+
+class _AsyncFakeDB:
+    """In-process stand-in for ``google.cloud.firestore.AsyncClient``."""
+
+    def __init__(self, store: dict[str, dict]):
+        self.store = store
+        self.produced = 0
+
+    def collection(self, name: str):
+        return _AsyncFakeCollection(self, name)
+
+    def document(self, path: str):
+        return _AsyncFakeDocument(self, path)
+
+
+def test_get_club_members_prefers_members_collection():
+    db = _AsyncFakeDB(
+        {
+            "swimClubs/club1/members/user1": {
+                "role": "coach",
+                "status": "active",
+                "joinedAt": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            },
+            "swimClubs/club1/users/legacy": {"uid": "legacy", "role": "swimmer"},
+        }
+    )
+
+    members = asyncio.run(aio.get_club_members(db, "club1"))
+
+    assert [member.uid for member in members] == ["user1"]
+    assert members[0].role == "coach"
+
+
+def test_get_club_members_falls_back_to_alias_users(caplog):
+    db = _AsyncFakeDB({"swimClubs/club1/users/legacy1": {"role": "clubadmin", "status": "pending"}})
+
+    members = asyncio.run(aio.get_club_members(db, "club1"))
+
+    assert [(member.uid, member.role, member.status) for member in members] == [("legacy1", "admin", "inactive")]
+    assert "legacy alias" in caplog.text.lower()
+
+
+def test_iter_club_members_streams_lazily():
+    db = _AsyncFakeDB({f"swimClubs/club1/members/user{i}": {"role": "swimmer"} for i in range(50)})
+
+    async def first_two():
+        members = aio.iter_club_members(db, "club1")
+        first = await members.__anext__()
+        second = await members.__anext__()
+        await members.aclose()
+        return first, second
+
+    first, second = asyncio.run(first_two())
+
+    assert (first.uid, second.uid) == ("user0", "user1")
+    assert db.produced == 2
+
+
+def test_async_references_and_client_detection(monkeypatch):
+    db = _AsyncFakeDB({})
+
+    # Only a real AsyncClient is detected; doubles with coroutine methods are not.
+    assert not aio.is_async_client(db)
+    monkeypatch.setattr(aio, "_AsyncClient", _AsyncFakeDB)
+    assert aio.is_async_client(db)
+    assert not aio.is_async_client(object())
+    assert aio.club_members_ref(db, "club1")._path == "swimClubs/club1/members"
+    assert aio.club_member_ref(db, "club1", "u1").path == "swimClubs/club1/members/u1"
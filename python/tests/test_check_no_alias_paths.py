@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import subprocess
+import sys
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[2]
+SCRIPT = REPO_ROOT / "scripts" / "check_no_alias_paths.py"
+
+
+def _run(*args: str, cwd: pathlib.Path) -> subprocess.CompletedProcess[str]:
+    return subprocess.run([sys.executable, str(SCRIPT), *args], cwd=cwd, capture_output=True, text=True)
+
+
+def test_file_arguments_resolve_against_the_current_directory():
+    result = _run("tests/test_guards.py", "--stats", "json", cwd=REPO_ROOT / "python")
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stderr)["files_scanned"] == 1
+
+
+def test_missing_file_argument_fails():
+    result = _run("python/tests/no_such_file.py", cwd=REPO_ROOT)
+
+    assert result.returncode == 2
+    assert "no_such_file.py: no such file" in result.stderr
+    assert "No forbidden alias paths detected" not in result.stdout
+
+
+def test_file_argument_outside_the_repository_fails(tmp_path: pathlib.Path):
+    outside = tmp_path / "unsafe.py"
+    outside.write_text('path = "clubs/c1/users/alias"\n', encoding="utf-8")
+
+    result = _run(str(outside), cwd=REPO_ROOT)
+
+    assert result.returncode == 2
+    assert "outside the repository" in result.stderr
@@ -2,16 +2,22 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from swim_apps_shared.firestore.compat import get_club_members
+from swim_apps_shared.firestore.compat import (
+    get_club_member,
+    get_club_members,
+    get_club_members_by_uid,
+    iter_club_members,
+)
 
 
 class _FakeDoc:
-    def __init__(self, doc_id: str, data: dict):
+    def __init__(self, doc_id: str, data: dict | None):
         self.id = doc_id
         self._data = data
+        self.exists = data is not None
 
     def to_dict(self):
-        return dict(self._data)
+        return None if self._data is None else dict(self._data)
 
 
 class _FakeCollection:
@@ -32,6 +38,22 @@ class _FakeCollection:
                 continue
             yield _FakeDoc(suffix, value)
 
+    def where(self, field: str, op: str, values: list[str]):
+        assert op == "in" and len(values) <= 30
+        return _FakeQuery(self, field, values)
+
+
+class _FakeQuery:
+    def __init__(self, collection: _FakeCollection, field: str, values: list[str]):
+        self._collection = collection
+        self._field = field
+        self._values = values
+
+    def stream(self):
+        for doc in self._collection.stream():
+            if doc.to_dict().get(self._field) in self._values:
+                yield doc
+
 
 class _FakeDocument:
     def __init__(self, store: dict[str, dict], path: str):
@@ -41,6 +63,9 @@ class _FakeDocument:
     def collection(self, name: str):
         return _FakeCollection(self._store, f"{self._path}/{name}")
 
+    def get(self):
+        return _FakeDoc(self._path.rsplit("/", 1)[-1], self._store.get(self._path))
+
 
 class _FakeDB:
     def __init__(self, store: dict[str, dict]):
@@ -97,3 +122,130 @@ def test_get_club_members_falls_back_to_alias_users(caplog):
     assert members[0].role == "admin"
     assert members[0].status == "inactive"
     assert "legacy alias" in caplog.text.lower()
+
+
+class _CountingFakeDB(_FakeDB):
+    """Fake DB whose collection streams record how many docs they produced."""
+
+    def __init__(self, store: dict[str, dict]):
+        super().__init__(store)
+        self.produced = 0
+
+    def collection(self, name: str):
+        return _CountingCollection(self, name)
+
+    def document(self, path: str):
+        return _CountingDocument(self, path)
+
+
+class _CountingCollection(_FakeCollection):
+    def __init__(self, db: _CountingFakeDB, path: str):
+        super().__init__(db._store, path)
+        self._db = db
+
+    def document(self, doc_id: str):
+        return _CountingDocument(self._db, f"{self._path}/{doc_id}")
+
+    def stream(self):
+        for doc in super().stream():
+            self._db.produced += 1
+            yield doc
+
+
+class _CountingDocument(_FakeDocument):
+    def __init__(self, db: _CountingFakeDB, path: str):
+        super().__init__(db._store, path)
+        self._db = db
+
+    def collection(self, name: str):
+        return _CountingCollection(self._db, f"{self._path}/{name}")
+
+
+def test_iter_club_members_streams_without_buffering():
+    db = _CountingFakeDB(
+        {f"swimClubs/club1/members/user{i}": {"role": "swimmer", "status": "active"} for i in range(1000)}
+    )
+
+    members = iter_club_members(db, "club1")
+    first = next(members)
+    second = next(members)
+
+    assert (first.uid, second.uid) == ("user0", "user1")
+    assert db.produced == 2
+    assert sum(1 for _ in members) == 998
+
+
+def test_iter_club_members_streams_alias_fallback(caplog):
+    db = _CountingFakeDB(
+        {f"swimClubs/club1/users/legacy{i}": {"role": "coach", "status": "active"} for i in range(100)}
+    )
+
+    members = iter_club_members(db, "club1")
+    first = next(members)
+
+    assert first.uid == "legacy0"
+    assert first.role == "coach"
+    assert db.produced == 1
+    assert "legacy alias" in caplog.text.lower()
+
+
+class _BatchingFakeDB(_FakeDB):
+    def __init__(self, store: dict[str, dict]):
+        super().__init__(store)
+        self.batches: list[int] = []
+
+    def get_all(self, refs):
+        refs = list(refs)
+        self.batches.append(len(refs))
+        for ref in reversed(refs):
+            yield ref.get()
+
+
+def test_get_club_members_by_uid_batches_reads_and_falls_back_per_uid(caplog):
+    db = _BatchingFakeDB(
+        {
+            "swimClubs/club1/members/u1": {"role": "coach", "status": "active"},
+            "swimClubs/club1/members/u2": {"role": "swimmer", "status": "active"},
+            "swimClubs/club1/users/u3": {"role": "owner", "status": "active"},
+            "swimClubs/club1/users/u2": {"role": "admin", "status": "active"},
+        }
+    )
+
+    members = get_club_members_by_uid(db, "club1", ["u3", "u1", "missing", "u2", "u1"])
+
+    assert list(members) == ["u3", "u1", "u2"]
+    assert members["u1"].role == "coach"
+    assert members["u2"].role == "swimmer"
+    assert members["u3"].role == "admin"
+    assert db.batches == [4, 2]
+    assert "legacy alias" in caplog.text.lower()
+
+
+def test_get_club_member_uses_direct_document_get(caplog):
+    db = _FakeDB({"swimClubs/club1/members/u1": {"role": "coach", "status": "active"}})
+
+    assert get_club_member(db, "club1", " u1 ").role == "coach"
+    assert get_club_member(db, "club1", "nobody") is None
+    assert "legacy alias" not in caplog.text.lower()
+
+
+def test_get_club_members_by_uid_finds_alias_docs_keyed_by_other_ids(caplog):
+    store = {
+        "swimClubs/club1/users/auto1": {"uid": "u1", "role": "coach", "status": "active"},
+        "swimClubs/club1/users/auto2": {"userId": "u2", "role": "owner", "status": "active"},
+        "swimClubs/club1/users/u3": {"uid": "other", "role": "coach", "status": "active"},
+    }
+    store.update(
+        {f"swimClubs/club1/users/auto-x{i}": {"uid": f"x{i}", "status": "active"} for i in range(40)}
+    )
+    db = _FakeDB(store)
+    uids = ["u1", "u2", "u3", *(f"x{i}" for i in range(40))]
+
+    members = get_club_members_by_uid(db, "club1", uids)
+    streamed = {member.uid: member for member in get_club_members(db, "club1")}
+
+    assert list(members) == ["u1", "u2", *(f"x{i}" for i in range(40))]
+    assert members["u1"].role == "coach"
+    assert members["u2"].role == "admin"
+    assert all((members[uid].role, members[uid].status) == (streamed[uid].role, streamed[uid].status) for uid in members)
+    assert "legacy alias" in caplog.text.lower()
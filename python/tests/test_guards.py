@@ -49,3 +49,291 @@ def test_scan_repo_for_alias_paths(tmp_path: pathlib.Path):
     findings = scan_repo_for_alias_paths(str(tmp_path))
     normalized = sorted((pathlib.Path(path).name, line) for path, line in findings)
     assert normalized == [("unsafe.py", 1), ("unsafe_builder.py", 2)]
+
+
+def _reference_alias_lines(content: str) -> list[int]:
+    # The original per-pattern scan, kept as an oracle for the combined engine.
+    from swim_apps_shared.firestore.guards import _ALIAS_PATTERNS
+
+    lines: list[int] = []
+    for pattern in _ALIAS_PATTERNS:
+        for match in pattern.finditer(content):
+            line_number = content.count("\n", 0, match.start()) + 1
+            if line_number not in lines:
+                lines.append(line_number)
+    return lines
+
+
+_FUZZ_TOKENS = [
+    "swimClubs/", "clubs/", "{clubId}", "{a b}", "c1", "/users", "/users/", "users", "/members",
+    "collection(", "'swimClubs'", '"clubs"', "CLUBS_COLLECTION", ")", ".document(", "club_id",
+    ".collection(", "'users'", '"users"', "document(", "club_doc(", " ", "\n", " ", "'", "`", "}",
+]
+
+
+def test_combined_engine_matches_per_pattern_scan():
+    import random
+
+    from swim_apps_shared.firestore.guards import _find_alias_lines
+
+    rng = random.Random(1234)
+    for _ in range(3000):
+        content = "".join(rng.choice(_FUZZ_TOKENS) for _ in range(rng.randint(0, 40)))
+        assert _find_alias_lines(content) == _reference_alias_lines(content), content
+
+
+def test_scan_repo_for_alias_paths_parallel_matches_serial(tmp_path: pathlib.Path):
+    for index in range(40):
+        folder = tmp_path / f"pkg{index % 4}"
+        folder.mkdir(exist_ok=True)
+        body = "ok = 1\n" * (index % 5)
+        if index % 3 == 0:
+            body += 'path = "clubs/{clubId}/users/alias"\n'
+        (folder / f"mod{index}.py").write_text(body, encoding="utf-8")
+
+    serial = scan_repo_for_alias_paths(str(tmp_path))
+    parallel = scan_repo_for_alias_paths(str(tmp_path), jobs=2)
+
+    assert len(serial) == 14
+    assert parallel == serial
+
+
+def test_scan_cache_reuses_findings_for_unchanged_files(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    from swim_apps_shared.firestore import guards
+
+    src = tmp_path / "src"
+    src.mkdir()
+    unsafe = src / "unsafe.py"
+    unsafe.write_text('path = "swimClubs/club1/users/alias"\n', encoding="utf-8")
+    (src / "safe.py").write_text("ok = 1\n", encoding="utf-8")
+    cache_path = str(tmp_path / "cache.json")
+
+    first = scan_repo_for_alias_paths(str(src), cache_path=cache_path)
+
+    scanned: list[str] = []
+    original = guards._find_alias_lines
+    monkeypatch.setattr(guards, "_find_alias_lines", lambda content: scanned.append(content) or original(content))
+
+    assert scan_repo_for_alias_paths(str(src), cache_path=cache_path) == first
+    assert scanned == []
+
+    unsafe.write_text('ok = 2\npath = "swimClubs/club1/users/alias"\n', encoding="utf-8")
+    second = scan_repo_for_alias_paths(str(src), cache_path=cache_path)
+    assert [(pathlib.Path(path).name, line) for path, line in second] == [("unsafe.py", 2)]
+    assert len(scanned) == 1
+
+
+def test_scan_never_reads_its_own_cache_file(tmp_path: pathlib.Path):
+    import json
+
+    cache_path = tmp_path / "cache.json"
+    cache_path.write_text(json.dumps({"note": "clubs/c1/users/alias"}), encoding="utf-8")
+    (tmp_path / "unsafe.py").write_text('path = "clubs/c1/users/alias"\n', encoding="utf-8")
+
+    for _ in range(2):
+        findings = scan_repo_for_alias_paths(str(tmp_path), cache_path=str(cache_path))
+        assert [pathlib.Path(path).name for path, _ in findings] == ["unsafe.py"]
+
+
+def test_scan_cache_keeps_decode_errors(tmp_path: pathlib.Path):
+    from swim_apps_shared.firestore.guards import ScanStats
+
+    (tmp_path / "latin1.txt").write_bytes(b"caf\xe9\n")
+    cache_path = str(tmp_path / "cache.json")
+
+    for _ in range(2):
+        stats = ScanStats()
+        assert scan_repo_for_alias_paths(str(tmp_path), cache_path=cache_path, stats=stats) == []
+        assert (stats.skipped_decode_error, stats.cache_hits) == (1, 0)
+
+
+def test_parallel_map_streams_results_lazily():
+    import inspect
+
+    from swim_apps_shared.firestore import guards
+
+    results = guards._map_files(abs, [-1, -2, -3], 2)
+    assert inspect.isgenerator(results)
+    assert next(results) == 1
+    assert list(results) == [2, 3]
+
+
+def test_scan_cache_is_discarded_when_patterns_change(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    from swim_apps_shared.firestore import guards
+
+    (tmp_path / "unsafe.py").write_text('path = "clubs/c1/users/alias"\n', encoding="utf-8")
+    cache_path = str(tmp_path / "cache.json")
+    scan_repo_for_alias_paths(str(tmp_path), paths=["unsafe.py"], cache_path=cache_path)
+    assert len(guards.AliasScanCache(cache_path)) == 1
+
+    monkeypatch.setattr(guards, "_PATTERN_SET_VERSION", "changed")
+    assert len(guards.AliasScanCache(cache_path)) == 0
+
+
+def test_scan_repo_for_alias_paths_limited_to_given_paths(tmp_path: pathlib.Path):
+    for name in ("a.py", "b.py", "c.bin"):
+        (tmp_path / name).write_text('path = "clubs/c1/users/alias"\n', encoding="utf-8")
+
+    findings = scan_repo_for_alias_paths(str(tmp_path), paths=["b.py", "c.bin", "missing.py"])
+
+    assert [(pathlib.Path(path).name, line) for path, line in findings] == [("b.py", 1)]
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_large_file_scan_matches_text_scan(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, use_mmap: bool
+):
+    import random
+
+    from swim_apps_shared.firestore import guards
+
+    if not use_mmap:
+        def _no_mmap(*args, **kwargs):
+            raise OSError("mmap unavailable")
+
+        monkeypatch.setattr(guards.mmap, "mmap", _no_mmap)
+        # Tiny chunks so most matches straddle a window boundary.
+        monkeypatch.setattr(guards, "_CHUNK_SIZE", 16)
+        monkeypatch.setattr(guards, "_CHUNK_OVERLAP", 512)
+
+    target = tmp_path / "big.json"
+    rng = random.Random(99)
+    for _ in range(300):
+        content = "".join(rng.choice(_FUZZ_TOKENS) for _ in range(rng.randint(0, 40)))
+        target.write_text(content, encoding="utf-8")
+        assert guards._scan_file(str(target), large_file_threshold=0) == _reference_alias_lines(content), content
+
+
+def test_chunked_scan_ignores_end_anchor_match_before_window_newline(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    from swim_apps_shared.firestore import guards
+
+    def _no_mmap(*args, **kwargs):
+        raise OSError("mmap unavailable")
+
+    monkeypatch.setattr(guards.mmap, "mmap", _no_mmap)
+    monkeypatch.setattr(guards, "_CHUNK_SIZE", 16)
+    monkeypatch.setattr(guards, "_CHUNK_OVERLAP", 16)
+    # The first 32-byte window ends right after "users\n", where ``$`` would match.
+    content = "x" * 10 + "clubs/aaaaaaaaa/users\n" + "more text here\n"
+    target = tmp_path / "boundary.txt"
+    target.write_text(content, encoding="utf-8")
+
+    assert guards._scan_file(str(target), large_file_threshold=0) == guards._find_alias_lines(content) == []
+
+
+# Overlaps stay longer than every snippet; longer matches are documented as unsupported.
+@pytest.mark.parametrize("chunk, overlap", [(16, 64), (7, 56), (64, 64)])
+def test_chunked_scan_handles_alias_paths_on_window_boundaries(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, chunk: int, overlap: int
+):
+    import random
+
+    from swim_apps_shared.firestore import guards
+
+    def _no_mmap(*args, **kwargs):
+        raise OSError("mmap unavailable")
+
+    monkeypatch.setattr(guards.mmap, "mmap", _no_mmap)
+    monkeypatch.setattr(guards, "_CHUNK_SIZE", chunk)
+    monkeypatch.setattr(guards, "_CHUNK_OVERLAP", overlap)
+
+    target = tmp_path / "boundary.txt"
+    snippets = [
+        "clubs/aaaaaaaaa/users\n",
+        'path = "clubs/c1/users/alias"\n',
+        "swimClubs/{clubId}/users\n",
+        'db.document(club_doc(club_id)).collection("users")\n',
+    ]
+    # Slide each snippet across the first window edges, then over many windows.
+    for snippet in snippets:
+        for pad in range(3 * chunk + overlap):
+            content = "x" * pad + snippet + "more text here\n"
+            target.write_text(content, encoding="utf-8")
+            assert guards._scan_file(str(target), large_file_threshold=0) == guards._find_alias_lines(content), content
+
+    rng = random.Random(7)
+    for _ in range(100):
+        content = "".join(rng.choice(_FUZZ_TOKENS) for _ in range(rng.randint(50, 200)))
+        target.write_text(content, encoding="utf-8")
+        assert guards._scan_file(str(target), large_file_threshold=0) == _reference_alias_lines(content), content
+
+
+def _disable_mmap(monkeypatch: pytest.MonkeyPatch, guards, chunk: int, overlap: int) -> None:
+    def _no_mmap(*args, **kwargs):
+        raise OSError("mmap unavailable")
+
+    monkeypatch.setattr(guards.mmap, "mmap", _no_mmap)
+    monkeypatch.setattr(guards, "_CHUNK_SIZE", chunk)
+    monkeypatch.setattr(guards, "_CHUNK_OVERLAP", overlap)
+
+
+@pytest.mark.parametrize("path_kind", ["text", "mmap", "chunked"])
+def test_scan_applies_universal_newlines(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, path_kind: str):
+    import random
+
+    from swim_apps_shared.firestore import guards
+
+    threshold = guards.LARGE_FILE_THRESHOLD if path_kind == "text" else 0
+    if path_kind == "chunked":
+        _disable_mmap(monkeypatch, guards, 7, 56)
+    target = tmp_path / "newlines.py"
+    # ``$`` must match before the line break, as it did for text-mode reads.
+    for newline in ("\r\n", "\r"):
+        content = f"a = 1{newline}b = 2{newline}ref = 'clubs/abc/users{newline}"
+        target.write_bytes(content.encode("utf-8"))
+        assert guards._scan_file(str(target), large_file_threshold=threshold) == [3], repr(content)
+
+    rng = random.Random(11)
+    tokens = _FUZZ_TOKENS + ["\r\n", "\r", "\r\r"]
+    for _ in range(200):
+        content = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 60)))
+        target.write_bytes(content.encode("utf-8"))
+        expected = _reference_alias_lines(content.replace("\r\n", "\n").replace("\r", "\n"))
+        assert guards._scan_file(str(target), large_file_threshold=threshold) == expected, repr(content)
+
+
+@pytest.mark.parametrize("path_kind", ["text", "mmap", "chunked"])
+def test_non_utf8_files_are_decode_errors_at_every_size(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, path_kind: str
+):
+    from swim_apps_shared.firestore import guards
+
+    threshold = guards.LARGE_FILE_THRESHOLD if path_kind == "text" else 0
+    if path_kind == "chunked":
+        _disable_mmap(monkeypatch, guards, 16, 64)
+    target = tmp_path / "latin1.txt"
+    target.write_bytes(b'path = "clubs/c1/users/alias"\n' * 4 + b"caf\xe9\n")
+
+    scan = guards._scan_job((str(target), None), large_file_threshold=threshold)
+
+    assert (scan.lines, scan.status) == ([], guards._DECODE_ERROR)
+
+
+def test_scan_stats_counts_files_bytes_and_slowest(tmp_path: pathlib.Path):
+    import json
+
+    from swim_apps_shared.firestore.guards import ScanStats
+
+    (tmp_path / "unsafe.py").write_text('path = "clubs/c1/users/alias"\n', encoding="utf-8")
+    (tmp_path / "safe.md").write_text("members only\n", encoding="utf-8")
+    (tmp_path / "latin1.txt").write_bytes(b"caf\xe9\n")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG")
+
+    stats = ScanStats(top_n=1)
+    findings = scan_repo_for_alias_paths(str(tmp_path), stats=stats)
+
+    assert len(findings) == 1
+    assert stats.files_visited == 4
+    assert stats.skipped_extension == 1
+    assert stats.skipped_decode_error == 1
+    assert stats.files_scanned == 2
+    assert stats.bytes_scanned == len('path = "clubs/c1/users/alias"\n') + len("members only\n")
+    assert stats.findings == 1
+    assert len(stats.slowest_files) == 1
+    assert sum(stats.pattern_time_s) > 0
+    report = json.loads(json.dumps(stats.to_dict()))
+    assert report["files_scanned"] == 2
+    assert len(report["patterns"]) == len(stats.pattern_time_s)
+    assert "files visited" in stats.format_text()
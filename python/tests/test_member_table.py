@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from swim_apps_shared.domain.member_table import MemberTable, MemberTableBuilder
+from swim_apps_shared.domain.models import ClubMember
+
+
+class _FakeDoc:
+    def __init__(self, doc_id: str, data: dict):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+_PAYLOADS = [
+    {"uid": "u1", "role": "coach", "status": "active", "groupId": "g1", "joinedAt": datetime(2026, 1, 5, tzinfo=timezone.utc)},
+    {"uid": "u2", "role": "swimmer", "status": "active", "groupId": "g1", "joinedAt": "2026-01-20T10:00:00Z"},
+    {"uid": "u3", "role": "swimmer", "status": "pending", "groupId": "g2", "registerDate": "2026-02-01T00:00:00Z"},
+    {"uid": "u4", "role": "owner", "status": "active", "joinedAt": "2026-02-10T00:00:00Z"},
+    {"uid": "u5", "role": "swimmer", "status": "active", "activeGroupId": "g2", "joinedAt": "2026-03-01T00:00:00Z"},
+]
+
+
+def _backends() -> list[bool]:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return [False]
+    return [False, True]
+
+
+@pytest.mark.parametrize("use_numpy", _backends())
+def test_member_table_filters_and_counts(use_numpy):
+    table = MemberTableBuilder().add_firestore_dicts(_PAYLOADS, club_id="club1").build(use_numpy=use_numpy)
+
+    assert len(table) == 5
+    assert table.count(role="swimmer", status="active") == 2
+    assert table.count(role="coach", club_id="other") == 0
+    assert table.count(group_id=None) == 1
+    assert table.count_by("group_id", role="swimmer", status="active") == {"g1": 1, "g2": 1}
+    assert table.count_by("role") == {"swimmer": 3, "coach": 1, "admin": 1}
+    assert table.count_by("joined_month") == {"2026-01": 2, "2026-02": 2, "2026-03": 1}
+    assert table.filter(status="inactive").uids == ["u3"]
+
+
+@pytest.mark.parametrize("use_numpy", _backends())
+def test_member_table_spans_clubs(use_numpy):
+    builder = MemberTableBuilder()
+    builder.add_documents([_FakeDoc(f"doc{i}", payload) for i, payload in enumerate(_PAYLOADS)], club_id="club1")
+    builder.add_documents([_FakeDoc("c2", {"role": "coach", "joinedAt": "2026-01-01T00:00:00Z"})], club_id="club2")
+    table = builder.build(use_numpy=use_numpy)
+
+    assert table.count_by("club_id", role="coach") == {"club1": 1, "club2": 1}
+    assert table.filter(club_id="club2").uids == ["c2"]
+
+
+def test_member_table_rows_match_club_member_decoding():
+    table = MemberTable.from_firestore_dicts(_PAYLOADS)
+
+    assert list(table.iter_members()) == ClubMember.from_firestore_dicts(_PAYLOADS)
+    assert list(MemberTable.from_members(table.iter_members()).iter_members()) == list(table.iter_members())
+
+
+def test_member_table_rejects_unknown_group_by_key():
+    with pytest.raises(ValueError):
+        MemberTable.from_firestore_dicts(_PAYLOADS).count_by("email")
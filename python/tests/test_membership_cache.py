@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from swim_apps_shared.domain.models import ClubMember
+from swim_apps_shared.firestore.membership_cache import ALIAS_CACHE_DEADLINE, ClubMembershipCache
+
+_JOINED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _Clock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Loader:
+    def __init__(self, *, from_alias: bool = False):
+        self.calls: list[str] = []
+        self.from_alias = from_alias
+        self.members: list[ClubMember] | None = None
+
+    def __call__(self, db, club_id: str):
+        self.calls.append(club_id)
+        members = self.members or [
+            ClubMember("coach1", "coach", None, "active", _JOINED),
+            ClubMember("admin1", "admin", None, "active", _JOINED),
+            ClubMember("swim1", "swimmer", "g1", "active", _JOINED),
+        ]
+        return members, self.from_alias
+
+
+def _cache(loader: _Loader, clock: _Clock, **kwargs) -> ClubMembershipCache:
+    return ClubMembershipCache(
+        object(), loader=loader, clock=clock, wall_clock=lambda: ALIAS_CACHE_DEADLINE - 3600, **kwargs
+    )
+
+
+def test_cache_serves_role_and_uid_lookups_from_one_load():
+    loader = _Loader()
+    cache = _cache(loader, _Clock())
+
+    assert cache.has_role("club1", "coach1", "coach", "admin")
+    assert not cache.has_role("club1", "swim1", "coach", "admin")
+    assert cache.member("club1", "swim1").group_id == "g1"
+    assert cache.uids_with_role("club1", "admin") == frozenset({"admin1"})
+    assert loader.calls == ["club1"]
+    assert (cache.stats.hits, cache.stats.misses) == (3, 1)
+
+
+def test_cache_expires_and_evicts():
+    loader = _Loader()
+    clock = _Clock()
+    cache = _cache(loader, clock, ttl_s=10, max_entries=2)
+
+    cache.get("club1")
+    cache.get("club2")
+    cache.get("club1")
+    cache.get("club3")
+
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+    clock.now = 11
+    cache.get("club1")
+    assert cache.stats.expirations == 1
+    assert loader.calls == ["club1", "club2", "club3", "club1"]
+
+
+def test_invalidate_club_and_single_uid():
+    loader = _Loader()
+    cache = _cache(loader, _Clock())
+
+    cache.get("club1")
+    cache.invalidate("club1", uid="swim1")
+    cache.member("club1", "coach1")
+    assert loader.calls == ["club1"]
+
+    cache.member("club1", "swim1")
+    assert loader.calls == ["club1", "club1"]
+
+    cache.invalidate("club1")
+    cache.get("club1")
+    assert loader.calls == ["club1", "club1", "club1"]
+    assert cache.stats.invalidations == 2
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    [
+        lambda cache: cache.invalidate("club1"),
+        lambda cache: cache.invalidate("club1", uid="coach1"),
+        lambda cache: cache.clear(),
+    ],
+)
+def test_load_racing_invalidate_is_not_cached(invalidate):
+    loader = _Loader()
+    cache = _cache(loader, _Clock())
+    revoked = [ClubMember("coach1", "swimmer", None, "active", _JOINED)]
+
+    def load_then_invalidate(db, club_id):
+        # The invalidation lands after the read but before the result is stored.
+        members = loader(db, club_id)
+        loader.members = revoked
+        invalidate(cache)
+        return members
+
+    cache._loader = load_then_invalidate
+    assert cache.has_role("club1", "coach1", "coach")
+
+    cache._loader = loader
+    assert not cache.has_role("club1", "coach1", "coach")
+    assert loader.calls == ["club1", "club1"]
+    assert cache.has_role("club1", "coach1", "swimmer")
+    assert loader.calls == ["club1", "club1"]
+
+
+def test_alias_results_do_not_outlive_migration_window():
+    loader = _Loader(from_alias=True)
+    clock = _Clock()
+    wall_start = ALIAS_CACHE_DEADLINE - 5
+    cache = ClubMembershipCache(
+        object(), loader=loader, clock=clock, wall_clock=lambda: wall_start + clock.now, ttl_s=60
+    )
+
+    assert cache.get("club1").from_alias
+    clock.now = 4
+    cache.get("club1")
+    assert loader.calls == ["club1"]
+
+    clock.now = 6
+    cache.get("club1")
+    cache.get("club1")
+    assert len(cache) == 0
+    assert loader.calls == ["club1"] * 3
+
+
+def test_cache_rejects_invalid_bounds():
+    with pytest.raises(ValueError):
+        ClubMembershipCache(object(), ttl_s=0)
+    with pytest.raises(ValueError):
+        ClubMembershipCache(object(), max_entries=0)
@@ -85,3 +85,103 @@ def test_group_from_and_to_firestore_dict_roundtrip():
     payload = group.to_firestore_dict()
     assert payload["name"] == "A Group"
     assert payload["coachIds"] == ["c1", "c2"]
+
+
+def test_batch_decoders_match_per_document_decoding():
+    joined = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    member_payloads = [
+        {"uid": "u1", "role": "Coach", "status": "active", "joinedAt": joined, "groupId": "g1"},
+        {"userId": " u2 ", "userType": "owner", "membershipStatus": "revoked", "registerDate": "2026-01-02T10:00:00Z"},
+        {"uid": "u3", "role": ["bad"], "status": 1, "createdAt": _FakeTimestamp(joined), "activeGroupId": "g2"},
+        {"uid": "u4", "role": "coach", "status": "active", "joinedAt": joined},
+    ]
+    assert ClubMember.from_firestore_dicts(member_payloads) == [
+        ClubMember.from_firestore_dict(payload) for payload in member_payloads
+    ]
+
+    user_payloads = [
+        {"name": "Jane", "email": "jane@example.com", "createdAt": joined, "roles": ["coach", " ", "staff"]},
+        {"displayName": "Joe", "photoURL": "", "createdAt": "2026-01-01T00:00:00", "roles": "coach"},
+    ]
+    assert User.from_firestore_dicts(user_payloads) == [
+        User.from_firestore_dict(payload) for payload in user_payloads
+    ]
+
+    group_payloads = [{"name": "A", "coachIds": ["c1", None], "createdAt": joined}]
+    assert Group.from_firestore_dicts(iter(group_payloads)) == [
+        Group.from_firestore_dict(payload) for payload in group_payloads
+    ]
+
+
+def test_batch_decoders_accept_empty_payloads():
+    members = ClubMember.from_firestore_dicts([None, {}])
+
+    assert [member.uid for member in members] == ["", ""]
+    assert [member.role for member in members] == ["swimmer", "swimmer"]
+    assert [member.status for member in members] == ["active", "active"]
+
+
+class _FakeDatetimeWithNanoseconds(datetime):
+    pass
+
+
+class _FakeEpochTimestamp:
+    def to_datetime(self):
+        raise RuntimeError("unsupported")
+
+    def timestamp(self) -> float:
+        return 1767225600.0
+
+
+def test_to_utc_datetime_dispatches_by_type():
+    from swim_apps_shared.domain.models import _to_utc_datetime
+
+    default = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    nanos = _FakeDatetimeWithNanoseconds(2026, 1, 1, tzinfo=timezone.utc)
+
+    assert _to_utc_datetime(nanos) is nanos
+    assert _to_utc_datetime(datetime(2026, 1, 1)) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert _to_utc_datetime(_FakeEpochTimestamp()) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert _to_utc_datetime("2026-01-02T10:00:00Z") == datetime(2026, 1, 2, 10, tzinfo=timezone.utc)
+    assert _to_utc_datetime("not a date", default=default) is default
+    assert _to_utc_datetime("   ", default=default) is default
+    assert _to_utc_datetime(None, default=default) is default
+    assert _to_utc_datetime(1767225600, default=default) is default
+
+
+def test_to_utc_datetime_caches_repeated_iso_strings():
+    from swim_apps_shared.domain.models import _parse_iso_string, _to_utc_datetime
+
+    _parse_iso_string.cache_clear()
+    first = _to_utc_datetime("2025-09-01T08:00:00+02:00")
+    second = _to_utc_datetime("2025-09-01T08:00:00+02:00")
+
+    assert first is second
+    assert _parse_iso_string.cache_info().hits == 1
+
+
+def test_compact_models_store_tuples_and_keep_firestore_shape():
+    from swim_apps_shared.domain.models import CompactGroup, CompactUser
+
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    user_payload = {"displayName": "Jane", "email": "jane@example.com", "createdAt": created, "roles": ["coach", "", "staff"]}
+    group_payload = {"name": "A Group", "coachIds": ["c1", None, "c2"], "createdAt": created}
+
+    user = CompactUser.from_firestore_dict(user_payload)
+    group = CompactGroup.from_firestore_dict(group_payload)
+
+    assert user.roles == ("coach", "staff")
+    assert group.coach_ids == ("c1", "c2")
+    assert user.to_firestore_dict() == User.from_firestore_dict(user_payload).to_firestore_dict()
+    assert group.to_firestore_dict() == Group.from_firestore_dict(group_payload).to_firestore_dict()
+    assert CompactUser.from_user(User.from_firestore_dict(user_payload)) == user
+    assert CompactGroup.from_group(Group.from_firestore_dict(group_payload)) == group
+
+
+def test_models_are_slotted():
+    import pickle
+
+    member = ClubMember.from_firestore_dict({"uid": "u1", "joinedAt": "2026-02-01T10:00:00Z"})
+
+    assert not hasattr(member, "__dict__")
+    assert pickle.loads(pickle.dumps(member)) == member
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from swim_apps_shared.firestore.multi_club import get_members_for_clubs, get_members_for_clubs_async
+
+
+class _FakeDoc:
+    def __init__(self, doc_id: str, data: dict):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _FakeCollection:
+    def __init__(self, db: "_FakeDB", path: str):
+        self._db = db
+        self._path = path
+
+    def document(self, doc_id: str):
+        return _FakeDocument(self._db, f"{self._path}/{doc_id}")
+
+    def _docs(self) -> list[_FakeDoc]:
+        if self._path in self._db.failing:
+            raise RuntimeError(f"stream failed for {self._path}")
+        prefix = f"{self._path}/"
+        return [
+            _FakeDoc(key[len(prefix) :], value)
+            for key, value in self._db.store.items()
+            if key.startswith(prefix) and "/" not in key[len(prefix) :]
+        ]
+
+    def stream(self):
+        with self._db.lock:
+            self._db.in_flight += 1
+            self._db.peak_in_flight = max(self._db.peak_in_flight, self._db.in_flight)
+        try:
+            time.sleep(self._db.latency_s)
+            docs = self._docs()
+        finally:
+            with self._db.lock:
+                self._db.in_flight -= 1
+        yield from docs
+
+
+class _FakeDocument:
+    def __init__(self, db: "_FakeDB", path: str):
+        self._db = db
+        self._path = path
+
+    def collection(self, name: str):
+        return _FakeCollection(self._db, f"{self._path}/{name}")
+
+
+class _FakeDB:
+    def __init__(self, store: dict[str, dict], *, latency_s: float = 0.0, failing: set[str] | None = None):
+        self.store = store
+        self.latency_s = latency_s
+        self.failing = failing or set()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def collection(self, name: str):
+        return _FakeCollection(self, name)
+
+    def document(self, path: str):
+        return _FakeDocument(self, path)
+
+
+class _AsyncFakeCollection(_FakeCollection):
+    def document(self, doc_id: str):
+        return _AsyncFakeDocument(self._db, f"{self._path}/{doc_id}")
+
+    async def stream(self):
+        await asyncio.sleep(self._db.latency_s)
+        for doc in self._docs():
+            yield doc
+
+
+class _AsyncFakeDocument(_FakeDocument):
+    def collection(self, name: str):
+        return _AsyncFakeCollection(self._db, f"{self._path}/{name}")
+
+    async def get(self):
+        raise NotImplementedError
+
+
+class _AsyncFakeDB(_FakeDB):
+    def collection(self, name: str):
+        return _AsyncFakeCollection(self, name)
+
+    def document(self, path: str):
+        return _AsyncFakeDocument(self, path)
+
+
+def _store(club_count: int) -> dict[str, dict]:
+    store = {f"swimClubs/club{i}/members/user{i}": {"role": "coach", "status": "active"} for i in range(club_count)}
+    store["swimClubs/legacy/users/alias1"] = {"role": "swimmer", "status": "active"}
+    return store
+
+
+def test_get_members_for_clubs_fans_out_with_bounded_workers():
+    db = _FakeDB(_store(8), latency_s=0.05)
+    club_ids = [f"club{i}" for i in range(8)]
+
+    result = get_members_for_clubs(db, club_ids + ["club0"], max_workers=4)
+
+    assert list(result.results) == club_ids
+    assert [members[0].uid for members in result.members.values()] == [f"user{i}" for i in range(8)]
+    assert db.peak_in_flight <= 4
+    assert result.wall_time_s < result.timing["sum_s"]
+    assert result.errors == {}
+
+
+def test_get_members_for_clubs_reports_errors_per_club():
+    db = _FakeDB(_store(2), failing={"swimClubs/club1/members"})
+
+    result = get_members_for_clubs(db, ["club0", "club1", "legacy"])
+
+    assert set(result.members) == {"club0", "legacy"}
+    assert result.members["legacy"][0].uid == "alias1"
+    assert isinstance(result.errors["club1"], RuntimeError)
+    assert not result.results["club1"].ok
+
+
+def test_get_members_for_clubs_uses_asyncio_for_async_clients():
+    db = _AsyncFakeDB(_store(3), failing={"swimClubs/club2/members"})
+
+    result = get_members_for_clubs(db, ["club0", "club1", "club2", "legacy"], is_async=True)
+
+    assert set(result.members) == {"club0", "club1", "legacy"}
+    assert set(result.errors) == {"club2"}
+
+
+def test_get_members_for_clubs_async_drives_sync_clients_in_threads():
+    db = _FakeDB(_store(4), latency_s=0.02)
+
+    result = asyncio.run(get_members_for_clubs_async(db, [f"club{i}" for i in range(4)], max_workers=2))
+
+    assert len(result.members) == 4
+    assert db.peak_in_flight <= 2
+
+
+def test_get_members_for_clubs_rejects_invalid_worker_count():
+    with pytest.raises(ValueError):
+        get_members_for_clubs(_FakeDB({}), ["club0"], max_workers=0)
@@ -3,9 +3,12 @@ from __future__ import annotations
 import pytest
 
 from swim_apps_shared.firestore.paths import (
+    ClubPaths,
     club_doc,
     club_member_doc,
     club_members_col,
+    club_paths,
+    configure_id_cache,
     group_doc,
     groups_col,
     user_doc,
@@ -65,3 +68,72 @@ def test_ref_builders():
     assert club_member_ref(db, "c1", "u1").path == "swimClubs/c1/members/u1"
     assert groups_ref(db, "c1").path == "swimClubs/c1/groups"
     assert group_ref(db, "c1", "g1").path == "swimClubs/c1/groups/g1"
+
+
+def test_club_paths_match_function_builders():
+    paths = ClubPaths(" c1 ")
+
+    assert paths.club_id == "c1"
+    assert paths.doc == club_doc("c1")
+    assert paths.members_col == club_members_col("c1")
+    assert paths.member_doc("u1") == club_member_doc("c1", "u1")
+    assert paths.groups_col == groups_col("c1")
+    assert paths.group_doc("g1") == group_doc("c1", "g1")
+    assert club_paths("c1") is club_paths("c1")
+
+    with pytest.raises(ValueError):
+        ClubPaths("a/b")
+    with pytest.raises(ValueError):
+        paths.member_doc(" ")
+
+
+def test_club_paths_cache_matches_uncached_builders_for_any_input():
+    # Equal-hashing raw ids must not share a cache entry, and non-strings normalize like before.
+    assert club_doc(True) == "swimClubs/True"
+    assert club_doc(1.0) == "swimClubs/1.0"
+    assert club_doc(1) == "swimClubs/1"
+    assert club_doc(["a"]) == "swimClubs/['a']"
+    assert club_paths(" c1 ") is club_paths("c1")
+    with pytest.raises(ValueError):
+        club_doc(None)
+
+
+def test_id_cache_keeps_validation_results():
+    configure_id_cache(2)
+    try:
+        assert user_doc(" u1 ") == "users/u1"
+        assert user_doc(" u1 ") == "users/u1"
+        assert club_member_doc("c1", "u2") == "swimClubs/c1/members/u2"
+        assert user_doc("u3") == "users/u3"
+        with pytest.raises(ValueError):
+            user_doc("bad/id")
+        with pytest.raises(ValueError):
+            user_doc("bad/id")
+    finally:
+        configure_id_cache(None)
+
+
+def test_ref_cache_reuses_references_per_client():
+    import gc
+
+    from swim_apps_shared.firestore.paths import RefCache
+
+    db = _FakeDB()
+    cache = RefCache(db, maxsize=3)
+
+    members = cache.club_members_ref("c1")
+    assert members.path == "swimClubs/c1/members"
+    assert cache.club_members_ref("c1") is members
+    assert cache.club_member_ref("c1", "u1").path == "swimClubs/c1/members/u1"
+    assert cache.group_ref("c1", "g1").path == "swimClubs/c1/groups/g1"
+    assert cache.user_ref("u1").path == "users/u1"
+    assert len(cache) == 3
+    assert cache.club_members_ref("c1") is not members
+
+    with pytest.raises(ValueError):
+        cache.club_members_ref("")
+
+    del db
+    gc.collect()
+    with pytest.raises(ReferenceError):
+        cache.groups_ref("c2")
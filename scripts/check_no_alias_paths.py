@@ -1,33 +1,42 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import json
+import subprocess
 import sys
 from pathlib import Path
-from typing import Callable
+from typing import Any
 
 
 _ALLOWED_FILES = {
     "python/swim_apps_shared/firestore/compat.py",
     "python/swim_apps_shared/firestore/guards.py",
+    "python/tests/test_aio.py",
+    "python/tests/test_check_no_alias_paths.py",
     "python/tests/test_compat.py",
     "python/tests/test_guards.py",
+    "python/tests/test_multi_club.py",
     "scripts/check_no_alias_paths.py",
 }
 
+# Git-ignored, with a suffix the scan does not read; the scan also excludes it explicitly.
+_DEFAULT_CACHE = ".cache/alias_scan.cache"
 
-def _load_scanner() -> Callable[[str], list[tuple[str, int]]]:
+
+def _load_guards() -> Any:
     try:
-        from swim_apps_shared.firestore.guards import scan_repo_for_alias_paths
+        from swim_apps_shared.firestore import guards
 
-        return scan_repo_for_alias_paths
+        return guards
     except Exception:
         repo_root = Path(__file__).resolve().parents[1]
         local_python = repo_root / "python"
         if local_python.exists():
             sys.path.insert(0, str(local_python))
-            from swim_apps_shared.firestore.guards import scan_repo_for_alias_paths
+            from swim_apps_shared.firestore import guards
 
-            return scan_repo_for_alias_paths
+            return guards
         raise
 
 
@@ -35,10 +44,109 @@ def _to_rel_path(root: Path, file_path: str) -> str:
     return Path(file_path).resolve().relative_to(root).as_posix()
 
 
+def _resolve_file_args(root: Path, files: list[str]) -> tuple[list[str], list[str]]:
+    """Repo-relative paths for ``files`` given relative to the CWD, plus errors for unusable ones."""
+    resolved: list[str] = []
+    errors: list[str] = []
+    for file_arg in files:
+        path = (Path.cwd() / file_arg).resolve()
+        if not path.is_file():
+            errors.append(f"{file_arg}: no such file")
+            continue
+        try:
+            resolved.append(path.relative_to(root).as_posix())
+        except ValueError:
+            errors.append(f"{file_arg}: outside the repository ({root})")
+    return resolved, errors
+
+
+def _changed_files(root: Path, ref: str) -> list[str]:
+    """Files changed since ``ref`` in the working tree, plus untracked files."""
+    commands = [
+        ["git", "diff", "--name-only", "--diff-filter=d", ref, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    ]
+    changed: list[str] = []
+    for command in commands:
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True, check=True)
+        changed.extend(line for line in result.stdout.splitlines() if line)
+    return changed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fail on legacy club alias membership path usage")
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="Scan only these files (relative to the current directory) instead of the whole tree",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Scan files on N processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=_DEFAULT_CACHE,
+        default=None,
+        help=f"Reuse findings for unchanged files from this cache file (default: {_DEFAULT_CACHE})",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Scan only files changed since this git ref (plus untracked files)",
+    )
+    parser.add_argument(
+        "--large-file-threshold",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="Scan files of at least this size via mmap instead of reading them whole",
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="text",
+        choices=["text", "json"],
+        help="Print scan statistics to stderr (text or json)",
+    )
+    parser.add_argument(
+        "--stats-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of slowest files to list with --stats",
+    )
+    return parser.parse_args()
+
+
 def main() -> int:
+    args = parse_args()
     root = Path(__file__).resolve().parents[1]
-    scanner = _load_scanner()
-    findings = scanner(str(root))
+    guards = _load_guards()
+    paths: list[str] | None = None
+    if args.files or args.changed_since:
+        paths, errors = _resolve_file_args(root, args.files)
+        if errors:
+            for error in errors:
+                print(f"ERROR: {error}", file=sys.stderr)
+            return 2
+        if args.changed_since:
+            paths.extend(_changed_files(root, args.changed_since))
+    cache_path = str(root / args.cache) if args.cache else None
+    options = {}
+    if args.large_file_threshold is not None:
+        options["large_file_threshold"] = args.large_file_threshold
+    stats = guards.ScanStats(top_n=args.stats_top) if args.stats else None
+    findings = guards.scan_repo_for_alias_paths(
+        str(root), jobs=args.jobs, cache_path=cache_path, paths=paths, stats=stats, **options
+    )
+    if stats is not None:
+        report = json.dumps(stats.to_dict(), indent=2) if args.stats == "json" else stats.format_text()
+        print(report, file=sys.stderr)
 
     blocked: list[tuple[str, int]] = []
     for file_path, line in findings: